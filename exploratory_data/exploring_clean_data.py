@@ -1,10 +1,46 @@
+import numpy as np
 import pandas as pd
 
+from scad_actors import ActorCanon, load_actor_canon, save_actor_canon
+from scad_column_profile import load_profile, profile_frame, save_profile, top_values
+from scad_issues import IssueCooccurrence, save_cooccurrence
+from scad_network import ActorNetwork, save_network
+from scad_population import attach_population
+from scad_schema import save_schema, schema_from_frame
+from scad_search import SearchIndex, save_search_index
+from scad_sentinels import TEXT_SENTINELS, decode_sentinels
+
+
+def normalize_categories(s, fixes=None, missing=TEXT_SENTINELS):
+    """Minúsculas, strip y correcciones aplicadas a las categorías, no a cada fila.
+
+    La columna se convierte a categórica y las transformaciones se hacen sobre
+    sus valores distintos; las categorías que quedan iguales tras normalizar se
+    fusionan. Los NaN siguen siendo NaN (no el texto "nan") y los valores de
+    `missing` pasan a NaN.
+    """
+    cat = s.astype("category")
+    names = cat.cat.categories.astype(str).str.lower().str.strip()
+    if fixes:
+        names = names.map(lambda v: fixes.get(v, v))
+    names = names.where(~names.isin(missing))
+    new_categories = names.dropna().unique()
+    mapping = new_categories.get_indexer(names)
+    codes = cat.cat.codes.to_numpy()
+    codes = np.where(codes >= 0, mapping[codes], -1)
+    return pd.Series(pd.Categorical.from_codes(codes, categories=new_categories), index=s.index, name=s.name)
+
+
 #  =========================================================================
 #                       1.  GENERAL
 #  =========================================================================
 
-df = pd.read_csv("C:/Users/diego/OneDrive/Escritorio/Proyecto Scad/exploratory_data/scal_global_features_clean.csv")
+input_file = "C:/Users/diego/OneDrive/Escritorio/Proyecto Scad/exploratory_data/scal_global_features_clean.csv"
+df = pd.read_csv(input_file)
+
+# Perfil de columnas (nulos, cardinalidad, mín/máx, valores más frecuentes) generado por el ETL;
+# si no existe o el CSV ha cambiado, se calcula aquí en una sola pasada
+profile = load_profile(input_file) or profile_frame(df)
 
 print(df.head())
 
@@ -12,7 +48,7 @@ print("\nColumnas:")
 print(df.columns.tolist())
 
 print("\nValores nulos por columna:")
-print(df.isnull().sum())
+print(pd.Series({col: info["nulls"] for col, info in profile["columns"].items()}))
 
 
 
@@ -27,13 +63,14 @@ categorical_cols = df.select_dtypes(include='object').columns
 # Mostrar valores únicos por columna categórica
 for col in categorical_cols:
     print(f" {col}")
-    print(f"   Número de categorías: {df[col].nunique()}")
-    print(f"   Categorías: {df[col].unique()[:10]}")  # Muestra solo las primeras 10 para no saturar
+    print(f"   Número de categorías: {profile['columns'][col]['distinct']}")
+    print(f"   Categorías: {top_values(profile, col, 10).index.tolist()}")  # Muestra solo las 10 más frecuentes para no saturar
     print("-" * 60)
 
-# Convertir todos los valores de esas columnas a minúsculas
+# Convertir a categóricas y normalizar (minúsculas, sin espacios en los extremos, "missing" → NaN)
+# sobre las categorías: el coste depende de los valores distintos, no del número de filas
 for col in categorical_cols:
-    df[col] = df[col].astype(str).str.lower()
+    df[col] = normalize_categories(df[col])
 
 
 
@@ -54,11 +91,12 @@ print("\nEstadísticas básicas:")
 print(df[numeric_cols].describe())
 
 for col in numeric_cols:
-    print(f" {col} — {df[col].nunique()} valores únicos")
+    print(f" {col} — {profile['columns'][col]['distinct']} valores únicos")
 
 for col in numeric_cols:
     print(f"{col}: valores mínimos y máximos")
-    print(df[col].value_counts().head(10))  # Muestra los más frecuentes
+    print(f"   mín = {profile['columns'][col]['min']}, máx = {profile['columns'][col]['max']}")
+    print(top_values(profile, col, 10))  # Muestra los más frecuentes
     print("-" * 40)
 
 import matplotlib.pyplot as plt
@@ -70,13 +108,10 @@ plt.ylabel("Frecuencia")
 plt.show()
 
 # Limpiar columnas numéricas
-# Reemplazar valores codificados como -99 o "missing"
-replace_dict = {
-    -99: pd.NA,
-    "missing": pd.NA,
-    "Missing": pd.NA
-}
-df.replace(replace_dict, inplace=True)
+# Decodificar los códigos centinela (-99/-88/-77) solo en las columnas declaradas en el esquema
+# (scad_sentinels.py), a tipos enteros con nulos; el motivo queda en <col>_missing_reason.
+# "missing" ya se ha tratado en las categóricas.
+decode_sentinels(df)
 
 # Eliminar el evento con eventid -5300001.0
 df = df[df['eventid'] != -5300001.0]
@@ -89,17 +124,34 @@ df.dropna(axis=0, how='all', inplace=True)
 
 # --- Normalización de categorías específicas ---
 
-# Quitar espacios en blanco en extremos
-for col in categorical_cols:
-    df[col] = df[col].str.strip()
-
-# Normalización de nombres de países
+# Normalización de nombres de países (sobre las categorías)
 if "countryname" in df.columns:
     country_fix = {
         "democratic republic of the congo": "democratic republic of congo"
     }
-    df["countryname"] = df["countryname"].replace(country_fix)
+    df["countryname"] = normalize_categories(df["countryname"], fixes=country_fix)
+
+# --- Población país-año (tabla de referencia scad_population.csv) ---
+# Permite calcular métricas por 100k hab. con la población de cada año
+df = attach_population(df, ccode_col="ccode", year_col="event_year")
+print("\nEventos sin población de referencia:", int(df["population"].isna().sum()))
 
+# Ids canónicos de actor1 / target1 (nombres casi duplicados agrupados con MinHash + LSH);
+# se reutiliza el vocabulario del ETL si está al día
+actor_canon = load_actor_canon(input_file) or ActorCanon.from_frame(df)
+df = actor_canon.assign_ids(df)
 
 # Guardar el nuevo CSV limpio
 df.to_csv("scad_final_dataset.csv", index=False)
+
+# Perfil de columnas del dataset final (lo usan el warm-up y la pestaña Datos de la app)
+save_profile(profile_frame(df), "scad_final_dataset.csv")
+# Manifiesto de esquema (roles de columna) que usa la app al cargar
+save_schema(schema_from_frame(df), "scad_final_dataset.csv")
+# Red actor → objetivo (matriz dispersa por año y país) para la página de red de la app
+save_actor_canon(actor_canon, "scad_final_dataset.csv")
+save_network(ActorNetwork.from_frame(df, canon=actor_canon), "scad_final_dataset.csv")
+# Co-ocurrencia de temas (issue1–issue3) y cruce tema × tipo de evento por año y país
+save_cooccurrence(IssueCooccurrence.from_frame(df), "scad_final_dataset.csv")
+# Índice invertido (BM25) de issuenote / notes para la búsqueda de texto de la app
+save_search_index(SearchIndex.from_frame(df), "scad_final_dataset.csv")
@@ -0,0 +1,201 @@
+"""Nombres canónicos de actores: cadenas de actor/objetivo casi duplicadas agrupadas con MinHash + LSH.
+
+Los nombres de actores de SCAD varían muchísimo ("Government supporters",
+"pro-government supporters", "Aristide supporter" / "Aristide supporters").
+`normalize_text` solo colapsa espacios y mayúsculas, así que los groupbys y
+rankings sobre `actor1`/`target1` se fragmentan. Esta etapa agrupa los casi
+duplicados del vocabulario normalizado sin comparar todos los pares de nombres:
+
+1. cada nombre se convierte en el conjunto de 3-gramas de caracteres de sus
+   palabras (la puntuación separa palabras, así que "pro-government" comparte
+   "government" con "government");
+2. una firma MinHash de `NUM_PERM` valores estima la similitud de Jaccard de
+   los conjuntos de dos nombres;
+3. LSH: la firma se corta en `BANDS` bandas de `ROWS` valores y solo los
+   nombres que coinciden en una banda entera pasan a ser pares candidatos;
+4. los candidatos se conservan si su similitud de Jaccard exacta es
+   ≥ `SIMILARITY` y llevan las mismas palabras "guarda" (palabras cortas como
+   siglas de partidos y negaciones: "pri supporters" ≠ "prd supporters",
+   "anti-government protesters" ≠ "government protesters");
+5. los grupos conexos de pares conservados comparten un id canónico, con el
+   nombre de su miembro más frecuente.
+
+`ActorCanon.assign_ids` escribe `actor1_cid` / `target1_cid` (un único espacio
+de ids compartido, -1 para los nombres ausentes), y la red de actores
+(scad_network.py) se construye sobre los nombres canónicos. El vocabulario se
+guarda como `artifacts/<stem del csv>.actors.json` con los helpers de
+artefactos compartidos de scad_loader.py.
+"""
+import re
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import scad_episodes
+import scad_loader
+import scad_network
+
+ACTORS_FILE = "actors.json"
+ACTORS_VERSION = 1
+
+ACTOR_COLS = ["actor1", "target1"]
+ID_SUFFIX = "_cid"
+
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SIMILARITY = 0.8
+SHINGLE = 3
+
+# Palabras cortas que deben coincidir para fundir dos nombres (siglas, negaciones),
+# salvo estas, que no cambian quién es el actor
+GUARD_MAX_LEN = 4
+GUARD_IGNORED = {"pro", "the", "of", "and", "de", "del", "la", "el", "los", "las", "y"}
+
+_PRIME = (1 << 31) - 1
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def shingles(name: str) -> set:
+    """3-gramas de caracteres de cada palabra de `name`, con los límites de palabra marcados."""
+    out = set()
+    for word in _WORD_RE.findall(name):
+        padded = f" {word} "
+        out.update(padded[i:i + SHINGLE] for i in range(max(len(padded) - SHINGLE + 1, 1)))
+    return out
+
+
+def guard_words(name: str) -> frozenset:
+    return frozenset(w for w in _WORD_RE.findall(name) if len(w) <= GUARD_MAX_LEN and w not in GUARD_IGNORED)
+
+
+def minhash_signatures(sets: list, num_perm: int = NUM_PERM, seed: int = 0, chunk: int = 16) -> np.ndarray:
+    """Firmas MinHash (len(sets), num_perm) con hashes universales (a·x + b) mod p."""
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, _PRIME, size=num_perm, dtype=np.int64)
+    b = rng.integers(0, _PRIME, size=num_perm, dtype=np.int64)
+    sizes = np.array([len(s) for s in sets], dtype=np.int64)
+    flat = [g for s in sets for g in s]
+    x = (pd.util.hash_array(np.array(flat, dtype=object)) % _PRIME).astype(np.int64)
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    sig = np.full((len(sets), num_perm), _PRIME, dtype=np.int64)
+    nonempty = sizes > 0
+    for lo in range(0, num_perm, chunk):
+        values = (a[lo:lo + chunk, None] * x[None, :] + b[lo:lo + chunk, None]) % _PRIME
+        sig[nonempty, lo:lo + chunk] = np.minimum.reduceat(values, starts[nonempty], axis=1).T
+    return sig
+
+
+def candidate_pairs(sig: np.ndarray, bands: int = BANDS) -> np.ndarray:
+    """Pares (i, j), i < j, cuyas firmas son iguales en al menos una banda."""
+    rows = sig.shape[1] // bands
+    found = []
+    for band in range(bands):
+        _, bucket = np.unique(sig[:, band * rows:(band + 1) * rows], axis=0, return_inverse=True)
+        members = pd.DataFrame({"bucket": bucket.ravel(), "i": np.arange(len(sig))})
+        shared = members[members.duplicated("bucket", keep=False)]
+        if shared.empty:
+            continue
+        pairs = shared.merge(shared, on="bucket", suffixes=("", "_j"))[["i", "i_j"]].to_numpy()
+        found.append(pairs[pairs[:, 0] < pairs[:, 1]])
+    if not found:
+        return np.empty((0, 2), dtype=np.int64)
+    return np.unique(np.concatenate(found), axis=0)
+
+
+def name_counts(df: pd.DataFrame, cols=ACTOR_COLS) -> pd.Series:
+    """Eventos por nombre normalizado de actor/objetivo (sobre todas las `cols`)."""
+    names = [scad_network.normalize_names(df[c]) for c in cols if c in df.columns]
+    if not names:
+        return pd.Series(dtype="int64")
+    return pd.concat(names).value_counts()
+
+
+class ActorCanon:
+    """Nombre normalizado → id canónico, e id canónico → nombre canónico."""
+
+    def __init__(self, names, lookup: dict, cols=ACTOR_COLS):
+        self.names = np.asarray(names, dtype=str)  # nombres canónicos; posición = id canónico
+        self.lookup = lookup                       # variante normalizada → id canónico
+        self.cols = list(cols)
+
+    @property
+    def id_columns(self) -> list[str]:
+        return [f"{c}{ID_SUFFIX}" for c in self.cols]
+
+    @classmethod
+    def from_counts(cls, counts: pd.Series, cols=ACTOR_COLS):
+        """Agrupa los nombres de `counts` (nombre normalizado → eventos)."""
+        counts = counts.groupby(level=0).sum().sort_index()
+        vocab = counts.index.to_numpy(dtype=str)
+        n = len(vocab)
+        if n == 0:
+            return cls([], {}, cols)
+        sets = [shingles(v) for v in vocab]
+        i, j = candidate_pairs(minhash_signatures(sets)).T if n > 1 else (np.array([], int), np.array([], int))
+        guards = [guard_words(v) for v in vocab]
+        keep = np.array([
+            guards[p] == guards[q] and len(sets[p] & sets[q]) >= SIMILARITY * len(sets[p] | sets[q])
+            for p, q in zip(i, j)
+        ], dtype=bool)
+        groups = scad_episodes.connected_components(n, i[keep], j[keep])
+
+        # Nombre canónico: el miembro más frecuente (empates: orden alfabético)
+        members = pd.DataFrame({"group": groups, "name": vocab, "events": counts.to_numpy()})
+        head = members.sort_values(["group", "events", "name"], ascending=[True, False, True]).drop_duplicates("group")
+        names = np.sort(head["name"].to_numpy(dtype=str))
+        group_name = dict(zip(head["group"], head["name"]))
+        canonical_id = np.searchsorted(names, [group_name[g] for g in groups])
+        return cls(names, dict(zip(vocab, canonical_id.tolist())), cols)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, cols=ACTOR_COLS):
+        return cls.from_counts(name_counts(df, cols), cols)
+
+    def ids(self, s: pd.Series) -> np.ndarray:
+        """Id canónico de cada nombre original (-1 para nombres ausentes o desconocidos)."""
+        return scad_network.normalize_names(s).map(self.lookup).fillna(-1).to_numpy().astype(np.int32)
+
+    def canonical(self, names: pd.Series) -> pd.Series:
+        """Nombre canónico de nombres ya normalizados (los desconocidos se dejan como están)."""
+        ids = names.map(self.lookup)
+        known = ids.notna().to_numpy()
+        out = names.to_numpy(dtype=object).copy()
+        out[known] = self.names[ids[known].astype(int).to_numpy()]
+        return pd.Series(out, index=names.index)
+
+    def assign_ids(self, df: pd.DataFrame) -> pd.DataFrame:
+        """`df` con una columna de id canónico por columna de actor (`actor1_cid`, `target1_cid`)."""
+        return df.assign(**{f"{c}{ID_SUFFIX}": self.ids(df[c]) for c in self.cols if c in df.columns})
+
+    def aliases(self) -> pd.DataFrame:
+        """Nombres canónicos con más de una variante: canonical, variants y número de variantes."""
+        table = pd.DataFrame({"variant": list(self.lookup), "cid": list(self.lookup.values())})
+        table["canonical"] = self.names[table["cid"].to_numpy()]
+        grouped = table.groupby("canonical")["variant"].agg(list)
+        out = pd.DataFrame({"canonical": grouped.index, "variants": grouped.to_numpy()})
+        out["n_variants"] = out["variants"].str.len()
+        return out[out["n_variants"] > 1].sort_values("n_variants", ascending=False, ignore_index=True)
+
+    def to_dict(self) -> dict:
+        return {"version": ACTORS_VERSION, "cols": self.cols, "names": self.names.tolist(), "lookup": self.lookup}
+
+    @classmethod
+    def from_dict(cls, payload: dict):
+        return cls(payload["names"], {k: int(v) for k, v in payload["lookup"].items()}, payload["cols"])
+
+
+# -----------------------------
+# Persistencia
+# -----------------------------
+
+def save_actor_canon(canon: ActorCanon, csv_path) -> Path:
+    """Escribe el vocabulario de `csv_path` (llamar después de escribir el CSV)."""
+    return scad_loader.save_json_artifact(canon.to_dict(), csv_path, ACTORS_FILE)
+
+
+def load_actor_canon(csv_path):
+    """Vocabulario de `csv_path` si está al día; si no, None."""
+    payload = scad_loader.load_json_artifact(csv_path, ACTORS_FILE, ACTORS_VERSION)
+    return None if payload is None else ActorCanon.from_dict(payload)
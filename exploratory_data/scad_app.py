@@ -1,138 +1,269 @@
-import streamlit as st
-from streamlit_option_menu import option_menu
-import pandas as pd
-import plotly.express as px
+import scad_profile
+
+# Perfil de arranque (activar con SCAD_PROFILE=1): mide imports y primer render
+profiler = scad_profile.StartupProfiler()
+
+with profiler.step("import streamlit", "streamlit"):
+    import streamlit as st
+with profiler.step("import streamlit_option_menu", "streamlit_option_menu"):
+    from streamlit_option_menu import option_menu
 from pathlib import Path
 import os
+import time
 
-# =====================================================================================
-# CSS PERSONALIZADO
-# =====================================================================================
-st.markdown("""
-<style>
-
-/* ====== Fondos principales ====== */
-
-/* Fondo del área principal (contenido) */
-div[data-testid="stAppViewContainer"]{
-  background-color: #f9f9f9;   /* gris muy suave para resaltar gráficos */
-}
-
-/* Fondo del sidebar */
-aside[data-testid="stSidebar"]{
-  background-color: #b1c7df;   /* azul grisáceo de la paleta */
-}
-
-/* Panel interno de tarjetas en el sidebar (donde está el option_menu) */
-aside[data-testid="stSidebar"] .block-container{
-  padding-top: 1rem;
-  padding-bottom: 1rem;
-}
-
-/* ====== Navegación (streamlit-option-menu) ======
-   La librería usa clases bootstrap-like: .nav, .nav-pills, .nav-link, .active
-   Estas reglas se aplican de forma robusta dentro del sidebar.
-================================================== */
-
-/* Botón activo */
-aside[data-testid="stSidebar"] .nav-pills .nav-link.active{
-  background-color: #f0635e !important;  /* rojo coral de la paleta */
-  color: #ffffff !important;
-  font-weight: 700;
-  border-radius: 10px;
-  box-shadow: 0 0 0 1px rgba(0,0,0,0.05) inset;
-}
-
-/* Botón normal */
-aside[data-testid="stSidebar"] .nav-pills .nav-link{
-  color: #122b39;                 /* texto oscuro legible */
-  background-color: #ffffff;      /* pastilla blanca */
-  border-radius: 10px;
-  margin-bottom: 8px;
-  border: 1px solid rgba(0,0,0,0.06);
-  transition: all 0.2s ease-in-out;
-}
-
-/* Hover */
-aside[data-testid="stSidebar"] .nav-pills .nav-link:hover{
-  background-color: #23b7d9 !important;  /* cyan */
-  color: #ffffff !important;
-  border-color: transparent;
-}
-
-/* Iconos dentro del option menu */
-aside[data-testid="stSidebar"] .nav-pills .nav-link svg{
-  margin-right: .35rem;
-}
-
-/* ====== Métricas (KPI) ====== */
-div[data-testid="stMetricValue"]{
-  color: #1d7084;  /* teal para valores */
-  font-weight: 600;
-}
-div[data-testid="stMetricLabel"]{
-  color: #4a5b6b;  /* gris oscuro */
-  font-size: 0.9rem;
-}
-
-/* ====== Pequeños detalles ====== */
-header[data-testid="stHeader"]{
-  background: transparent;   /* elimina barra superior gris */
-  box-shadow: none;
-}
-</style>
-""", unsafe_allow_html=True)
+import scad_loader
 
+# pandas, plotly y scad_views se importan solo en las páginas que los usan:
+# Inicio y Conclusiones se pintan sin pagar esos imports.
 
 # =====================================================================================
 # Configuración de la página
 # =====================================================================================
 st.set_page_config(page_title="SCAD Dataset Explorer", page_icon="🌍", layout="wide")
 
+# =====================================================================================
+# CSS PERSONALIZADO
+# =====================================================================================
+CSS_PATH = Path(__file__).resolve().parent / "scad_style.css"
+
+@st.cache_resource(show_spinner=False)
+def load_css(path: Path) -> str:
+    # Se lee del disco una sola vez por proceso
+    return f"<style>\n{path.read_text(encoding='utf-8')}</style>"
+
+st.markdown(load_css(CSS_PATH), unsafe_allow_html=True)
+profiler.mark("Configuración y CSS")
+
 # Estado global
 if "df" not in st.session_state:
     st.session_state.df = None
 
 # =====================================================================================
-# CARGA DE DATOS (cacheada)
+# CARGA DE DATOS (en segundo plano)
 # =====================================================================================
-@st.cache_data(show_spinner=True)
-def load_data(path: Path) -> pd.DataFrame:
-    # Lee CSV
-    df = pd.read_csv(path)
-
-    # Normaliza columnas
-    df.columns = df.columns.str.strip()
-
-    # Detecta columna de año
-    year_col_candidates = [c for c in df.columns if "year" in c.lower() or "año" in c.lower()]
-    if not year_col_candidates:
-        st.error("❌ No se encontró ninguna columna que parezca contener el año.")
-        st.stop()
-    year_col = year_col_candidates[0]
-    if year_col != "year":
-        df = df.rename(columns={year_col: "year"})
-
-    # Conversión a numérico
-    df["year"] = pd.to_numeric(df["year"], errors="coerce")
-
-    # ndeath puede no existir en algunos SCAD
-    if "ndeath" not in df.columns:
-        if "fatalities" in df.columns:
-            df["ndeath"] = pd.to_numeric(df["fatalities"], errors="coerce")
-        else:
-            df["ndeath"] = pd.NA
-
-    df["ndeath"] = pd.to_numeric(df["ndeath"], errors="coerce")
-
-    return df
-
 # Ruta del dataset
 DATA_PATH = Path("exploratory_data") / "scad_final_dataset.csv"
 
-# Intenta cargar al inicio (si existe)
-if DATA_PATH.exists():
-    st.session_state.df = load_data(DATA_PATH)
+@st.cache_resource(show_spinner=False)
+def start_data_load(path: Path) -> scad_loader.DatasetWatcher:
+    # Un único hilo de carga por proceso: arranca con la primera sesión del servidor.
+    # El watcher recarga el CSV en segundo plano si cambia en disco (sin reiniciar ni vaciar cachés).
+    return scad_loader.DatasetWatcher(path)
+
+# Lanza la carga sin bloquear: título, sidebar y pestañas de texto se pintan ya
+dataset = start_data_load(DATA_PATH) if DATA_PATH.exists() else None
+# Versión servida en este rerun (el watcher la sustituye de forma atómica cuando hay una nueva)
+data_load = dataset.current if dataset is not None else None
+
+# Las cachés derivadas del dataset se indexan por la huella de la carga (ruta + tamaño/mtime/hash),
+# no por la ruta: una versión nueva no reutiliza artefactos de la anterior
+LOAD_KEY = {scad_loader.BackgroundLoad: scad_loader.BackgroundLoad.cache_key}
+
+def report_profile(label):
+    """Cierra el perfil de arranque (SCAD_PROFILE=1): informe en el log del servidor y en el sidebar."""
+    report = profiler.finish(label)
+    if report is not None:
+        print(report, flush=True)
+        with st.sidebar.expander("⏱️ Perfil de arranque"):
+            st.code(report, language=None)
+
+def stop_page():
+    """st.stop() que antes cierra el perfil: las ejecuciones detenidas también lo informan."""
+    report_profile(f"Render detenido · {selected}")
+    st.stop()
+
+def await_data():
+    """Espera a la carga en curso mostrando el progreso (solo páginas con datos)."""
+    if data_load is None:
+        return
+    if not data_load.done():
+        bar = st.progress(0.0, text="⏳ Cargando dataset…")
+        while not data_load.done():
+            bar.progress(data_load.progress, text=f"⏳ Cargando dataset… {data_load.stage}")
+            time.sleep(0.1)
+        bar.empty()
+    try:
+        with profiler.step("Espera del dataset"):
+            st.session_state.df = data_load.result()
+    except ValueError as exc:
+        st.error(f"❌ {exc}")
+        stop_page()
+
+def pick_up_data():
+    """Recoge el DataFrame si la carga ya terminó sin errores (sin esperar)."""
+    if data_load is not None and data_load.done() and data_load.future.exception() is None:
+        st.session_state.df = data_load.result()
+
+# Si la carga ya terminó (reruns posteriores), el DataFrame está disponible sin esperar
+pick_up_data()
+
+# Vistas por defecto precalculadas por el warm-up (scad_warmup.py), si están al día.
+# Se leen con el primer uso: deserializarlas importa pandas.
+@st.cache_resource(show_spinner=False, hash_funcs=LOAD_KEY, max_entries=2)
+def load_default_views(load: scad_loader.BackgroundLoad) -> dict:
+    return scad_loader.read_default_views(load.path)
+
+# Perfil de columnas del dataset (artefacto JSON del ETL / warm-up; si falta, se calcula una vez)
+@st.cache_resource(show_spinner=False, hash_funcs=LOAD_KEY, max_entries=2)
+def load_column_profile(load: scad_loader.BackgroundLoad):
+    import scad_column_profile
+
+    profile = scad_column_profile.load_profile(load.path)
+    if profile is None:
+        profile = scad_column_profile.profile_frame(load.result())
+    return profile
+
+# Roles de columna (país, tipo de evento, subtipo, admin1, fuente, actor, población...) del
+# manifiesto del ETL, una sola vez por versión del dataset; el DataFrame cargado ya lleva los nombres canónicos
+@st.cache_resource(show_spinner=False, hash_funcs=LOAD_KEY, max_entries=2)
+def load_roles(load: scad_loader.BackgroundLoad) -> dict:
+    return scad_loader.dataset_roles(load.path, load.result())
+
+# Población país-año (tabla de referencia) para las métricas por 100k hab.
+@st.cache_resource(show_spinner=False, hash_funcs=LOAD_KEY, max_entries=2)
+def load_population(load: scad_loader.BackgroundLoad):
+    import scad_views
+
+    views = load_default_views(load)
+    if ("stats", "population") in views:
+        return views[("stats", "population")]
+    return scad_views.population_frame(load.result())
+
+# Matriz dispersa actor → objetivo por año y país (artefacto del ETL / warm-up; si falta, se construye una vez)
+@st.cache_resource(show_spinner=False, hash_funcs=LOAD_KEY, max_entries=2)
+def load_network(load: scad_loader.BackgroundLoad):
+    import scad_network
+
+    network = scad_network.load_network(load.path)
+    if network is None:
+        import scad_actors
+
+        # Sobre los nombres canónicos de actores (vocabulario MinHash + LSH del ETL, o calculado aquí)
+        canon = scad_actors.load_actor_canon(load.path) or scad_actors.ActorCanon.from_frame(load.result())
+        network = scad_network.ActorNetwork.from_frame(load.result(), canon=canon)
+    return network
+
+# Co-ocurrencia de temas y cruce tema × tipo de evento por año y país (artefacto del ETL / warm-up)
+@st.cache_resource(show_spinner=False, hash_funcs=LOAD_KEY, max_entries=2)
+def load_issues(load: scad_loader.BackgroundLoad):
+    import scad_issues
+
+    issues = scad_issues.load_cooccurrence(load.path)
+    if issues is None:
+        issues = scad_issues.IssueCooccurrence.from_frame(load.result())
+    return issues
+
+# Índice invertido (BM25) de issuenote / notes para la búsqueda de texto (artefacto del ETL / warm-up)
+@st.cache_resource(show_spinner=False, hash_funcs=LOAD_KEY, max_entries=2)
+def load_search_index(load: scad_loader.BackgroundLoad):
+    import scad_search
+
+    index = scad_search.load_search_index(load.path)
+    if index is None:
+        index = scad_search.SearchIndex.from_frame(load.result())
+    return index
+
+# Índice de intervalos [startdate, enddate] para los filtros "activos entre fechas"
+@st.cache_resource(show_spinner=False, hash_funcs=LOAD_KEY, max_entries=2)
+def load_interval_index(load: scad_loader.BackgroundLoad):
+    import scad_indexes
+
+    cached = scad_loader.warm_artifact_path(load.path, scad_indexes.INTERVAL_FILE)
+    if cached is not None:
+        return scad_indexes.IntervalIndex.load(cached)
+    return scad_indexes.IntervalIndex.from_frame(load.result())
+
+# Episodios espacio-temporales (eventos cercanos en espacio y tiempo), posicionales como el índice de intervalos
+@st.cache_resource(show_spinner=False, hash_funcs=LOAD_KEY, max_entries=2)
+def load_episodes(load: scad_loader.BackgroundLoad):
+    import scad_episodes
+
+    cached = scad_loader.warm_artifact_path(load.path, scad_episodes.EPISODES_FILE)
+    if cached is not None:
+        import pandas as pd
+        return pd.read_pickle(cached)
+    return scad_episodes.Episodes.from_frame(load.result())
+
+# Rollups temporales (día/semana/mes/año) para las tendencias
+@st.cache_resource(show_spinner=False, hash_funcs=LOAD_KEY, max_entries=2)
+def load_rollups(load: scad_loader.BackgroundLoad):
+    import scad_rollups
+    import scad_views
+
+    cached = scad_loader.warm_artifact_path(load.path, scad_rollups.ROLLUPS_FILE)
+    if cached is not None:
+        import pandas as pd
+        return pd.read_pickle(cached)
+    return scad_rollups.TimeRollups.from_frame(scad_views.display_frame(load.result()))
+
+# Picos anómalos por país (series mensuales, z-score robusto); se superponen a las tendencias
+@st.cache_resource(show_spinner=False, hash_funcs=LOAD_KEY, max_entries=2)
+def load_spikes(load: scad_loader.BackgroundLoad):
+    import pandas as pd
+    import scad_spikes
+
+    cached = scad_loader.warm_artifact_path(load.path, scad_spikes.SPIKES_FILE)
+    if cached is not None:
+        return pd.read_pickle(cached)
+    return scad_spikes.detect_spikes(load_rollups(load))
+
+# Modo comparación de Estadísticas: las dos especificaciones (A, B) en una sola agregación sobre los rollups
+@st.cache_resource(show_spinner=False, hash_funcs=LOAD_KEY, max_entries=32)
+def load_comparison(load: scad_loader.BackgroundLoad, spec_keys: tuple, level: str) -> dict:
+    import scad_compare
+
+    specs = [scad_compare.spec_from_key(key) for key in spec_keys]
+    return scad_compare.compare(load_rollups(load), specs, level)
+
+def active_date_filter(key_prefix):
+    """Filtro opcional de eventos activos entre dos fechas; devuelve (d1, d2) o None."""
+    if "startdate" not in st.session_state.df.columns:
+        return None
+    use_dates = st.checkbox("Filtrar por eventos activos entre dos fechas", key=f"{key_prefix}_use_dates")
+    if not use_dates:
+        return None
+    d_min, d_max = load_interval_index(data_load).bounds()
+    picked = st.date_input(
+        "Activos entre",
+        value=(d_min, d_max),
+        min_value=d_min,
+        max_value=d_max,
+        key=f"{key_prefix}_active_range",
+        help="Incluye eventos que empezaron antes pero seguían activos en el periodo (startdate–enddate)."
+    )
+    # Mientras se elige el rango, date_input devuelve una sola fecha
+    return tuple(picked) if isinstance(picked, (tuple, list)) and len(picked) == 2 else None
+
+# Caché persistente de resultados (SQLite): agregados filtrados y figuras que sobreviven a reinicios
+# y se comparten entre réplicas, indexados por el hash del contenido del dataset y los filtros
+@st.cache_resource(show_spinner=False)
+def open_result_cache():
+    import scad_result_cache
+
+    return scad_result_cache.ResultCache()
+
+def cached_view(page, name, is_default, compute, spec=None):
+    """Devuelve la vista del warm-up si los filtros están por defecto; si no, la de la caché
+    persistente para `spec` (los filtros de la página) o, si no está, la calcula y la guarda."""
+    if is_default and data_load is not None:
+        views = load_default_views(data_load)
+        if (page, name) in views:
+            return views[(page, name)].copy()
+    if spec is None or data_load is None or data_load.content_id is None:
+        return compute()
+    import scad_result_cache
+
+    key = scad_result_cache.result_key(data_load.content_id, page, name, spec)
+    return open_result_cache().cached(key, compute)
+
+def cached_figure(page, name, spec, build):
+    """Figura de plotly de la caché persistente (como JSON) para `spec`, o `build()` si no está."""
+    if data_load is None or data_load.content_id is None:
+        return build()
+    import scad_result_cache
+
+    key = scad_result_cache.result_key(data_load.content_id, page, name, spec)
+    return open_result_cache().cached_figure(key, build)
 
 # =====================================================================================
 # Encabezado principal
@@ -153,11 +284,14 @@ with st.sidebar:
             "Explorador de Muertes",
             "Estadísticas Generales",
             "Análisis por Religión",
+            "Explorador de Temas",
+            "Red de Actores",
             "Conclusiones"
         ],
-        icons=["house", "map", "x-circle", "bar-chart", "building", "check2-circle"],
+        icons=["house", "map", "x-circle", "bar-chart", "building", "grid-3x3", "diagram-3", "check2-circle"],
         default_index=0
     )
+profiler.mark("Encabezado y sidebar")
 
 # =====================================================================================
 # 1. PESTAÑA INICIO
@@ -275,16 +409,35 @@ if selected == "Inicio":
             """
         )
 
+        # La carga puede haber terminado mientras se pintaba la página
+        pick_up_data()
         if st.session_state.df is not None:
             st.dataframe(st.session_state.df.head(20), use_container_width=True)
 
             # Botón para descargar el dataset directamente desde la app
             st.download_button(
                 label="💾 Descargar dataset consolidado (CSV)",
-                data=st.session_state.df.to_csv(index=False).encode("utf-8"),
+                # El CSV de origen tal cual: sin reserializar el DataFrame (con tipos reducidos) en cada rerun
+                data=data_load.path.read_bytes(),
                 file_name="scad_final_dataset.csv",
                 mime="text/csv"
             )
+
+            with st.expander("📊 Perfil de columnas", expanded=False):
+                import scad_column_profile
+
+                profile = load_column_profile(data_load)
+                st.caption(
+                    f"{profile['rows']:,} filas · {len(profile['columns'])} columnas · "
+                    "nulos, valores distintos, mínimo/máximo y valores más frecuentes por columna"
+                )
+                table = scad_column_profile.profile_table(profile).rename(columns={
+                    "column": "Columna", "dtype": "Tipo", "null_pct": "% nulos", "distinct": "Distintos",
+                    "min": "Mín", "max": "Máx", "top": "Valores más frecuentes",
+                })
+                st.dataframe(table, use_container_width=True, hide_index=True)
+        elif data_load is not None and not data_load.done():
+            st.info("⏳ El dataset se está cargando en segundo plano; la vista previa aparecerá al volver a esta pestaña.")
         else:
             st.warning(
                 "⚠️ No se han cargado datos. Utiliza la opción de carga rápida en esta sección o asegúrate de que "
@@ -325,27 +478,49 @@ if selected == "Inicio":
             """
         )
 
-        from pathlib import Path
+        import scad_codebooks
 
         CODEBOOK_DIR = Path("codebooks")  # <- carpeta dentro del repo o proyecto
-        pdfs = list(CODEBOOK_DIR.glob("*.pdf")) if CODEBOOK_DIR.exists() else []
+        pdfs = scad_codebooks.list_pdfs(CODEBOOK_DIR)  # listado cacheado por mtime
 
         if pdfs:
             st.markdown("#### Descarga directa de Codebooks (PDF)")
             for pdf in pdfs:
-                with open(pdf, "rb") as fh:
-                    st.download_button(
-                        label=f"⬇️ Descargar {pdf.name}",
-                        data=fh.read(),
-                        file_name=pdf.name,
-                        mime="application/pdf"
-                    )
+                # El PDF solo se lee (y se cachea) cuando alguien pulsa el botón
+                st.download_button(
+                    label=f"⬇️ Descargar {pdf.name}",
+                    data=lambda pdf=pdf: scad_codebooks.pdf_bytes(pdf),
+                    file_name=pdf.name,
+                    mime="application/pdf"
+                )
         else:
             st.info(
                 "⚠️ Los codebooks no están disponibles en la carpeta del proyecto. "
                 "Puedes consultarlos directamente en la página oficial del SCAD."
             )
 
+        # Búsqueda sobre el índice precalculado (artifacts/codebook_index.json)
+        st.markdown("#### 🔎 Buscar en los codebooks")
+        codebook_query = st.text_input(
+            "Variable o término",
+            placeholder="p. ej. etype, issue1, npart, repress",
+            key="codebook_query"
+        )
+        if codebook_query.strip():
+            codebook_index = scad_codebooks.load_index()
+            if codebook_index is None:
+                st.info(
+                    "ℹ️ El índice de búsqueda aún no se ha generado. Ejecuta "
+                    "`python exploratory_data/scad_codebooks.py` (o el warm-up) para construirlo."
+                )
+            else:
+                hits = scad_codebooks.search(codebook_index, codebook_query)
+                if not hits:
+                    st.caption("Sin resultados en los codebooks.")
+                for i, hit in enumerate(hits):
+                    with st.expander(f"{hit['title']} — {hit['pdf']} (p. {hit['page']})", expanded=(i == 0)):
+                        st.write(hit["text"])
+
         # --- Metodología ---
         # --- Metodología ---
     with tabs[4]:
@@ -449,38 +624,40 @@ if selected == "Inicio":
     # 2. PESTAÑA EXPLORADOR DE EVENTOS
     # =====================================================================================
 elif selected == "Explorador de Eventos":
+    import numpy as np
+    import scad_dtypes
+    import scad_views
+
     st.header("Explorador Geográfico de Eventos")
     st.caption("Distribución total de eventos por país con filtros esenciales y mapas coropléticos profesionales.")
 
     # -------------------------
     # Validación de datos
     # -------------------------
+    await_data()
     if "df" not in st.session_state or st.session_state.df is None or st.session_state.df.empty:
         st.warning("⚠️ Primero carga datos en Inicio → Datos.")
-        st.stop()
+        stop_page()
 
-    df = st.session_state.df.copy()
+    # Sin copia: el DataFrame cargado se comparte entre sesiones y las páginas nunca escriben
+    # en él; cada filtro por máscara ya devuelve un DataFrame nuevo (y pequeño)
+    df = st.session_state.df
 
     # -------------------------
-    # Columnas (robusto a nombres distintos)
+    # Columnas (roles resueltos al cargar; país y tipo ya vienen como *_display)
     # -------------------------
-    country_col = next((c for c in ["countryname", "country", "country_name"] if c in df.columns), None)
+    roles = load_roles(data_load)
+    country_col = roles["country"]
     if country_col is None:
         st.error("No se encontró columna de país (se esperaba 'countryname' o 'country').")
-        st.stop()
+        stop_page()
 
-    region_col = "region" if "region" in df.columns else None
-    event_type_col = next((c for c in ["event_type_label", "event_type", "type"] if c in df.columns), None)
+    region_col = roles["region"]
+    event_type_col = roles["event_type"]
 
     if "year" not in df.columns:
         st.error("No se encontró la columna 'year'.")
-        st.stop()
-
-    # Estandarización para visualizaciones
-    rename_map = {country_col: "country_display"}
-    if event_type_col:
-        rename_map[event_type_col] = "event_type_display"
-    df = df.rename(columns=rename_map)
+        stop_page()
 
     # -------------------------
     # Paleta (derivada de tu imagen) — EVENTOS (total)
@@ -542,10 +719,56 @@ elif selected == "Explorador de Eventos":
     else:
         selected_event_types = []
 
+    # 5) Fechas de actividad (índice de intervalos)
+    active_range = active_date_filter("event")
+
+    # 6) Episodios espacio-temporales (precalculados en el warm-up)
+    import scad_episodes
+
+    episodes = load_episodes(data_load)
+    episode_labels = dict(zip(episodes.summary["episode"], episodes.summary["label"]))
+    if episode_labels:
+        selected_episodes = st.multiselect(
+            "Episodio",
+            options=list(episode_labels),
+            format_func=episode_labels.get,
+            default=[],
+            key="event_episodes",
+            help=f"Grupos de eventos a ≤ {scad_episodes.RADIUS_KM:.0f} km y ≤ {scad_episodes.WINDOW_DAYS} días "
+                 "unos de otros (ordenados por número de eventos)."
+        )
+    else:
+        selected_episodes = []
+
+    # 7) Búsqueda de texto en issuenote / notes (índice invertido BM25)
+    import scad_search
+
+    search_query = ""
+    if any(c in df.columns for c in scad_search.TEXT_FIELDS):
+        search_query = st.text_input(
+            "Buscar en las notas (issuenote / notes)",
+            key="event_search",
+            placeholder="p. ej. teachers strike, election fraud, U.S. plans"
+        ).strip()
+    search_hits = load_search_index(data_load).search(search_query) if search_query else None
+
     # -------------------------
     # Aplicar filtros (EVENTOS TOTALES)
     # -------------------------
-    fdf = df.copy()
+    fdf = df
+    # Máscaras posicionales (índice de intervalos, episodios, búsqueda): se aplican antes de cualquier otro filtro
+    row_mask = None
+    if active_range:
+        row_mask = load_interval_index(data_load).mask(*active_range)
+    if selected_episodes:
+        episode_mask = episodes.mask(selected_episodes)
+        row_mask = episode_mask if row_mask is None else row_mask & episode_mask
+    if search_hits is not None:
+        search_mask = np.zeros(len(df), dtype=bool)
+        search_mask[search_hits["position"].to_numpy()] = True
+        row_mask = search_mask if row_mask is None else row_mask & search_mask
+    if row_mask is not None:
+        fdf = fdf[row_mask]
     if selected_regions and region_col:
         fdf = fdf[fdf[region_col].isin(selected_regions)]
     if selected_countries:
@@ -573,50 +796,91 @@ elif selected == "Explorador de Eventos":
     with k4:
         st.metric("Tipos de evento", types_count)
 
+    # -------------------------
+    # Resultados de la búsqueda (por relevancia BM25, dentro de los filtros)
+    # -------------------------
+    if search_hits is not None:
+        MAX_RESULTS = 50
+        ranked = search_hits[np.isin(search_hits["position"].to_numpy(), df.index.get_indexer(fdf.index))]
+        st.markdown(f"### 🔎 Resultados para «{search_query}»")
+        st.caption(f"{len(ranked):,} eventos coinciden con la búsqueda y los filtros"
+                   + (f"; se muestran los {MAX_RESULTS} más relevantes." if len(ranked) > MAX_RESULTS else "."))
+        top = ranked.head(MAX_RESULTS)
+        result_cols = [c for c in ["country_display", "startdate", "event_type_display", "ndeath",
+                                   "issuenote", "notes"] if c in df.columns]
+        results = df.iloc[top["position"].to_numpy()][result_cols].rename(columns={
+            "country_display": "País", "startdate": "Inicio", "event_type_display": "Tipo",
+            "ndeath": "Muertes", "issuenote": "Tema (issuenote)", "notes": "Notas",
+        })
+        results.insert(0, "Relevancia", top["score"].round(2).to_numpy())
+        st.dataframe(results, use_container_width=True, hide_index=True)
+
     st.divider()
 
     # -------------------------
     # Agregación por país (EVENTOS TOTALES)
     # -------------------------
-    import plotly.express as px
+    with profiler.step("import plotly.express", "plotly.express"):
+        import plotly.express as px
+
+    # Con los filtros por defecto se reutilizan las vistas del warm-up
+    is_default = (
+        (not region_col or sorted(selected_regions) == region_opts)
+        and not selected_countries
+        and tuple(selected_years) == (min_year, max_year)
+        and not selected_event_types
+        and not active_range
+        and not selected_episodes
+        and not search_query
+    )
+    # Filtros de la página: clave de la caché persistente de resultados
+    view_spec = {
+        "regions": set(selected_regions), "countries": set(selected_countries), "years": tuple(selected_years),
+        "event_types": set(selected_event_types), "active_range": active_range,
+        "episodes": set(selected_episodes), "search": search_query,
+    }
 
-    grp_total = fdf.groupby("country_display").size().reset_index(name="value")
+    grp_total = cached_view("events", "total", is_default, lambda: scad_views.country_totals(fdf), view_spec)
 
     if grp_total["value"].fillna(0).sum() == 0:
         st.info("No hay eventos para los filtros actuales.")
-        st.stop()
+        stop_page()
 
     # -------------------------
     # Helper de mapa (coroplético profesional)
     # -------------------------
     def plot_map(data, title, scope, geo_kwargs=None):
-        fig = px.choropleth(
-            data_frame=data,
-            locations="country_display",
-            locationmode="country names",
-            color="value",
-            color_continuous_scale=CHORO_EVENTS,
-            labels={"value": "Eventos (total)"},
-            title=title,
-            scope=scope,
-            hover_name="country_display",
-            hover_data={"value": ":,.0f"},
-        )
-        layout = dict(
-            margin={"r":0, "t":46, "l":0, "b":0},
-            height=540,
-            coloraxis_colorbar=dict(
-                title="Eventos",
-                thickness=14,
-                outlinewidth=0,
-                tickformat=","
-            ),
-            font=dict(size=13),
-        )
-        if geo_kwargs:
-            layout["geo"] = geo_kwargs
-        fig.update_layout(**layout)
-        st.plotly_chart(fig, use_container_width=True)
+        def build():
+            fig = px.choropleth(
+                data_frame=data,
+                locations="country_display",
+                locationmode="country names",
+                color="value",
+                color_continuous_scale=CHORO_EVENTS,
+                labels={"value": "Eventos (total)"},
+                title=title,
+                scope=scope,
+                hover_name="country_display",
+                hover_data={"value": ":,.0f"},
+            )
+            layout = dict(
+                margin={"r":0, "t":46, "l":0, "b":0},
+                height=540,
+                coloraxis_colorbar=dict(
+                    title="Eventos",
+                    thickness=14,
+                    outlinewidth=0,
+                    tickformat=","
+                ),
+                font=dict(size=13),
+            )
+            if geo_kwargs:
+                layout["geo"] = geo_kwargs
+            fig.update_layout(**layout)
+            return fig
+
+        # Cada mapa (su JSON) se guarda en la caché persistente con los filtros de la página
+        st.plotly_chart(cached_figure("events", title, view_spec, build), use_container_width=True)
 
     # -------------------------
     # Mapas (África / América) o mundial si no hay región
@@ -628,10 +892,10 @@ elif selected == "Explorador de Eventos":
         if not africa_df.empty and not americas_df.empty:
             colA, colB = st.columns(2)
             with colA:
-                dfa = africa_df.groupby("country_display").size().reset_index(name="value")
+                dfa = cached_view("events", "africa", is_default, lambda: scad_views.country_totals(africa_df), view_spec)
                 plot_map(dfa, "África · Eventos (total)", scope="africa")
             with colB:
-                dfam = americas_df.groupby("country_display").size().reset_index(name="value")
+                dfam = cached_view("events", "americas", is_default, lambda: scad_views.country_totals(americas_df), view_spec)
                 plot_map(
                     dfam, "América · Eventos (total)", scope="world",
                     geo_kwargs=dict(
@@ -642,10 +906,10 @@ elif selected == "Explorador de Eventos":
                     )
                 )
         elif not africa_df.empty:
-            dfa = africa_df.groupby("country_display").size().reset_index(name="value")
+            dfa = cached_view("events", "africa", is_default, lambda: scad_views.country_totals(africa_df), view_spec)
             plot_map(dfa, "África · Eventos (total)", scope="africa")
         elif not americas_df.empty:
-            dfam = americas_df.groupby("country_display").size().reset_index(name="value")
+            dfam = cached_view("events", "americas", is_default, lambda: scad_views.country_totals(americas_df), view_spec)
             plot_map(
                 dfam, "América · Eventos (total)", scope="world",
                 geo_kwargs=dict(
@@ -661,12 +925,48 @@ elif selected == "Explorador de Eventos":
         # Sin columna de región: mapa mundial
         plot_map(grp_total, "Mapa por país · Eventos (total)", scope="world")
 
+    # -------------------------
+    # Episodios: eventos coloreados por episodio
+    # -------------------------
+    if episode_labels and st.checkbox("🧭 Colorear eventos por episodio", key="event_color_episodes"):
+        TOP_EPISODES = 20
+        in_view = fdf.assign(episode=episodes.labels[df.index.get_indexer(fdf.index)])
+        in_view = in_view[in_view["episode"] >= 0]
+        counts = in_view["episode"].value_counts()
+        if counts.empty:
+            st.info("Ningún evento de los filtros actuales forma parte de un episodio.")
+        else:
+            top = counts.index[:TOP_EPISODES]
+            st.caption(f"{len(counts):,} episodios con eventos en los filtros actuales; "
+                       f"en el mapa, los {len(top)} mayores.")
+            points = in_view[in_view["episode"].isin(top)]
+            fig = px.scatter_geo(
+                points.assign(Episodio=points["episode"].map(episode_labels)),
+                lat="latitude", lon="longitude", color="Episodio",
+                hover_name="country_display", hover_data={"startdate": True, "latitude": False, "longitude": False},
+                title="Eventos por episodio (eventos cercanos en espacio y tiempo)",
+            )
+            fig.update_geos(fitbounds="locations", showcountries=True)
+            fig.update_layout(margin={"r": 0, "t": 46, "l": 0, "b": 0}, height=540, font=dict(size=13))
+            st.plotly_chart(fig, use_container_width=True)
+
+            table = episodes.summary[episodes.summary["episode"].isin(counts.index)].assign(
+                in_view=lambda t: t["episode"].map(counts))
+            st.dataframe(
+                table.drop(columns="label").rename(columns={
+                    "episode": "Episodio", "country_display": "País", "start": "Inicio", "end": "Fin",
+                    "days": "Días", "events": "Eventos", "deaths": "Muertes", "latitude": "Latitud",
+                    "longitude": "Longitud", "radius_km": "Radio (km)", "in_view": "Eventos (filtro)",
+                }),
+                use_container_width=True, hide_index=True,
+            )
+
     # -------------------------
     # Descarga de datos filtrados
     # -------------------------
     st.download_button(
         "⬇️ Descargar datos filtrados (CSV)",
-        data=fdf.to_csv(index=False).encode("utf-8"),
+        data=scad_dtypes.export_frame(fdf).to_csv(index=False).encode("utf-8"),
         file_name="scad_eventos_filtrado.csv",
         mime="text/csv"
     )
@@ -675,46 +975,47 @@ elif selected == "Explorador de Eventos":
     # 3. PESTAÑA EXPLORADOR DE MUERTES
     # =====================================================================================
 elif selected == "Explorador de Muertes":
+    import scad_dtypes
+    import scad_views
+
     st.header("Explorador Geográfico de Muertes")
     st.caption("Distribución total de muertes por país con filtros esenciales y mapas coropléticos profesionales.")
 
     # -------------------------
     # Validación de datos
     # -------------------------
+    await_data()
     if "df" not in st.session_state or st.session_state.df is None or st.session_state.df.empty:
         st.warning("⚠️ Primero carga datos en Inicio → Datos.")
-        st.stop()
-    df = st.session_state.df.copy()
+        stop_page()
+    # Sin copia: el DataFrame cargado se comparte entre sesiones y las páginas nunca escriben
+    # en él; cada filtro por máscara ya devuelve un DataFrame nuevo (y pequeño)
+    df = st.session_state.df
 
     # -------------------------
-    # Columnas (robusto a nombres distintos)
+    # Columnas (roles resueltos al cargar; país y tipo ya vienen como *_display)
     # -------------------------
+    roles = load_roles(data_load)
     # País
-    country_col = next((c for c in ["countryname", "country", "country_name"] if c in df.columns), None)
+    country_col = roles["country"]
     if country_col is None:
         st.error("No se encontró columna de país (se esperaba 'countryname' o 'country').")
-        st.stop()
+        stop_page()
 
     # Región / Continente
-    region_col = "region" if "region" in df.columns else None
+    region_col = roles["region"]
 
     # Tipo de evento
-    event_type_col = next((c for c in ["event_type_label", "event_type", "type"] if c in df.columns), None)
+    event_type_col = roles["event_type"]
 
     # Año y muertes
     if "year" not in df.columns:
         st.error("No se encontró la columna 'year'.")
-        st.stop()
-    death_col = "ndeath" if "ndeath" in df.columns else None
+        stop_page()
+    death_col = roles["deaths"]
     if not death_col:
         st.error("No se encontró la columna de muertes ('ndeath').")
-        st.stop()
-
-    # Estandarización para visualizaciones
-    rename_map = {country_col: "country_display"}
-    if event_type_col:
-        rename_map[event_type_col] = "event_type_display"
-    df = df.rename(columns=rename_map)
+        stop_page()
 
     # -------------------------
     # Paleta (rojos de tu paleta) — MUERTES
@@ -776,10 +1077,16 @@ elif selected == "Explorador de Muertes":
     else:
         selected_event_types = []
 
+    # 5) Fechas de actividad (índice de intervalos)
+    active_range = active_date_filter("death")
+
     # -------------------------
     # Aplicar filtros (MUERTES TOTALES)
     # -------------------------
-    fdf = df.copy()
+    fdf = df
+    if active_range:
+        # Máscara posicional del índice: se aplica antes de cualquier otro filtro
+        fdf = fdf[load_interval_index(data_load).mask(*active_range)]
     if selected_regions and region_col:
         fdf = fdf[fdf[region_col].isin(selected_regions)]
     if selected_countries:
@@ -797,7 +1104,7 @@ elif selected == "Explorador de Muertes":
     years_text = f"{selected_years[0]}–{selected_years[1]}"
     # Top país por muertes
     top_country = (
-        fdf.groupby("country_display")[death_col].sum().sort_values(ascending=False).head(1)
+        fdf.groupby("country_display", observed=True)[death_col].sum().sort_values(ascending=False).head(1)
     )
     top_country_name = top_country.index[0] if not top_country.empty else "—"
     top_country_val = int(top_country.iloc[0]) if not top_country.empty else 0
@@ -821,43 +1128,63 @@ elif selected == "Explorador de Muertes":
     # -------------------------
     # Agregación por país (MUERTES TOTALES)
     # -------------------------
+    with profiler.step("import plotly.express", "plotly.express"):
+        import plotly.express as px
 
-    grp_deaths = fdf.groupby("country_display")[death_col].sum().reset_index(name="value")
+    # Con los filtros por defecto se reutilizan las vistas del warm-up
+    is_default = (
+        (not region_col or sorted(selected_regions) == region_opts)
+        and not selected_countries
+        and tuple(selected_years) == (min_year, max_year)
+        and not selected_event_types
+        and not active_range
+    )
+    # Filtros de la página: clave de la caché persistente de resultados
+    view_spec = {
+        "regions": set(selected_regions), "countries": set(selected_countries), "years": tuple(selected_years),
+        "event_types": set(selected_event_types), "active_range": active_range,
+    }
+
+    grp_deaths = cached_view("deaths", "total", is_default, lambda: scad_views.country_totals(fdf, death_col), view_spec)
     if grp_deaths["value"].fillna(0).sum() == 0:
         st.info("No hay muertes registradas para los filtros actuales.")
-        st.stop()
+        stop_page()
 
     # -------------------------
     # Helper de mapa (coroplético profesional)
     # -------------------------
     def plot_map(data, title, scope, geo_kwargs=None):
-        fig = px.choropleth(
-            data_frame=data,
-            locations="country_display",
-            locationmode="country names",
-            color="value",
-            color_continuous_scale=CHORO_DEATHS,
-            labels={"value": "Muertes (total)"},
-            title=title,
-            scope=scope,
-            hover_name="country_display",
-            hover_data={"value": ":,.0f"},
-        )
-        layout = dict(
-            margin={"r":0, "t":46, "l":0, "b":0},
-            height=540,
-            coloraxis_colorbar=dict(
-                title="Muertes",
-                thickness=14,
-                outlinewidth=0,
-                tickformat=","
-            ),
-            font=dict(size=13),
-        )
-        if geo_kwargs:
-            layout["geo"] = geo_kwargs
-        fig.update_layout(**layout)
-        st.plotly_chart(fig, use_container_width=True)
+        def build():
+            fig = px.choropleth(
+                data_frame=data,
+                locations="country_display",
+                locationmode="country names",
+                color="value",
+                color_continuous_scale=CHORO_DEATHS,
+                labels={"value": "Muertes (total)"},
+                title=title,
+                scope=scope,
+                hover_name="country_display",
+                hover_data={"value": ":,.0f"},
+            )
+            layout = dict(
+                margin={"r":0, "t":46, "l":0, "b":0},
+                height=540,
+                coloraxis_colorbar=dict(
+                    title="Muertes",
+                    thickness=14,
+                    outlinewidth=0,
+                    tickformat=","
+                ),
+                font=dict(size=13),
+            )
+            if geo_kwargs:
+                layout["geo"] = geo_kwargs
+            fig.update_layout(**layout)
+            return fig
+
+        # Cada mapa (su JSON) se guarda en la caché persistente con los filtros de la página
+        st.plotly_chart(cached_figure("deaths", title, view_spec, build), use_container_width=True)
 
     # -------------------------
     # Mapas (África / América) o mundial si no hay región
@@ -869,10 +1196,10 @@ elif selected == "Explorador de Muertes":
         if not africa_df.empty and not americas_df.empty:
             colA, colB = st.columns(2)
             with colA:
-                dfa = africa_df.groupby("country_display")[death_col].sum().reset_index(name="value")
+                dfa = cached_view("deaths", "africa", is_default, lambda: scad_views.country_totals(africa_df, death_col), view_spec)
                 plot_map(dfa, "África · Muertes (total)", scope="africa")
             with colB:
-                dfam = americas_df.groupby("country_display")[death_col].sum().reset_index(name="value")
+                dfam = cached_view("deaths", "americas", is_default, lambda: scad_views.country_totals(americas_df, death_col), view_spec)
                 plot_map(
                     dfam, "América · Muertes (total)", scope="world",
                     geo_kwargs=dict(
@@ -883,10 +1210,10 @@ elif selected == "Explorador de Muertes":
                     )
                 )
         elif not africa_df.empty:
-            dfa = africa_df.groupby("country_display")[death_col].sum().reset_index(name="value")
+            dfa = cached_view("deaths", "africa", is_default, lambda: scad_views.country_totals(africa_df, death_col), view_spec)
             plot_map(dfa, "África · Muertes (total)", scope="africa")
         elif not americas_df.empty:
-            dfam = americas_df.groupby("country_display")[death_col].sum().reset_index(name="value")
+            dfam = cached_view("deaths", "americas", is_default, lambda: scad_views.country_totals(americas_df, death_col), view_spec)
             plot_map(
                 dfam, "América · Muertes (total)", scope="world",
                 geo_kwargs=dict(
@@ -909,7 +1236,7 @@ elif selected == "Explorador de Muertes":
     with cdl:
         st.download_button(
             "⬇️ Descargar filas filtradas (CSV)",
-            data=fdf.to_csv(index=False).encode("utf-8"),
+            data=scad_dtypes.export_frame(fdf).to_csv(index=False).encode("utf-8"),
             file_name="scad_muertes_filtrado_rows.csv",
             mime="text/csv",
             use_container_width=True
@@ -926,40 +1253,40 @@ elif selected == "Explorador de Muertes":
 # 4. PESTAÑA ESTADÍSTICAS GENERALES
 # =====================================================================================
 elif selected == "Estadísticas Generales":
+    import pandas as pd
+    import scad_rollups
+    import scad_dtypes
+    import scad_views
+
     st.header("Estadísticas Generales")
     st.caption("Indicadores globales, tendencias y distribuciones por país y tipo de evento (totales).")
 
     # -------------------------
     # Validación de datos
     # -------------------------
+    await_data()
     if "df" not in st.session_state or st.session_state.df is None or st.session_state.df.empty:
         st.warning("⚠️ Primero carga datos en Inicio → Datos.")
-        st.stop()
-    df = st.session_state.df.copy()
+        stop_page()
+    df = st.session_state.df
 
     # -------------------------
-    # Columnas robustas
+    # Columnas (roles resueltos al cargar)
     # -------------------------
-    country_col = next((c for c in ["countryname", "country", "country_name"] if c in df.columns), None)
+    roles = load_roles(data_load)
+    country_col = roles["country"]
     if country_col is None:
         st.error("No se encontró columna de país (se esperaba 'countryname' o 'country').")
-        st.stop()
+        stop_page()
 
-    region_col = "region" if "region" in df.columns else None
-    event_type_col = next((c for c in ["event_type_label", "event_type", "type"] if c in df.columns), None)
+    region_col = roles["region"]
+    event_type_col = roles["event_type"]
 
     if "year" not in df.columns:
         st.error("No se encontró la columna 'year'.")
-        st.stop()
+        stop_page()
 
-    death_col = "ndeath" if "ndeath" in df.columns else None
-
-    # Estandarización visual
-    rename_map = {country_col: "country_display"}
-    if event_type_col:
-        rename_map[event_type_col] = "event_type_display"
-    df = df.rename(columns=rename_map)
-    df["year"] = pd.to_numeric(df["year"], errors="coerce")
+    death_col = roles["deaths"]
 
     # -------------------------
     # Paleta corporativa
@@ -971,9 +1298,137 @@ elif selected == "Estadísticas Generales":
         "blue_gray": "#b1c7df",   # apoyo
         "slate": "#8094a8",
         "gray_light": "#d9dad5",
+        "amber": "#f2a541",       # picos anómalos
     }
     CHORO_EVENTS = ["#b1c7df", "#23b7d9", "#1d7084"]
     CHORO_DEATHS = ["#ffd9d7", "#f28b84", "#f0635e"]
+    COMPARE_COLORS = {"A": PALETTE["teal_dark"], "B": PALETTE["red"]}
+
+    # =========================
+    # Helpers de visualización
+    # =========================
+    with profiler.step("import plotly.express", "plotly.express"):
+        import plotly.express as px
+
+    def _layout_pro(fig, legend=True, h=420):
+        fig.update_layout(
+            margin=dict(l=0, r=0, t=48, b=0),
+            height=h,
+            font=dict(size=13),
+            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="left", x=0) if legend else None,
+        )
+        return fig
+
+    # =========================
+    # Modo comparación (A vs B)
+    # =========================
+    compare_mode = st.toggle(
+        "⚖️ Comparar dos conjuntos de filtros (A vs B)",
+        key="stats_compare",
+        help="Indicadores, tendencias y rankings de dos selecciones lado a lado, calculados juntos en una sola pasada."
+    )
+    if compare_mode:
+        import scad_compare
+
+        cmp_regions = sorted(df[region_col].dropna().unique().tolist()) if region_col else []
+        cmp_types = sorted(df["event_type_display"].dropna().unique()) if "event_type_display" in df.columns else []
+        min_year, max_year = int(df["year"].min()), int(df["year"].max())
+
+        def _spec_inputs(side, default_regions):
+            """Controles de un conjunto de filtros; devuelve su especificación."""
+            st.markdown(f"**Conjunto {side}**")
+            regions = (st.multiselect("Región", options=cmp_regions, default=default_regions,
+                                      key=f"stats_cmp_{side}_regions") if cmp_regions else [])
+            pool = df[df[region_col].isin(regions)] if regions else df
+            countries = st.multiselect("País", options=sorted(pool["country_display"].dropna().unique()),
+                                       default=[], key=f"stats_cmp_{side}_countries")
+            years = st.slider("Años", min_value=min_year, max_value=max_year, value=(min_year, max_year),
+                              key=f"stats_cmp_{side}_years")
+            event_types = (st.multiselect("Tipo de evento", options=cmp_types, default=[],
+                                          key=f"stats_cmp_{side}_event_types") if cmp_types else [])
+            return {"regions": regions, "countries": countries, "years": years, "event_types": event_types}
+
+        # Por defecto: primera región frente a la segunda (África vs América Latina)
+        col_a, col_b = st.columns(2)
+        with col_a:
+            spec_a = _spec_inputs("A", cmp_regions[:1])
+        with col_b:
+            spec_b = _spec_inputs("B", cmp_regions[1:2])
+        labels = {"A": scad_compare.spec_label("A", spec_a), "B": scad_compare.spec_label("B", spec_b)}
+        st.caption("Solo filtros esenciales: los avanzados actúan sobre filas y no se aplican al comparar. "
+                   "Diferencias calculadas como B − A.")
+
+        resolution = st.radio(
+            "Resolución", list(scad_rollups.RESOLUTIONS), horizontal=True, key="stats_cmp_resolution"
+        )
+        level = scad_rollups.RESOLUTIONS[resolution]
+        # Una sola consulta para los dos conjuntos (cacheada por versión del dataset y especificaciones)
+        comparison = load_comparison(
+            data_load, (scad_compare.spec_key(spec_a), scad_compare.spec_key(spec_b)), level
+        )
+
+        # --- KPIs pareados ---
+        st.subheader("Indicadores A vs B")
+        kpis = comparison["kpis"]
+        metrics = ["Eventos", "Muertes", "Países"] if death_col else ["Eventos", "Países"]
+        for col, metric in zip(st.columns(len(metrics)), metrics):
+            a, b = int(kpis.loc["A", metric]), int(kpis.loc["B", metric])
+            pct = scad_compare.pct_change(a, b)
+            with col:
+                st.metric(f"{metric} · A", f"{a:,}")
+                st.metric(f"{metric} · B", f"{b:,}", delta=f"{b - a:+,}" + (f" ({pct})" if pct else ""))
+        st.caption(f"{labels['A']}  \n{labels['B']}")
+
+        st.divider()
+
+        # --- Tendencias superpuestas ---
+        st.subheader("📉 Tendencias A vs B")
+        trend = comparison["trend"].assign(Conjunto=lambda t: t["Conjunto"].map(labels))
+        colors = {labels[side]: color for side, color in COMPARE_COLORS.items()}
+        period_word = {"year": "año", "month": "mes", "week": "semana", "day": "día"}[level]
+        trend_metrics = ["Eventos", "Muertes"] if death_col else ["Eventos"]
+        for col, metric in zip(st.columns(len(trend_metrics)), trend_metrics):
+            with col:
+                if trend.empty:
+                    st.info(f"Sin datos para la tendencia de {metric.lower()}.")
+                    continue
+                fig = px.line(trend, x="period", y=metric, color="Conjunto", color_discrete_map=colors,
+                              markers=level in ("year", "month"), title=f"{metric} por {period_word}")
+                fig.update_xaxes(title=None)
+                st.plotly_chart(_layout_pro(fig), use_container_width=True)
+
+        st.divider()
+
+        # --- Rankings con diferencias ---
+        st.subheader("🏆 Rankings por país A vs B")
+        cmp_top_n = int(st.number_input("Top-N países", min_value=5, max_value=30, value=10, step=1,
+                                        key="stats_cmp_topn"))
+        rank = comparison["rank"]
+        if not death_col:
+            rank = rank.drop(columns=["Muertes A", "Muertes B", "Δ Muertes"])
+        top = rank.head(cmp_top_n)
+        if top.empty:
+            st.info("Sin datos para el ranking.")
+        else:
+            bars = top.melt(id_vars="country_display", value_vars=["Eventos A", "Eventos B"],
+                            var_name="Conjunto", value_name="Eventos")
+            bars["Conjunto"] = bars["Conjunto"].str[-1].map(labels)
+            fig = px.bar(bars, x="Eventos", y="country_display", color="Conjunto", orientation="h",
+                         barmode="group", color_discrete_map=colors,
+                         title=f"Top {cmp_top_n} países · Eventos A vs B")
+            fig.update_yaxes(categoryorder="total ascending", title=None)
+            st.plotly_chart(_layout_pro(fig, h=max(420, 36 * len(top))), use_container_width=True)
+            st.dataframe(top, use_container_width=True, hide_index=True)
+
+        st.download_button(
+            "⬇️ Descargar comparación por país (CSV)",
+            data=rank.to_csv(index=False).encode("utf-8"),
+            file_name="scad_estadisticas_comparacion.csv",
+            mime="text/csv",
+            use_container_width=True
+        )
+        # El resto de la página (filtros y bloques de una sola selección) no se pinta al comparar
+        stop_page()
 
     # =========================
     # BLOQUE 1 · Filtros (esenciales + avanzados)
@@ -981,12 +1436,12 @@ elif selected == "Estadísticas Generales":
     with st.container():
         st.subheader("Filtros")
 
-        # --- Detección de columnas opcionales ---
-        sub_event_col = next((c for c in ["sub_event_type", "sub_event_type_label", "subtype"] if c in df.columns), None)
-        admin1_col     = next((c for c in ["admin1", "adm1", "admin_1"] if c in df.columns), None)
-        source_col     = next((c for c in ["source", "sources"] if c in df.columns), None)
-        actors_col     = next((c for c in ["actors", "actor1", "actor", "parties"] if c in df.columns), None)
-        pop_col        = next((c for c in ["population", "pop", "pop_est"] if c in df.columns), None)
+        # --- Columnas opcionales (None si el dataset no las tiene) ---
+        sub_event_col = roles["subtype"]
+        admin1_col     = roles["admin1"]
+        source_col     = roles["source"]
+        actors_col     = roles["actor"]
+        pop            = load_population(data_load)
 
         # --------- Filtros ESENCIALES ----------
         col_f1, col_f2, col_f3 = st.columns([1, 1.4, 1])
@@ -1123,11 +1578,11 @@ elif selected == "Estadísticas Generales":
         adv_controls.append(_ctl_smooth)
 
         # Normalización por población
-        if pop_col:
+        if not pop.empty:
             def _ctl_normpop():
                 val = st.checkbox("Normalizar por población (por 100k hab.)", value=False, key="stats_norm_pop")
                 if val:
-                    st.caption(f"Usando columna de población: **{pop_col}**")
+                    st.caption("Población país-año de la tabla de referencia (media del periodo en los rankings)")
                 return ("normalize_by_pop", val, _inc(val))
             adv_controls.append(_ctl_normpop)
 
@@ -1160,7 +1615,7 @@ elif selected == "Estadísticas Generales":
     # =========================
     # Aplicar filtros
     # =========================
-    fdf = df.copy()
+    fdf = df
 
     # Esenciales
     if selected_regions and region_col:
@@ -1189,19 +1644,30 @@ elif selected == "Estadísticas Generales":
     if death_col and min_deaths > 0:
         fdf = fdf[fdf[death_col].fillna(0) >= min_deaths]
 
-    # =========================
-    # Helpers de visualización
-    # =========================
-    import plotly.express as px
+    # Filtros avanzados que actúan sobre filas (no sobre región/país/tipo/año)
+    row_filters_active = bool(
+        selected_subtypes
+        or (actor_query or "").strip()
+        or selected_sources
+        or selected_admin1
+        or min_deaths
+    )
 
-    def _layout_pro(fig, legend=True, h=420):
-        fig.update_layout(
-            margin=dict(l=0, r=0, t=48, b=0),
-            height=h,
-            font=dict(size=13),
-            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="left", x=0) if legend else None,
-        )
-        return fig
+    # Con los filtros por defecto se reutilizan las vistas del warm-up
+    is_default = (
+        (not region_col or sorted(selected_regions) == region_opts)
+        and not selected_countries
+        and tuple(selected_years) == (min_year, max_year)
+        and not selected_event_types
+        and not row_filters_active
+    )
+    # Filtros de la página: clave de la caché persistente de resultados
+    view_spec = {
+        "regions": set(selected_regions), "countries": set(selected_countries), "years": tuple(selected_years),
+        "event_types": set(selected_event_types), "subtypes": set(selected_subtypes or []),
+        "actor": (actor_query or "").strip(), "sources": set(selected_sources or []),
+        "admin1": set(selected_admin1 or []), "min_deaths": min_deaths,
+    }
 
     # =========================
     # BLOQUE 2 · KPIs globales
@@ -1217,10 +1683,11 @@ elif selected == "Estadísticas Generales":
 
         # Población total (si hay normalización)
         total_pop = None
-        if normalize_by_pop and pop_col:
-            # Tomamos población única por país (si la columna es por país)
-            pop_map = df[["country_display", pop_col]].drop_duplicates().dropna()
-            total_pop = pop_map[pop_col].sum() if not pop_map.empty else None
+        if normalize_by_pop:
+            # Población media de cada país en los años seleccionados
+            in_range = pop[pop["country_display"].isin(fdf["country_display"].unique())
+                           & pop["year"].between(*selected_years)]
+            total_pop = in_range.groupby("country_display", observed=True)["population"].mean().sum() or None
 
         countries_count = fdf["country_display"].nunique()
         types_count = fdf["event_type_display"].nunique() if "event_type_display" in fdf.columns else "—"
@@ -1237,7 +1704,7 @@ elif selected == "Estadísticas Generales":
             st.metric("Periodo", years_text)
 
         if normalize_by_pop and total_pop:
-            st.caption(f"Normalización activa: métricas ‘por 100k hab.’ calculadas con población total ≈ {int(total_pop):,}")
+            st.caption(f"Normalización activa: métricas ‘por 100k hab.’ calculadas con población media del periodo ≈ {int(total_pop):,}")
 
     st.divider()
 
@@ -1246,60 +1713,130 @@ elif selected == "Estadísticas Generales":
     # =========================
     with st.container():
         st.subheader("📉 Tendencias temporales")
+        resolution = st.radio(
+            "Resolución", list(scad_rollups.RESOLUTIONS), horizontal=True, key="stats_resolution"
+        )
+        level = scad_rollups.RESOLUTIONS[resolution]
+        period_word = {"year": "año", "month": "mes", "week": "semana", "day": "día"}[level]
+        show_spikes = st.checkbox(
+            "Marcar picos anómalos por país", key="stats_spikes",
+            help="Meses con un z-score robusto ≥ 3.5 frente a la mediana de los 12 meses anteriores del país."
+        )
+
+        # Picos precalculados de los países y años filtrados
+        spikes = None
+        if show_spikes:
+            import scad_spikes
+
+            spikes = load_spikes(data_load)
+            spikes = spikes[spikes["country_display"].isin(fdf["country_display"].unique())
+                            & spikes["year"].between(*selected_years)]
+
+        def _mark_spikes(fig, ts, metric, y_col):
+            """Superpone los picos de `metric` sobre la serie `ts` (en el periodo que contiene cada mes)."""
+            if spikes is None:
+                return
+            placed = scad_spikes.spikes_on_trend(spikes[spikes["metric"] == metric], ts, x_col, y_col)
+            if placed.empty:
+                return
+            # Un marcador por punto de la serie, con todos sus picos en el tooltip
+            points = placed.assign(hover=placed["country_display"] + " · " + placed["period"].dt.strftime("%Y-%m")
+                                   + ": " + placed["value"].astype(int).astype(str) + f" {metric.lower()} (z = "
+                                   + placed["z"].astype(str) + ")")
+            points = points.groupby(["x", "y"], as_index=False)["hover"].agg("<br>".join)
+            fig.add_scatter(x=points["x"], y=points["y"], mode="markers", name="Pico anómalo",
+                            hovertext=points["hover"], hoverinfo="text", showlegend=False,
+                            marker=dict(symbol="triangle-up", size=12, color=PALETTE["amber"],
+                                        line=dict(color="white", width=1)))
+
+        # Resoluciones finas: se leen de los rollups precalculados. Los filtros avanzados
+        # actúan sobre filas, así que en ese caso se agregan solo las filas filtradas.
+        trend = None
+        x_col = "year"
+        if level != "year":
+            x_col = "period"
+            if row_filters_active:
+                trend = scad_rollups.TimeRollups.from_frame(fdf, death_col or "ndeath").series(level)
+            else:
+                rollups = load_rollups(data_load)
+                groups = rollups.group_mask(
+                    regions=selected_regions if region_col else None,
+                    countries=selected_countries,
+                    event_types=selected_event_types,
+                )
+                trend = rollups.series(level, groups, selected_years)
+        show_markers = level in ("year", "month")
+
         col1, col2 = st.columns(2)
 
-        # Eventos por año
+        # Eventos por periodo
         with col1:
-            ts_e = fdf.groupby("year").size().reset_index(name="Eventos")
-            if normalize_by_pop and pop_col:
-                # población total aprox: suma por países filtrados
-                pop_map = df[df["country_display"].isin(fdf["country_display"].unique())][["country_display", pop_col]].drop_duplicates().dropna()
-                tot_pop = pop_map[pop_col].sum() if not pop_map.empty else None
-                if tot_pop:
-                    ts_e["Eventos"] = (ts_e["Eventos"] / tot_pop) * 100000
-                    y_title = "Eventos por 100k hab."
-                else:
-                    y_title = "Eventos"
+            if trend is None:
+                ts_e = cached_view("stats", "trend_events", is_default,
+                                   lambda: scad_views.yearly_rates(
+                                       fdf.groupby("year").size().reset_index(name="Eventos"),
+                                       pop, fdf["country_display"].unique()), view_spec)
             else:
-                y_title = "Eventos"
+                ts_e = scad_views.yearly_rates(trend[["period", "Eventos"]].copy(), pop,
+                                               fdf["country_display"].unique(), period_col="period")
+            # Tasa por 100k con la población de cada año de los países filtrados
+            y_col, y_title = ("Eventos_100k", "Eventos por 100k hab.") if normalize_by_pop else ("Eventos", "Eventos")
 
             if ts_e.empty:
                 st.info("Sin datos para la tendencia de eventos.")
             else:
                 if smooth_win > 1:
-                    ts_e["Eventos"] = ts_e["Eventos"].rolling(smooth_win, min_periods=1).mean()
-                fig = px.line(ts_e, x="year", y="Eventos", markers=True, title=f"Eventos por año ({y_title})")
+                    ts_e[y_col] = ts_e[y_col].rolling(smooth_win, min_periods=1).mean()
+                fig = px.line(ts_e, x=x_col, y=y_col, markers=show_markers, labels={y_col: y_title},
+                              title=f"Eventos por {period_word} ({y_title})")
                 fig.update_traces(line=dict(color=PALETTE["teal_dark"], width=3),
                                   marker=dict(color=PALETTE["cyan"], size=7))
+                _mark_spikes(fig, ts_e, "Eventos", y_col)
                 st.plotly_chart(_layout_pro(fig), use_container_width=True)
 
-        # Muertes por año
+        # Muertes por periodo
         with col2:
             if death_col:
-                ts_d = fdf.groupby("year")[death_col].sum().reset_index(name="Muertes")
-                if normalize_by_pop and pop_col:
-                    pop_map = df[df["country_display"].isin(fdf["country_display"].unique())][["country_display", pop_col]].drop_duplicates().dropna()
-                    tot_pop = pop_map[pop_col].sum() if not pop_map.empty else None
-                    if tot_pop:
-                        ts_d["Muertes"] = (ts_d["Muertes"] / tot_pop) * 100000
-                        y_title = "Muertes por 100k hab."
-                    else:
-                        y_title = "Muertes"
+                if trend is None:
+                    ts_d = cached_view("stats", "trend_deaths", is_default,
+                                       lambda: scad_views.yearly_rates(
+                                           fdf.groupby("year")[death_col].sum().reset_index(name="Muertes"),
+                                           pop, fdf["country_display"].unique()), view_spec)
                 else:
-                    y_title = "Muertes"
+                    ts_d = scad_views.yearly_rates(trend[["period", "Muertes"]].copy(), pop,
+                                                   fdf["country_display"].unique(), period_col="period")
+                y_col, y_title = ("Muertes_100k", "Muertes por 100k hab.") if normalize_by_pop else ("Muertes", "Muertes")
 
                 if ts_d.empty or (ts_d["Muertes"].fillna(0).sum() == 0 and not normalize_by_pop):
                     st.info("Sin datos suficientes para la tendencia de muertes.")
                 else:
                     if smooth_win > 1:
-                        ts_d["Muertes"] = ts_d["Muertes"].rolling(smooth_win, min_periods=1).mean()
-                    fig = px.line(ts_d, x="year", y="Muertes", markers=True, title=f"Muertes por año ({y_title})")
+                        ts_d[y_col] = ts_d[y_col].rolling(smooth_win, min_periods=1).mean()
+                    fig = px.line(ts_d, x=x_col, y=y_col, markers=show_markers, labels={y_col: y_title},
+                                  title=f"Muertes por {period_word} ({y_title})")
                     fig.update_traces(line=dict(color=PALETTE["red"], width=3),
                                       marker=dict(color=PALETTE["red"], size=7))
+                    _mark_spikes(fig, ts_d, "Muertes", y_col)
                     st.plotly_chart(_layout_pro(fig), use_container_width=True)
             else:
                 st.info("No hay columna de muertes en el dataset.")
 
+        # Listado de los picos marcados
+        if spikes is not None:
+            st.markdown(f"**⚠️ Picos detectados ({len(spikes):,})**")
+            st.caption("Calculados sobre la serie mensual completa de cada país (sin los filtros avanzados); "
+                       "línea base = mediana de los 12 meses anteriores.")
+            if spikes.empty:
+                st.info("No hay picos anómalos en los países y años filtrados.")
+            else:
+                st.dataframe(
+                    spikes.assign(period=spikes["period"].dt.strftime("%Y-%m"))
+                    .rename(columns={"country_display": "País", "period": "Mes", "metric": "Métrica",
+                                     "value": "Valor", "baseline": "Línea base", "z": "z robusto"})
+                    .drop(columns="year"),
+                    use_container_width=True, hide_index=True,
+                )
+
     st.divider()
 
     # =========================
@@ -1311,13 +1848,13 @@ elif selected == "Estadísticas Generales":
 
         # Eventos
         with col3:
-            rank_e = fdf.groupby("country_display").size().reset_index(name="Eventos")
-            if normalize_by_pop and pop_col:
-                pop_map = df[["country_display", pop_col]].drop_duplicates()
-                rank_e = rank_e.merge(pop_map, on="country_display", how="left")
-                rank_e["Eventos_norm"] = (rank_e["Eventos"] / rank_e[pop_col]) * 100000
-                rank_e = rank_e.dropna(subset=["Eventos_norm"]).sort_values("Eventos_norm", ascending=False).head(int(top_n))
-                x_col, title = "Eventos_norm", f"Top {int(top_n)} países · Eventos por 100k hab."
+            rank_e = cached_view("stats", "rank_events", is_default,
+                                 lambda: scad_views.country_rates(
+                                     fdf.groupby("country_display", observed=True).size().reset_index(name="Eventos"),
+                                     pop, selected_years), view_spec)
+            if normalize_by_pop:
+                rank_e = rank_e.dropna(subset=["Eventos_100k"]).sort_values("Eventos_100k", ascending=False).head(int(top_n))
+                x_col, title = "Eventos_100k", f"Top {int(top_n)} países · Eventos por 100k hab."
             else:
                 rank_e = rank_e.sort_values("Eventos", ascending=False).head(int(top_n))
                 x_col, title = "Eventos", f"Top {int(top_n)} países · Eventos (total)"
@@ -1333,13 +1870,13 @@ elif selected == "Estadísticas Generales":
         # Muertes
         with col4:
             if death_col:
-                rank_d = fdf.groupby("country_display")[death_col].sum().reset_index(name="Muertes")
-                if normalize_by_pop and pop_col:
-                    pop_map = df[["country_display", pop_col]].drop_duplicates()
-                    rank_d = rank_d.merge(pop_map, on="country_display", how="left")
-                    rank_d["Muertes_norm"] = (rank_d["Muertes"] / rank_d[pop_col]) * 100000
-                    rank_d = rank_d.dropna(subset=["Muertes_norm"]).sort_values("Muertes_norm", ascending=False).head(int(top_n))
-                    x_col, title = "Muertes_norm", f"Top {int(top_n)} países · Muertes por 100k hab."
+                rank_d = cached_view("stats", "rank_deaths", is_default,
+                                     lambda: scad_views.country_rates(
+                                         fdf.groupby("country_display", observed=True)[death_col].sum().reset_index(name="Muertes"),
+                                         pop, selected_years), view_spec)
+                if normalize_by_pop:
+                    rank_d = rank_d.dropna(subset=["Muertes_100k"]).sort_values("Muertes_100k", ascending=False).head(int(top_n))
+                    x_col, title = "Muertes_100k", f"Top {int(top_n)} países · Muertes por 100k hab."
                 else:
                     rank_d = rank_d.sort_values("Muertes", ascending=False).head(int(top_n))
                     x_col, title = "Muertes", f"Top {int(top_n)} países · Muertes (total)"
@@ -1362,8 +1899,8 @@ elif selected == "Estadísticas Generales":
     with st.container():
         st.subheader("📦 Distribución por tipo de evento")
         if "event_type_display" in fdf.columns:
-            dist_types = (fdf.groupby("event_type_display").size()
-                          .reset_index(name="Eventos")
+            dist_types = (cached_view("stats", "dist_types", is_default,
+                                      lambda: fdf.groupby("event_type_display", observed=True).size().reset_index(name="Eventos"), view_spec)
                           .sort_values("Eventos", ascending=False))
             if not dist_types.empty:
                 fig = px.bar(dist_types, x="event_type_display", y="Eventos", title="Eventos por tipo")
@@ -1383,7 +1920,8 @@ elif selected == "Estadísticas Generales":
     with st.container():
         st.subheader("🔥 Heatmap")
         if region_col:
-            heat = fdf.groupby(["year", region_col]).size().reset_index(name="Eventos")
+            heat = cached_view("stats", "heat", is_default,
+                               lambda: fdf.groupby(["year", region_col], observed=True).size().reset_index(name="Eventos"), view_spec)
             if not heat.empty:
                 fig = px.density_heatmap(
                     heat, x="year", y=region_col, z="Eventos",
@@ -1395,10 +1933,10 @@ elif selected == "Estadísticas Generales":
                 st.info("Sin datos para el heatmap por región.")
         else:
             # Sin región: top-8 países para no saturar
-            top8 = (fdf.groupby("country_display").size()
+            top8 = (fdf.groupby("country_display", observed=True).size()
                     .sort_values(ascending=False).head(8).index.tolist())
             heat = (fdf[fdf["country_display"].isin(top8)]
-                    .groupby(["year", "country_display"]).size().reset_index(name="Eventos"))
+                    .groupby(["year", "country_display"], observed=True).size().reset_index(name="Eventos"))
             if not heat.empty:
                 fig = px.density_heatmap(
                     heat, x="year", y="country_display", z="Eventos",
@@ -1416,20 +1954,25 @@ elif selected == "Estadísticas Generales":
     # =========================
     with st.container():
         st.subheader("📄 Resumen por país")
-        country_events = fdf.groupby("country_display").size().reset_index(name="Eventos")
+        country_events = cached_view("stats", "rank_events", is_default,
+                                     lambda: scad_views.country_rates(
+                                         fdf.groupby("country_display", observed=True).size().reset_index(name="Eventos"),
+                                         pop, selected_years), view_spec)
         if death_col:
-            country_deaths = fdf.groupby("country_display")[death_col].sum().reset_index(name="Muertes")
+            country_deaths = cached_view("stats", "rank_deaths", is_default,
+                                         lambda: scad_views.country_rates(
+                                             fdf.groupby("country_display", observed=True)[death_col].sum().reset_index(name="Muertes"),
+                                             pop, selected_years), view_spec)
             summary = pd.merge(country_events, country_deaths, on="country_display", how="left")
         else:
             summary = country_events.copy()
 
-        # Normalización por 100k (si procede)
-        if normalize_by_pop and pop_col:
-            pop_map = df[["country_display", pop_col]].drop_duplicates()
-            summary = summary.merge(pop_map, on="country_display", how="left")
-            summary["Eventos_100k"] = (summary["Eventos"] / summary[pop_col]) * 100000
-            if "Muertes" in summary.columns:
-                summary["Muertes_100k"] = (summary["Muertes"] / summary[pop_col]) * 100000
+        # Tasas por 100k (precalculadas) solo si la normalización está activa
+        rate_cols = [c for c in summary.columns if c.endswith("_100k")]
+        if normalize_by_pop:
+            summary = summary[[c for c in summary.columns if c not in rate_cols] + rate_cols]
+        else:
+            summary = summary.drop(columns=rate_cols)
 
         st.dataframe(summary.sort_values(by="Eventos", ascending=False), use_container_width=True)
 
@@ -1437,7 +1980,7 @@ elif selected == "Estadísticas Generales":
         with cdl:
             st.download_button(
                 "⬇️ Descargar filas filtradas (CSV)",
-                data=fdf.to_csv(index=False).encode("utf-8"),
+                data=scad_dtypes.export_frame(fdf).to_csv(index=False).encode("utf-8"),
                 file_name="scad_estadisticas_filtrado.csv",
                 mime="text/csv",
                 use_container_width=True
@@ -1455,35 +1998,35 @@ elif selected == "Estadísticas Generales":
 # 5. ANALISIS POR RELIGION
 # =====================================================================================
 elif selected == "Análisis por Religión":
+    import pandas as pd
+    import scad_views
+
     st.header("Análisis de Conflictos Religiosos y Étnicos")
     st.caption("Eventos identificados por palabras clave en columnas de tema (issue1_label / issue_main). Filtros: Región y Años.")
 
     # -------------------------
     # Validación y preparación de columnas
     # -------------------------
+    await_data()
     if "df" not in st.session_state or st.session_state.df is None or st.session_state.df.empty:
         st.warning("⚠️ Primero carga datos en Inicio → Datos.")
-        st.stop()
-    df = st.session_state.df.copy()
+        stop_page()
+    # Sin copia: el DataFrame cargado se comparte entre sesiones y las páginas nunca escriben
+    # en él; cada filtro por máscara ya devuelve un DataFrame nuevo (y pequeño)
+    df = st.session_state.df
 
-    country_col = next((c for c in ["countryname", "country", "country_name"] if c in df.columns), None)
+    roles = load_roles(data_load)
+    country_col = roles["country"]
     if not country_col:
         st.error("No se encontró la columna de país (p. ej., 'countryname').")
-        st.stop()
+        stop_page()
 
-    region_col = "region" if "region" in df.columns else None
+    region_col = roles["region"]
     if "year" not in df.columns:
         st.error("No se encontró la columna 'year'.")
-        st.stop()
-    death_col = "ndeath" if "ndeath" in df.columns else None
-    event_type_col = next((c for c in ["event_type_label", "event_type", "type"] if c in df.columns), None)
-
-    # Estandarización mínima
-    rename_map = {country_col: "country_display"}
-    if event_type_col:
-        rename_map[event_type_col] = "event_type_display"
-    df = df.rename(columns=rename_map)
-    df["year"] = pd.to_numeric(df["year"], errors="coerce")
+        stop_page()
+    death_col = roles["deaths"]
+    event_type_col = roles["event_type"]
 
     # -------------------------
     # Paleta divergente (azules ↔ neutro ↔ rojos)
@@ -1507,26 +2050,16 @@ elif selected == "Análisis por Religión":
     # -------------------------
     if not {"issue1_label", "issue_main"}.intersection(df.columns):
         st.error("No se encontraron columnas 'issue1_label' o 'issue_main' en el dataset.")
-        st.stop()
-
-    religion_keywords = [
-        "religio", "ethnic", "étnico", "identidad", "discriminación", "discrimination",
-        "muslim", "cristian", "christian", "islam", "hindu", "jew", "judío"
-    ]
-    regex = "|".join(religion_keywords)
+        stop_page()
 
-    mask = pd.Series(False, index=df.index)
-    if "issue1_label" in df.columns:
-        mask = mask | df["issue1_label"].astype(str).str.contains(regex, case=False, na=False)
-    if "issue_main" in df.columns:
-        mask = mask | df["issue_main"].astype(str).str.contains(regex, case=False, na=False)
+    mask = scad_views.religion_mask(df)
 
-    religion_df = df[mask].copy()
+    religion_df = df[mask]
     st.info(f"Se encontraron **{len(religion_df):,}** eventos relacionados con religión o identidad étnica.")
 
     if religion_df.empty:
         st.warning("No se encontraron eventos con temas religiosos en el dataset actual.")
-        st.stop()
+        stop_page()
 
     # -------------------------
     # Filtros ESENCIALES (solo Región y Años)
@@ -1559,11 +2092,18 @@ elif selected == "Análisis por Religión":
         )
 
     # Aplicar filtros
-    fdf = religion_df.copy()
+    fdf = religion_df
     if religion_regions and region_col:
         fdf = fdf[fdf[region_col].isin(religion_regions)]
     fdf = fdf[(fdf["year"] >= religion_years[0]) & (fdf["year"] <= religion_years[1])]
 
+    # Con los filtros por defecto se reutilizan las vistas del warm-up
+    is_default = (
+        (not region_col or sorted(religion_regions) == region_opts)
+        and tuple(religion_years) == (min_year, max_year)
+    )
+    view_spec = {"regions": set(religion_regions), "years": tuple(religion_years)}
+
     # -------------------------
     # KPIs globales (totales)
     # -------------------------
@@ -1584,10 +2124,12 @@ elif selected == "Análisis por Religión":
     # -------------------------
     # GRÁFICO 1 · Eventos por año (barras azules)
     # -------------------------
-    import plotly.express as px
+    with profiler.step("import plotly.express", "plotly.express"):
+        import plotly.express as px
 
     st.subheader("🕌 Eventos religiosos/étnicos por año")
-    by_year = fdf.groupby("year").size().reset_index(name="Eventos")
+    by_year = cached_view("religion", "by_year", is_default,
+                          lambda: fdf.groupby("year").size().reset_index(name="Eventos"), view_spec)
     if by_year.empty:
         st.info("Sin datos para la serie temporal.")
     else:
@@ -1601,8 +2143,7 @@ elif selected == "Análisis por Religión":
     # -------------------------
     st.subheader("📌 Temas religiosos/étnicos")
     if "issue1_label" in fdf.columns:
-        topics = fdf["issue1_label"].dropna().value_counts().reset_index()
-        topics.columns = ["Tema", "Eventos"]
+        topics = cached_view("religion", "topics", is_default, lambda: scad_views.topic_counts(fdf), view_spec)
         if topics.empty:
             st.info("Sin datos para la distribución por tema.")
         else:
@@ -1622,12 +2163,7 @@ elif selected == "Análisis por Religión":
     # GRÁFICO 3 · Top países (barra horizontal roja)
     # -------------------------
     st.subheader("🧭 Top países por conflictos religiosos/étnicos")
-    top_countries = (
-        fdf.groupby("country_display").size()
-          .reset_index(name="Eventos")
-          .sort_values("Eventos", ascending=False)
-          .head(10)
-    )
+    top_countries = cached_view("religion", "top_countries", is_default, lambda: scad_views.top_countries(fdf), view_spec)
     if top_countries.empty:
         st.info("Sin datos para el ranking por país.")
     else:
@@ -1652,7 +2188,327 @@ elif selected == "Análisis por Religión":
     st.dataframe(fdf[cols_show].reset_index(drop=True), use_container_width=True)
 
 # =====================================================================================
-# 6. PESTAÑA
+# 6. PESTAÑA EXPLORADOR DE TEMAS
+# =====================================================================================
+elif selected == "Explorador de Temas":
+    import numpy as np
+    import scad_issues
+
+    st.header("Explorador de Temas")
+    st.caption("Co-ocurrencia de los tres temas de cada evento (issue1–issue3) y cruce tema × tipo de evento.")
+
+    # -------------------------
+    # Validación de datos
+    # -------------------------
+    await_data()
+    if "df" not in st.session_state or st.session_state.df is None or st.session_state.df.empty:
+        st.warning("⚠️ Primero carga datos en Inicio → Datos.")
+        stop_page()
+    df = st.session_state.df
+    roles = load_roles(data_load)
+    region_col = roles["region"]
+
+    # Tablas precalculadas por año y país: los filtros solo seleccionan entradas
+    issues = load_issues(data_load)
+    year_range = issues.year_range()
+    if year_range is None:
+        st.warning("El dataset no incluye columnas de tema (issue1–issue3).")
+        stop_page()
+    if scad_issues.BITS_COL not in df.columns:
+        st.caption("ℹ️ El dataset no trae `issue_bits` (ETL anterior): solo se usan los temas que conserva el CSV.")
+
+    # -------------------------
+    # Filtros
+    # -------------------------
+    st.subheader("Filtros")
+    col_f1, col_f2, col_f3 = st.columns([1, 1.4, 1])
+
+    with col_f1:
+        if region_col:
+            region_opts = sorted(df[region_col].dropna().unique().tolist())
+            selected_regions = st.multiselect("Región", options=region_opts, default=region_opts, key="issues_regions")
+        else:
+            region_opts, selected_regions = [], []
+            st.caption("ℹ️ El dataset no incluye columna de región; se omite este filtro.")
+
+    with col_f2:
+        if selected_regions and region_col:
+            country_opts = df.loc[df[region_col].isin(selected_regions), "country_display"].dropna().unique()
+        else:
+            country_opts = issues.countries
+        selected_countries = st.multiselect("País", options=sorted(country_opts), default=[], key="issues_countries")
+
+    with col_f3:
+        selected_years = st.slider("Años", min_value=year_range[0], max_value=year_range[1],
+                                   value=year_range, key="issues_years")
+
+    scale = st.radio("Valores", ["Eventos", "% de los eventos del tema (fila)"], horizontal=True, key="issues_scale",
+                     help="En porcentaje, cada celda es la proporción de eventos del tema de la fila que también tienen el de la columna.")
+    as_share = scale != "Eventos"
+
+    # Países de la selección: los elegidos, o los de las regiones elegidas (None = todos)
+    if selected_countries:
+        countries = selected_countries
+    elif region_col and sorted(selected_regions) != region_opts:
+        countries = country_opts
+    else:
+        countries = None
+
+    matrix = issues.matrix(selected_years, countries)
+    crosstab = issues.crosstab(selected_years, countries)
+    totals = issues.totals_of(selected_years, countries)
+    if totals["events"] == 0:
+        st.info("Sin eventos para los filtros seleccionados.")
+        stop_page()
+
+    # Solo los temas presentes en la selección
+    present = np.diag(matrix.to_numpy()) > 0
+    matrix = matrix.loc[present, present]
+    crosstab = crosstab.loc[present, crosstab.sum(axis=0) > 0]
+
+    # -------------------------
+    # KPIs
+    # -------------------------
+    pairs = scad_issues.top_pairs(matrix, n=len(matrix) ** 2)
+    k1, k2, k3, k4 = st.columns(4)
+    with k1:
+        st.metric("Eventos", f"{totals['events']:,}")
+    with k2:
+        st.metric("Con 2+ temas", f"{totals['multi']:,}")
+    with k3:
+        st.metric("% con 2+ temas", f"{totals['multi'] / totals['events'] * 100:.1f} %")
+    with k4:
+        st.metric("Pares de temas distintos", f"{len(pairs):,}")
+
+    st.divider()
+
+    with profiler.step("import plotly.express", "plotly.express"):
+        import plotly.express as px
+
+    ISSUE_SCALE = ["#f7fbfd", "#b1c7df", "#23b7d9", "#1d7084"]
+
+    # -------------------------
+    # Matriz tema × tema
+    # -------------------------
+    st.subheader("🧩 Co-ocurrencia de temas")
+    shown = matrix.astype(float)
+    if as_share:
+        shown = shown.div(np.diag(matrix.to_numpy()), axis=0) * 100
+    fig = px.imshow(shown, text_auto=".0f", aspect="auto", color_continuous_scale=ISSUE_SCALE,
+                    labels=dict(x="Tema", y="Tema", color="%" if as_share else "Eventos"))
+    fig.update_layout(height=max(420, 42 * len(shown)), margin=dict(l=0, r=0, t=24, b=0), font=dict(size=12))
+    st.plotly_chart(fig, use_container_width=True)
+    st.caption("Diagonal: eventos con ese tema en cualquiera de sus tres posiciones.")
+
+    col_p, col_c = st.columns([1, 1.4])
+    with col_p:
+        st.markdown("**Pares más frecuentes**")
+        st.dataframe(
+            pairs.head(15).rename(columns={"issue_a": "Tema A", "issue_b": "Tema B", "events": "Eventos",
+                                           "share_of_rarer": "% del tema menos frecuente"})
+            .assign(**{"% del tema menos frecuente": lambda t: (t["% del tema menos frecuente"] * 100).round(1)}),
+            use_container_width=True, hide_index=True)
+
+    # -------------------------
+    # Cruce tema × tipo de evento
+    # -------------------------
+    with col_c:
+        st.markdown("**Tema × tipo de evento**")
+        shown_ct = crosstab.astype(float)
+        if as_share:
+            shown_ct = shown_ct.div(shown_ct.sum(axis=1), axis=0) * 100
+        fig = px.imshow(shown_ct, text_auto=".0f", aspect="auto", color_continuous_scale=ISSUE_SCALE,
+                        labels=dict(x="Tipo de evento", y="Tema", color="%" if as_share else "Eventos"))
+        fig.update_layout(height=max(420, 42 * len(shown_ct)), margin=dict(l=0, r=0, t=24, b=0), font=dict(size=12))
+        st.plotly_chart(fig, use_container_width=True)
+
+    cdl, cdr = st.columns(2)
+    with cdl:
+        st.download_button(
+            "⬇️ Descargar co-ocurrencia (CSV)",
+            data=matrix.to_csv().encode("utf-8"),
+            file_name="scad_temas_coocurrencia.csv",
+            mime="text/csv",
+            use_container_width=True
+        )
+    with cdr:
+        st.download_button(
+            "⬇️ Descargar tema × tipo de evento (CSV)",
+            data=crosstab.to_csv().encode("utf-8"),
+            file_name="scad_temas_por_tipo.csv",
+            mime="text/csv",
+            use_container_width=True
+        )
+
+# =====================================================================================
+# 7. PESTAÑA RED DE ACTORES
+# =====================================================================================
+elif selected == "Red de Actores":
+    import numpy as np
+    import scad_network
+
+    st.header("Red de Actores")
+    st.caption("Quién actúa contra quién (actor1 → target1): aristas más frecuentes, rankings de grado y grafo de la selección.")
+
+    # -------------------------
+    # Validación de datos
+    # -------------------------
+    await_data()
+    if "df" not in st.session_state or st.session_state.df is None or st.session_state.df.empty:
+        st.warning("⚠️ Primero carga datos en Inicio → Datos.")
+        stop_page()
+    df = st.session_state.df
+    roles = load_roles(data_load)
+    region_col = roles["region"]
+
+    # Matriz precalculada: los filtros solo seleccionan entradas, no reagrupan filas
+    network = load_network(data_load)
+    if network.n_entries == 0:
+        st.warning("El dataset no incluye columnas 'actor1' / 'target1' con datos.")
+        stop_page()
+
+    # -------------------------
+    # Filtros
+    # -------------------------
+    st.subheader("Filtros")
+    col_f1, col_f2, col_f3 = st.columns([1, 1.4, 1])
+
+    with col_f1:
+        if region_col:
+            region_opts = sorted(df[region_col].dropna().unique().tolist())
+            selected_regions = st.multiselect("Región", options=region_opts, default=region_opts, key="net_regions")
+        else:
+            region_opts, selected_regions = [], []
+            st.caption("ℹ️ El dataset no incluye columna de región; se omite este filtro.")
+
+    with col_f2:
+        if selected_regions and region_col:
+            country_opts = df.loc[df[region_col].isin(selected_regions), "country_display"].dropna().unique()
+        else:
+            country_opts = network.countries
+        selected_countries = st.multiselect("País", options=sorted(country_opts), default=[], key="net_countries")
+
+    with col_f3:
+        min_year, max_year = int(network.year.min()), int(network.year.max())
+        selected_years = st.slider("Años", min_value=min_year, max_value=max_year,
+                                   value=(min_year, max_year), key="net_years")
+
+    col_f4, col_f5 = st.columns(2)
+    with col_f4:
+        top_k = st.slider("Aristas visibles (top-k)", min_value=10, max_value=200, value=40, step=10, key="net_top_k",
+                          help="El grafo solo dibuja las k aristas más pesadas de la selección.")
+    with col_f5:
+        weight_label = st.radio("Peso de las aristas", ["Eventos", "Muertes"], horizontal=True, key="net_weight")
+    weight_col = {"Eventos": "events", "Muertes": "deaths"}[weight_label]
+
+    # Países de la selección: los elegidos, o los de las regiones elegidas (None = todos)
+    if selected_countries:
+        countries = selected_countries
+    elif region_col and sorted(selected_regions) != region_opts:
+        countries = country_opts
+    else:
+        countries = None
+
+    edges = network.edges(selected_years, countries)
+    edges = edges.sort_values([weight_col, "events"], ascending=False, ignore_index=True)
+    if edges.empty:
+        st.info("Sin pares actor → objetivo para los filtros seleccionados.")
+        stop_page()
+
+    # -------------------------
+    # KPIs
+    # -------------------------
+    k1, k2, k3, k4 = st.columns(4)
+    with k1:
+        st.metric("Actores", f"{edges['src'].nunique():,}")
+    with k2:
+        st.metric("Objetivos", f"{edges['dst'].nunique():,}")
+    with k3:
+        st.metric("Pares actor → objetivo", f"{len(edges):,}")
+    with k4:
+        st.metric("Eventos", f"{int(edges['events'].sum()):,}")
+
+    st.divider()
+
+    # -------------------------
+    # Grafo del subgrafo visible (layout de fuerzas solo sobre las top-k aristas)
+    # -------------------------
+    with profiler.step("import plotly.graph_objects", "plotly.graph_objects"):
+        import plotly.graph_objects as go
+
+    st.subheader(f"🕸️ Grafo · top {top_k} aristas por {weight_label.lower()}")
+    visible = edges.head(top_k)
+    nodes = np.unique(np.concatenate([visible["src"].to_numpy(), visible["dst"].to_numpy()]))
+    local_src = np.searchsorted(nodes, visible["src"].to_numpy())
+    local_dst = np.searchsorted(nodes, visible["dst"].to_numpy())
+    pos = scad_network.spring_layout(len(nodes), local_src, local_dst, visible[weight_col].to_numpy())
+
+    edge_x, edge_y = [], []
+    for a, b in zip(local_src, local_dst):
+        edge_x += [pos[a, 0], pos[b, 0], None]
+        edge_y += [pos[a, 1], pos[b, 1], None]
+    strength = (np.bincount(local_src, weights=visible[weight_col], minlength=len(nodes))
+                + np.bincount(local_dst, weights=visible[weight_col], minlength=len(nodes)))
+    is_actor = np.isin(np.arange(len(nodes)), local_src)
+    is_target = np.isin(np.arange(len(nodes)), local_dst)
+    node_role = np.where(is_actor & is_target, "Actor y objetivo", np.where(is_actor, "Actor", "Objetivo"))
+    node_colors = {"Actor": "#1d7084", "Objetivo": "#f0635e", "Actor y objetivo": "#8094a8"}
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=edge_x, y=edge_y, mode="lines", hoverinfo="skip", showlegend=False,
+                             line=dict(color="#d9dad5", width=1)))
+    for role_name, color in node_colors.items():
+        sel = node_role == role_name
+        if not sel.any():
+            continue
+        fig.add_trace(go.Scatter(
+            x=pos[sel, 0], y=pos[sel, 1], mode="markers+text", name=role_name,
+            text=network.names[nodes[sel]], textposition="top center", textfont=dict(size=10),
+            marker=dict(color=color, size=8 + 22 * np.sqrt(strength[sel] / max(strength.max(), 1))),
+            hovertemplate="%{text}<br>" + weight_label + ": %{customdata:,.0f}<extra></extra>",
+            customdata=strength[sel],
+        ))
+    fig.update_layout(height=620, margin=dict(l=0, r=0, t=24, b=0), font=dict(size=13),
+                      legend=dict(orientation="h", yanchor="bottom", y=1.0, xanchor="left", x=0),
+                      xaxis=dict(visible=False), yaxis=dict(visible=False), plot_bgcolor="white")
+    st.plotly_chart(fig, use_container_width=True)
+
+    st.divider()
+
+    # -------------------------
+    # Aristas y rankings de grado (sobre toda la selección, no solo el subgrafo visible)
+    # -------------------------
+    col_e, col_d = st.columns([1.2, 1])
+    with col_e:
+        st.subheader("🔗 Aristas más frecuentes")
+        top_edges = edges.head(top_k)[["actor", "target", "events", "deaths"]].rename(
+            columns={"actor": "Actor", "target": "Objetivo", "events": "Eventos", "deaths": "Muertes"})
+        st.dataframe(top_edges, use_container_width=True, hide_index=True)
+    with col_d:
+        st.subheader("🏅 Rankings de grado")
+        degrees = scad_network.degree_table(edges, network.names)
+        st.caption("Grado saliente: objetivos distintos de cada actor · grado entrante: actores distintos contra cada objetivo.")
+        st.markdown("**Actores con más objetivos distintos**")
+        st.dataframe(
+            degrees.sort_values(["out_degree", "events_out"], ascending=False).head(10)[["name", "out_degree", "events_out"]]
+            .rename(columns={"name": "Actor", "out_degree": "Objetivos distintos", "events_out": "Eventos"}),
+            use_container_width=True, hide_index=True)
+        st.markdown("**Objetivos con más actores distintos**")
+        st.dataframe(
+            degrees.sort_values(["in_degree", "events_in"], ascending=False).head(10)[["name", "in_degree", "events_in"]]
+            .rename(columns={"name": "Objetivo", "in_degree": "Actores distintos", "events_in": "Eventos"}),
+            use_container_width=True, hide_index=True)
+
+    st.download_button(
+        "⬇️ Descargar aristas de la selección (CSV)",
+        data=edges[["actor", "target", "events", "deaths"]].to_csv(index=False).encode("utf-8"),
+        file_name="scad_red_actores.csv",
+        mime="text/csv",
+        use_container_width=True
+    )
+
+# =====================================================================================
+# 8. PESTAÑA
 # =====================================================================================
 elif selected == "Conclusiones":
     st.header("Conclusiones")
@@ -1746,4 +2602,9 @@ elif selected == "Conclusiones":
     st.subheader("6. Reflexión final")
     st.markdown("""
     Los conflictos sociales no son meros brotes de caos, sino expresiones de demandas, frustraciones y disputas por el poder, la identidad y los recursos. El SCAD, al registrar desde huelgas judiciales hasta masacres en fiestas privadas, captura la complejidad de estas dinámicas en contextos de fragilidad estatal. Comprenderlas en su diversidad —temporal, geográfica y temática— es esencial para diseñar políticas de prevención y resolución de conflictos contextualizadas, efectivas y sostenibles.
-    """)
\ No newline at end of file
+    """)
+
+# =====================================================================================
+# Perfil de arranque (SCAD_PROFILE=1)
+# =====================================================================================
+report_profile(f"Render completo · {selected}")
\ No newline at end of file
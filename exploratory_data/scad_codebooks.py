@@ -0,0 +1,182 @@
+"""Acceso a los codebooks PDF incluidos en el repositorio.
+
+El listado de la carpeta y el contenido de cada PDF se cachean en memoria con
+la fecha de modificación como parte de la clave: si un fichero cambia en disco
+se vuelve a leer, y si no, ningún rerun de la app toca el disco.
+
+Además construye un índice invertido por secciones (una por variable o
+apartado del codebook) que se guarda como JSON en `artifacts/`. El texto de los
+PDF se extrae una sola vez, en el build; la búsqueda de la app solo consulta el
+índice. Construcción (requiere `pypdf`, solo en el build):
+    python exploratory_data/scad_codebooks.py
+"""
+import argparse
+import functools
+import json
+import math
+import re
+import time
+from collections import Counter
+from pathlib import Path
+
+import scad_loader
+
+CODEBOOK_DIR = Path(__file__).resolve().parent.parent / "codebooks"
+INDEX_PATH = scad_loader.ARTIFACTS_DIR / "codebook_index.json"
+INDEX_VERSION = 1
+
+# Encabezados de sección: "Ndeath (cardinal numbers)", "Issue 1 (categorical)", "Sorting procedure"...
+_HEADING = re.compile(r"^[A-Z][A-Za-z0-9_ /&’'\-]{1,58}(\([^)]{1,30}\))?$")
+_TOKEN = re.compile(r"[a-z0-9áéíóúñü_]+")
+
+
+@functools.lru_cache(maxsize=None)
+def _listing(folder: str, mtime_ns: int) -> tuple:
+    return tuple(sorted(str(p) for p in Path(folder).glob("*.pdf")))
+
+
+@functools.lru_cache(maxsize=8)
+def _pdf_bytes(path: str, mtime_ns: int, size: int) -> bytes:
+    return Path(path).read_bytes()
+
+
+def list_pdfs(folder: Path) -> list:
+    """PDFs de la carpeta; el glob solo se repite si cambia el mtime del directorio."""
+    folder = Path(folder)
+    if not folder.exists():
+        return []
+    return [Path(p) for p in _listing(str(folder), folder.stat().st_mtime_ns)]
+
+
+def pdf_bytes(path: Path) -> bytes:
+    """Contenido del PDF, leído del disco solo la primera vez (o si ha cambiado)."""
+    stat = Path(path).stat()
+    return _pdf_bytes(str(path), stat.st_mtime_ns, stat.st_size)
+
+
+# -----------------------------
+# Índice de búsqueda
+# -----------------------------
+
+def tokenize(text: str) -> list:
+    """Tokens en minúsculas; "Issue 1" también produce "issue1" (nombre de la variable)."""
+    tokens = _TOKEN.findall(text.lower())
+    joined = [a + b for a, b in zip(tokens, tokens[1:]) if a.isalpha() and b.isdigit() and len(b) <= 2]
+    return tokens + joined
+
+
+def _is_heading(line: str) -> bool:
+    return bool(_HEADING.match(line)) and len(line.split()) <= 7
+
+
+def extract_sections(pdf_path: Path) -> list:
+    """Divide el texto del PDF en secciones (título, página inicial, texto)."""
+    from pypdf import PdfReader
+
+    sections = []
+    current = None
+    for page_no, page in enumerate(PdfReader(str(pdf_path)).pages, start=1):
+        for raw in (page.extract_text() or "").splitlines():
+            line = re.sub(r"\s+", " ", raw).strip()
+            if not line:
+                continue
+            if _is_heading(line):
+                # Encabezados consecutivos (partidos en varias líneas) forman un solo título
+                if current is not None and not current["lines"]:
+                    current["title"] += " · " + line
+                    continue
+                current = {"title": line, "page": page_no, "lines": []}
+                sections.append(current)
+            else:
+                if current is None:
+                    current = {"title": pdf_path.stem, "page": page_no, "lines": []}
+                    sections.append(current)
+                current["lines"].append(line)
+    return [
+        {"pdf": pdf_path.name, "page": sec["page"], "title": sec["title"], "text": " ".join(sec["lines"])}
+        for sec in sections
+    ]
+
+
+def build_index(folder: Path = CODEBOOK_DIR, out_path: Path = INDEX_PATH) -> dict:
+    """Extrae las secciones de todos los PDF y guarda el índice invertido como JSON."""
+    sections, sources = [], {}
+    for pdf in list_pdfs(folder):
+        stat = pdf.stat()
+        sources[pdf.name] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        sections.extend(extract_sections(pdf))
+
+    postings = {}
+    for sec_id, sec in enumerate(sections):
+        counts = Counter(tokenize(sec["text"]))
+        # Las palabras del título pesan más que las del cuerpo
+        for token in tokenize(sec["title"]):
+            counts[token] += 5
+        for token, tf in counts.items():
+            postings.setdefault(token, []).append([sec_id, tf])
+
+    index = {
+        "version": INDEX_VERSION,
+        "built_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "sources": sources,
+        "sections": sections,
+        "postings": postings,
+    }
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps(index, ensure_ascii=False), encoding="utf-8")
+    return index
+
+
+def index_is_current(folder: Path = CODEBOOK_DIR, out_path: Path = INDEX_PATH) -> bool:
+    """True si el índice existe y se construyó con los PDF actuales."""
+    if not out_path.exists():
+        return False
+    try:
+        index = json.loads(out_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return False
+    current = {p.name: {"size": p.stat().st_size, "mtime_ns": p.stat().st_mtime_ns} for p in list_pdfs(folder)}
+    return index.get("version") == INDEX_VERSION and index.get("sources") == current
+
+
+@functools.lru_cache(maxsize=2)
+def _load_index(path: str, mtime_ns: int) -> dict:
+    index = json.loads(Path(path).read_text(encoding="utf-8"))
+    n = max(len(index["sections"]), 1)
+    index["idf"] = {t: math.log(1 + n / len(p)) for t, p in index["postings"].items()}
+    return index
+
+
+def load_index(path: Path = INDEX_PATH):
+    """Índice listo para buscar (cacheado por mtime), o None si aún no se ha construido."""
+    path = Path(path)
+    if not path.exists():
+        return None
+    return _load_index(str(path), path.stat().st_mtime_ns)
+
+
+def search(index: dict, query: str, limit: int = 10) -> list:
+    """Secciones ordenadas por relevancia (tf-idf); primero las que contienen todos los términos."""
+    terms = list(dict.fromkeys(tokenize(query)))
+    if not terms:
+        return []
+    scores, matched = Counter(), Counter()
+    for term in terms:
+        for sec_id, tf in index["postings"].get(term, []):
+            scores[sec_id] += (1 + math.log(tf)) * index["idf"][term]
+            matched[sec_id] += 1
+    ranked = sorted(scores, key=lambda s: (-matched[s], -scores[s], s))[:limit]
+    return [dict(index["sections"][s], score=round(scores[s], 3)) for s in ranked]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Construye el índice de búsqueda de los codebooks SCAD.")
+    parser.add_argument("--folder", type=Path, default=CODEBOOK_DIR, help="Carpeta con los PDF")
+    parser.add_argument("--out", type=Path, default=INDEX_PATH, help="Ruta del índice JSON")
+    args = parser.parse_args()
+    index = build_index(args.folder, args.out)
+    print(f"Índice de codebooks: {len(index['sections'])} secciones, {len(index['postings'])} términos → {args.out}")
+
+
+if __name__ == "__main__":
+    main()
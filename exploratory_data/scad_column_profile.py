@@ -0,0 +1,161 @@
+"""Perfil de columnas en una sola pasada, compartido por el ETL, los scripts de EDA y la app.
+
+Para cada columna el perfil guarda el número y la fracción de nulos, el número
+de valores distintos, mín./máx. (columnas numéricas, booleanas y de fecha) y
+los k valores más frecuentes. Cada columna se recorre una vez con
+`value_counts`; nulos, cardinalidad, top-k y mín./máx. salen todos de esa
+tabla de valores distintos. `ColumnProfiler` se puede alimentar lote a lote,
+así que el ETL en streaming perfila su salida sin tenerla entera en memoria.
+
+Los perfiles se guardan como JSON en `artifacts/<stem del csv>.profile.json`
+con los helpers de artefactos compartidos de scad_loader.py.
+"""
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import scad_loader
+
+PROFILE_FILE = "profile.json"
+PROFILE_VERSION = 1
+
+TOP_K = 10
+# Valores distintos que se siguen por columna; por encima, el número de distintos es una cota inferior
+MAX_TRACKED = 200_000
+
+
+def _jsonable(value):
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, (pd.Timestamp, np.datetime64)):
+        return pd.Timestamp(value).isoformat()
+    if isinstance(value, float) and not np.isfinite(value):
+        return None
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+class ColumnProfiler:
+    """Acumula el perfil de columnas sobre uno o varios lotes de DataFrame."""
+
+    def __init__(self, top_k: int = TOP_K, max_tracked: int = MAX_TRACKED):
+        self.top_k = top_k
+        self.max_tracked = max_tracked
+        self.rows = 0
+        self.columns = {}
+
+    def update(self, df: pd.DataFrame):
+        self.rows += len(df)
+        for col in df.columns:
+            s = df[col]
+            state = self.columns.setdefault(col, {
+                "dtypes": [], "nulls": 0, "counts": Counter(), "capped": False, "min": None, "max": None,
+            })
+            if str(s.dtype) not in state["dtypes"]:
+                state["dtypes"].append(str(s.dtype))
+
+            counts = s.value_counts(dropna=False, sort=False)
+            # Las columnas categóricas también devuelven las categorías sin usar, con conteo 0
+            counts = counts[counts > 0]
+            is_null = counts.index.isna()
+            state["nulls"] += int(counts[is_null].sum())
+            values = counts[~is_null]
+            if values.empty:
+                continue
+
+            if s.dtype.kind in "iufbmM":
+                lo, hi = values.index.min(), values.index.max()
+                state["min"] = lo if state["min"] is None else min(state["min"], lo)
+                state["max"] = hi if state["max"] is None else max(state["max"], hi)
+
+            tracked = state["counts"]
+            if len(tracked) + len(values) <= self.max_tracked:
+                tracked.update(values.to_dict())
+            else:
+                for value, n in values.items():
+                    if value in tracked or len(tracked) < self.max_tracked:
+                        tracked[value] += int(n)
+                    else:
+                        state["capped"] = True
+        return self
+
+    def result(self) -> dict:
+        columns = {}
+        for col, state in self.columns.items():
+            columns[col] = {
+                "dtype": "|".join(state["dtypes"]),
+                "nulls": state["nulls"],
+                "null_fraction": state["nulls"] / self.rows if self.rows else 0.0,
+                "distinct": len(state["counts"]),
+                "distinct_capped": state["capped"],
+                "min": _jsonable(state["min"]),
+                "max": _jsonable(state["max"]),
+                "top": [[_jsonable(v), int(n)] for v, n in state["counts"].most_common(self.top_k)],
+            }
+        return {"version": PROFILE_VERSION, "rows": self.rows, "top_k": self.top_k, "columns": columns}
+
+
+def profile_frame(df: pd.DataFrame, top_k: int = TOP_K) -> dict:
+    """Perfil de un DataFrame en memoria (una pasada por columna)."""
+    return ColumnProfiler(top_k=top_k).update(df).result()
+
+
+# -----------------------------
+# Vistas derivadas
+# -----------------------------
+
+def null_fractions(profile: dict) -> pd.Series:
+    return pd.Series({c: p["null_fraction"] for c, p in profile["columns"].items()}, dtype="float64")
+
+
+def n_distinct(profile: dict, dropna: bool = False) -> pd.Series:
+    """Valores distintos por columna; con `dropna=False` NaN cuenta como un valor más (como `nunique`)."""
+    return pd.Series({
+        c: p["distinct"] + (0 if dropna or p["nulls"] == 0 else 1)
+        for c, p in profile["columns"].items()
+    }, dtype="int64")
+
+
+def top_values(profile: dict, col: str, n: int = None) -> pd.Series:
+    """Valores más frecuentes de `col` como Series (valor → conteo), como `value_counts().head(n)`."""
+    top = profile["columns"][col]["top"][:n]
+    return pd.Series([c for _, c in top], index=[v for v, _ in top], name=col, dtype="int64")
+
+
+def profile_table(profile: dict, top_n: int = 3) -> pd.DataFrame:
+    """Una fila por columna, para imprimir o mostrar (mín./máx./top como texto)."""
+    rows = []
+    for col, p in profile["columns"].items():
+        rows.append({
+            "column": col,
+            "dtype": p["dtype"],
+            "null_pct": round(100 * p["null_fraction"], 2),
+            "distinct": f"{p['distinct']}+" if p["distinct_capped"] else str(p["distinct"]),
+            "min": "" if p["min"] is None else str(p["min"]),
+            "max": "" if p["max"] is None else str(p["max"]),
+            "top": ", ".join(f"{v} ({n})" for v, n in p["top"][:top_n]),
+        })
+    return pd.DataFrame(rows)
+
+
+def without_columns(profile: dict, columns) -> dict:
+    """Copia del perfil sin `columns` (p. ej. tras descartarlas)."""
+    drop = set(columns)
+    return dict(profile, columns={c: p for c, p in profile["columns"].items() if c not in drop})
+
+
+# -----------------------------
+# Persistencia
+# -----------------------------
+
+def save_profile(profile: dict, csv_path) -> Path:
+    """Escribe el perfil de `csv_path` (llamar después de escribir el CSV)."""
+    return scad_loader.save_json_artifact(profile, csv_path, PROFILE_FILE, indent=1)
+
+
+def load_profile(csv_path):
+    """Perfil de `csv_path` si está al día; si no, None."""
+    return scad_loader.load_json_artifact(csv_path, PROFILE_FILE, PROFILE_VERSION)
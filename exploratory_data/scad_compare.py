@@ -0,0 +1,97 @@
+"""Modo comparación de Estadísticas Generales: dos conjuntos de filtros (A y B).
+
+Comparar África con América Latina, o dos periodos, cambiando los filtros de la
+página obliga a repintarla entera por cada cambio. Aquí cada conjunto de
+filtros es una especificación (regiones, países, años, tipos de evento) y las
+dos se responden juntas desde los rollups temporales (scad_rollups.py): se
+seleccionan los grupos y años de cada una y se agregan en una sola pasada
+(`TimeRollups.batch`), sin volver a recorrer las filas del dataset.
+
+Los rollups cuentan los eventos con `startdate` válida; los filtros avanzados
+de la página (actor, fuente, admin1, umbral de muertes) actúan sobre filas y no
+se aplican en este modo.
+"""
+import pandas as pd
+
+SIDES = ["A", "B"]
+
+# Campos de una especificación, en el orden de su clave
+SPEC_FIELDS = ["regions", "countries", "years", "event_types"]
+
+
+def spec_key(spec: dict) -> tuple:
+    """Especificación → tupla ordenada y hashable (clave de caché)."""
+    return tuple(
+        tuple(int(y) for y in spec["years"]) if field == "years" else tuple(sorted(spec.get(field) or []))
+        for field in SPEC_FIELDS
+    )
+
+
+def spec_from_key(key: tuple) -> dict:
+    return {field: list(values) for field, values in zip(SPEC_FIELDS, key)}
+
+
+def spec_label(side: str, spec: dict, max_items: int = 3) -> str:
+    """Etiqueta corta de una especificación: «A · africa · 1990–2018»."""
+    parts = [side]
+    # Los países ya acotan la región: si hay países, no se repite la región
+    place = "countries" if spec.get("countries") else "regions"
+    for key in [place, "event_types"]:
+        values = list(spec.get(key) or [])
+        if values:
+            shown = ", ".join(map(str, values[:max_items]))
+            parts.append(shown + (f" +{len(values) - max_items}" if len(values) > max_items else ""))
+    parts.append(f"{spec['years'][0]}–{spec['years'][1]}")
+    return " · ".join(parts)
+
+
+def _with_delta(table: pd.DataFrame, col: str) -> pd.DataFrame:
+    table[f"Δ {col}"] = table[f"{col} B"] - table[f"{col} A"]
+    return table
+
+
+def compare(rollups, specs: list, level: str = "year") -> dict:
+    """KPIs, tendencias y ranking por país de las especificaciones A y B.
+
+    Devuelve un dict con:
+    - "kpis": una fila por lado (Eventos, Muertes, Países);
+    - "trend": (Conjunto, period, Eventos, Muertes) al nivel `level`;
+    - "rank": una fila por país con Eventos/Muertes de A y B y sus diferencias (B − A).
+    """
+    selections = [
+        (rollups.group_mask(regions=s.get("regions"), countries=s.get("countries"),
+                            event_types=s.get("event_types")), s["years"])
+        for s in specs
+    ]
+    sides = dict(enumerate(SIDES[:len(specs)]))
+
+    trend = rollups.batch(level, selections)
+    trend.insert(0, "Conjunto", trend.pop("selection").map(sides))
+
+    by_country = rollups.batch("year", selections, by="country_display")
+    by_country["Conjunto"] = by_country.pop("selection").map(sides)
+
+    kpis = (
+        by_country.groupby("Conjunto")
+        .agg(Eventos=("Eventos", "sum"), Muertes=("Muertes", "sum"), Países=("country_display", "nunique"))
+        .reindex(sides.values(), fill_value=0)
+    )
+
+    rank = by_country.pivot_table(
+        index="country_display", columns="Conjunto", values=["Eventos", "Muertes"], aggfunc="sum", fill_value=0
+    ).reindex(columns=pd.MultiIndex.from_product([["Eventos", "Muertes"], sides.values()]), fill_value=0)
+    rank.columns = [f"{metric} {side}" for metric, side in rank.columns]
+    rank = rank.reset_index()
+    for col in ["Eventos", "Muertes"]:
+        rank = _with_delta(rank, col)
+    rank["Eventos (máx.)"] = rank[["Eventos A", "Eventos B"]].max(axis=1)
+    rank = rank.sort_values("Eventos (máx.)", ascending=False, ignore_index=True).drop(columns="Eventos (máx.)")
+
+    return {"kpis": kpis, "trend": trend, "rank": rank}
+
+
+def pct_change(a, b):
+    """Variación porcentual de A a B como texto («+12.5 %»), o None si A es 0."""
+    if not a:
+        return None
+    return f"{(b - a) / a * 100:+.1f} %"
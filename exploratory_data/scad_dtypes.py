@@ -0,0 +1,148 @@
+"""Reducción de tipos del dataset cargado e informe de memoria por columna.
+
+Tras la lectura, las columnas numéricas quedan en int64/float64 aunque sean
+códigos (etype, repress, issue*), años, indicadores 0/1 o coordenadas, y las de
+texto son objetos de Python (un string por fila aunque solo haya dos valores
+distintos). Cada proceso del servidor mantiene el DataFrame completo en
+memoria, así que `optimize_dtypes` reduce cada columna:
+
+- indicadores 0/1 completos (sin nulos) → bool; los códigos `*_missing_reason`
+  no, aunque en un dataset concreto solo tomen 0 y 1;
+- códigos y años → int8/int16 (Int8/Int16 si tienen nulos);
+- recuentos que se suman o multiplican (muertes, participantes, población,
+  identificadores) → como mínimo int32, para no desbordar en operaciones fila
+  a fila (las agregaciones de pandas ya acumulan en int64);
+- coordenadas → float32;
+- texto de baja cardinalidad (región, país, etiquetas, buckets, nivel de
+  represión...: valores distintos ≤ `CATEGORY_MAX_RATIO` de las filas con
+  valor) → category. El texto libre (issuenote, notes, actores, fechas) sigue
+  como object.
+
+Con columnas category, los groupby de la app usan `observed=True` para no
+devolver grupos vacíos de las categorías filtradas. `memory_report` compara
+los bytes por columna antes y después; el warm-up lo imprime y también se
+puede consultar con
+    python exploratory_data/scad_dtypes.py [--data exploratory_data/scad_final_dataset.csv]
+"""
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_DATA_PATH = Path(__file__).resolve().parent / "scad_final_dataset.csv"
+
+# Coordenadas: float32 (~7 cifras significativas, de sobra para lat/lon en grados)
+FLOAT32_COLS = ["latitude", "longitude"]
+
+# Recuentos e identificadores: no bajan de int32
+WIDE_INT_COLS = [
+    "eventid", "id", "ndeath", "ndeath_clean", "npart_clean", "duration", "duration_days", "population",
+]
+
+# Texto → category si tiene como mucho un valor distinto por cada 20 filas con valor
+CATEGORY_MAX_RATIO = 0.05
+
+# Códigos que no se convierten en bool aunque solo tomen 0 y 1
+CODE_SUFFIXES = ("_missing_reason",)
+
+_INT_TYPES = [np.int8, np.int16, np.int32, np.int64]
+
+
+def _smallest_int(lo, hi, min_itemsize: int = 1):
+    for t in _INT_TYPES:
+        info = np.iinfo(t)
+        if np.dtype(t).itemsize >= min_itemsize and info.min <= lo and hi <= info.max:
+            return np.dtype(t)
+    return None
+
+
+def _optimized_dtype(s: pd.Series):
+    """Tipo reducido para una columna, o None si se deja como está."""
+    if s.name in FLOAT32_COLS and s.dtype.kind == "f":
+        return np.dtype(np.float32)
+    if s.dtype == object:
+        present = s.dropna()
+        if len(present) and present.nunique() <= CATEGORY_MAX_RATIO * len(present):
+            return pd.CategoricalDtype()
+        return None
+    if s.dtype.kind not in "iuf":
+        return None
+    values = s.to_numpy(dtype="float64", na_value=np.nan)
+    present = values[~np.isnan(values)]
+    if present.size == 0 or not np.array_equal(present, np.floor(present)):
+        return None  # columna vacía o con decimales: se deja en float64
+    if (present.size == values.size and np.isin(present, (0, 1)).all()
+            and not str(s.name).endswith(CODE_SUFFIXES)):
+        return np.dtype(bool)
+    min_itemsize = 4 if s.name in WIDE_INT_COLS else 1
+    target = _smallest_int(present.min(), present.max(), min_itemsize)
+    if target is None:
+        return None
+    if present.size < values.size:
+        # Enteros con nulos → entero con nulos (Int8, Int16, ...)
+        return pd.api.types.pandas_dtype(target.name.capitalize())
+    return target
+
+
+def optimize_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Copia de `df` con las columnas reducidas (ver el docstring del módulo)."""
+    changes = {}
+    for col in df.columns:
+        target = _optimized_dtype(df[col])
+        if target is not None and target != df[col].dtype:
+            changes[col] = target
+    return df.astype(changes) if changes else df
+
+
+def export_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """`df` para exportar a CSV: los indicadores bool vuelven a 0/1, como en el CSV de origen."""
+    flags = [c for c in df.columns if df[c].dtype == bool]
+    return df.astype(dict.fromkeys(flags, np.int8)) if flags else df
+
+
+def memory_report(before: pd.DataFrame, after: pd.DataFrame) -> pd.DataFrame:
+    """Bytes por columna antes y después de `optimize_dtypes`, de mayor a menor ahorro."""
+    bytes_before = before.memory_usage(index=False, deep=True)
+    bytes_after = after.memory_usage(index=False, deep=True)
+    report = pd.DataFrame({
+        "columna": before.columns,
+        "tipo_antes": before.dtypes.astype(str).to_numpy(),
+        "tipo_despues": after.dtypes.reindex(before.columns).astype(str).to_numpy(),
+        "bytes_antes": bytes_before.to_numpy(),
+        "bytes_despues": bytes_after.reindex(before.columns).to_numpy(),
+    })
+    report["ahorro"] = report["bytes_antes"] - report["bytes_despues"]
+    return report.sort_values(["ahorro", "bytes_antes"], ascending=False, ignore_index=True)
+
+
+def format_report(report: pd.DataFrame, top: int = None) -> str:
+    """Texto del informe: totales y las `top` columnas con más ahorro (todas si es None)."""
+    total_before, total_after = report["bytes_antes"].sum(), report["bytes_despues"].sum()
+    lines = [
+        f"Memoria del dataset: {total_before / 1e6:.2f} MB → {total_after / 1e6:.2f} MB "
+        f"({total_before / max(total_after, 1):.1f}x)"
+    ]
+    changed = report[report["tipo_antes"] != report["tipo_despues"]]
+    if top is not None:
+        changed = changed.head(top)
+    for row in changed.itertuples(index=False):
+        lines.append(
+            f"  {row.columna:<34} {row.tipo_antes:>8} → {row.tipo_despues:<8} "
+            f"{row.bytes_antes:>10,} → {row.bytes_despues:>10,} B"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    import scad_loader
+
+    parser = argparse.ArgumentParser(description="Informe de memoria del dataset SCAD antes y después de reducir tipos.")
+    parser.add_argument("--data", type=Path, default=DEFAULT_DATA_PATH, help="Ruta a scad_final_dataset.csv")
+    args = parser.parse_args()
+    raw = scad_loader.load_dataset(args.data, use_warm_cache=False, optimize=False)
+    print(format_report(memory_report(raw, optimize_dtypes(raw))))
+
+
+if __name__ == "__main__":
+    main()
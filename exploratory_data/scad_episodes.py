@@ -0,0 +1,182 @@
+"""Episodios: eventos cercanos en el espacio (latitude/longitude) y en el tiempo (startdate).
+
+Agrupar los eventos en la app, con cada cambio de filtro, obligaría a comparar
+todos los pares de eventos. El warm-up lo hace una vez, como etapa batch, con
+un DBSCAN sobre un índice de rejilla:
+
+- Cada evento cae en una celda (longitud, latitud, t) de al menos `RADIUS_KM`
+  de lado y `WINDOW_DAYS` de duración (en longitud la celda se ensancha según
+  la latitud máxima de los datos, donde un grado mide menos). Dos eventos a
+  menos de `RADIUS_KM` y `WINDOW_DAYS` están siempre en celdas vecinas, así que
+  solo se comparan los eventos de las 27 celdas contiguas, nunca todos los pares.
+- Son vecinos si su distancia (haversine) es ≤ `RADIUS_KM` y sus fechas de
+  inicio distan ≤ `WINDOW_DAYS`.
+- Un evento es núcleo si tiene al menos `MIN_EVENTS` vecinos (contándose a sí
+  mismo); los núcleos conectados forman un episodio y los eventos no núcleo se
+  unen al episodio de un núcleo vecino. El resto queda como ruido (episodio -1).
+  Exigir núcleos evita que una cadena de eventos sueltos una semanas distintas.
+
+`Episodes.labels` es posicional respecto al DataFrame con el que se construyó
+(el mismo orden de filas que devuelve `scad_loader.load_dataset`, como el índice
+de intervalos); `Episodes.summary` resume cada episodio (país, fechas, eventos,
+muertes, centroide y radio). Se guarda como `artifacts/episodes.pkl`.
+"""
+import numpy as np
+import pandas as pd
+
+EPISODES_FILE = "episodes.pkl"
+
+RADIUS_KM = 50.0
+WINDOW_DAYS = 7
+MIN_EVENTS = 3
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = np.pi * EARTH_RADIUS_KM / 180
+
+# Desplazamientos de celda que generan cada par una sola vez: (0, 0, 0) y la mitad
+# "positiva" de los 26 vecinos
+_OFFSETS = [(dx, dy, dt) for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dt in (-1, 0, 1)
+            if (dx, dy, dt) > (0, 0, 0) or (dx, dy, dt) == (0, 0, 0)]
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = (np.sin((lat2 - lat1) / 2) ** 2
+         + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+def neighbour_pairs(lat, lon, day, radius_km: float = RADIUS_KM, window_days: int = WINDOW_DAYS):
+    """Pares (i, j), i < j, de eventos vecinos, buscados solo entre celdas contiguas."""
+    lat_step = radius_km / KM_PER_DEGREE
+    # Un grado de longitud mide KM_PER_DEGREE · cos(lat): con la latitud máxima (+1° de margen)
+    # la celda mide al menos radius_km en todo el rango
+    max_lat = min(float(np.abs(lat).max(initial=0)) + 1, 89.0)
+    lon_step = lat_step / np.cos(np.radians(max_lat))
+    cells = pd.DataFrame({
+        "cx": np.floor(lon / lon_step).astype(np.int64),
+        "cy": np.floor(lat / lat_step).astype(np.int64),
+        "ct": np.floor(day / window_days).astype(np.int64),
+        "i": np.arange(len(lat)),
+    })
+    keys = ["cx", "cy", "ct"]
+    found = []
+    for dx, dy, dt in _OFFSETS:
+        shifted = cells.assign(cx=cells["cx"] + dx, cy=cells["cy"] + dy, ct=cells["ct"] + dt)
+        pairs = cells.merge(shifted.rename(columns={"i": "j"}), on=keys)[["i", "j"]].to_numpy()
+        if (dx, dy, dt) == (0, 0, 0):
+            pairs = pairs[pairs[:, 0] < pairs[:, 1]]
+        found.append(pairs)
+    pairs = np.concatenate(found) if found else np.empty((0, 2), dtype=np.int64)
+    i, j = pairs.min(axis=1), pairs.max(axis=1)
+    close = ((np.abs(day[i] - day[j]) <= window_days)
+             & (haversine_km(lat[i], lon[i], lat[j], lon[j]) <= radius_km))
+    return i[close], j[close]
+
+
+def connected_components(n: int, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Componentes conexas del grafo (a, b): cada nodo → el menor nodo de su componente."""
+    labels = np.arange(n)
+    while True:
+        low = np.minimum(labels[a], labels[b])
+        new = labels.copy()
+        np.minimum.at(new, a, low)
+        np.minimum.at(new, b, low)
+        new = new[new]  # salto de punteros
+        if np.array_equal(new, labels):
+            return labels
+        labels = new
+
+
+def cluster(lat, lon, day, radius_km: float = RADIUS_KM, window_days: int = WINDOW_DAYS,
+            min_events: int = MIN_EVENTS) -> np.ndarray:
+    """DBSCAN espacio-temporal → episodio de cada evento (0..k-1, por orden de aparición; -1 = ruido)."""
+    n = len(lat)
+    if n == 0:
+        return np.empty(0, dtype=np.int32)
+    i, j = neighbour_pairs(lat, lon, day, radius_km, window_days)
+    core = np.bincount(np.concatenate([i, j]), minlength=n) + 1 >= min_events
+
+    both = core[i] & core[j]
+    roots = connected_components(n, i[both], j[both])
+    labels = np.where(core, roots, -1)
+    # Eventos frontera: el episodio (menor raíz) de sus núcleos vecinos
+    border = np.full(n, n)
+    for u, v in [(i, j), (j, i)]:
+        edge = ~core[u] & core[v]
+        np.minimum.at(border, u[edge], roots[v[edge]])
+    labels = np.where(~core & (border < n), border, labels)
+
+    # Renumeración compacta 0..k-1
+    out = np.full(n, -1, dtype=np.int32)
+    valid = labels >= 0
+    _, first, inverse = np.unique(labels[valid], return_index=True, return_inverse=True)
+    order = np.argsort(np.argsort(first))
+    out[valid] = order[inverse.ravel()]
+    return out
+
+
+class Episodes:
+    """Episodio por fila (`labels`) y resumen por episodio (`summary`)."""
+
+    def __init__(self, labels: np.ndarray, summary: pd.DataFrame):
+        self.labels = labels
+        self.summary = summary
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, death_col: str = "ndeath"):
+        n = len(df)
+        if not {"latitude", "longitude", "startdate"} <= set(df.columns):
+            return cls(np.full(n, -1, dtype=np.int32), _summary_frame(pd.DataFrame()))
+        lat = pd.to_numeric(df["latitude"], errors="coerce").to_numpy(dtype="float64")
+        lon = pd.to_numeric(df["longitude"], errors="coerce").to_numpy(dtype="float64")
+        start = pd.to_datetime(df["startdate"], errors="coerce")
+        day = start.to_numpy().astype("datetime64[D]").astype(np.int64)
+        # Sin coordenadas o fecha válidas (o en 0, 0) no hay episodio
+        valid = np.isfinite(lat) & np.isfinite(lon) & start.notna().to_numpy() & ~((lat == 0) & (lon == 0))
+
+        labels = np.full(n, -1, dtype=np.int32)
+        pos = np.flatnonzero(valid)
+        labels[pos] = cluster(lat[pos], lon[pos], day[pos])
+
+        members = pd.DataFrame({
+            "episode": labels,
+            "country_display": df["country_display"].to_numpy() if "country_display" in df.columns else "",
+            "start": start.to_numpy(),
+            "deaths": (pd.to_numeric(df[death_col], errors="coerce").fillna(0).to_numpy()
+                       if death_col in df.columns else 0.0),
+            "latitude": lat,
+            "longitude": lon,
+        })[labels >= 0]
+        return cls(labels, _summary_frame(members))
+
+    @property
+    def n_episodes(self) -> int:
+        return len(self.summary)
+
+    def mask(self, episodes) -> np.ndarray:
+        """Máscara booleana (alineada con las filas de origen) de los eventos de `episodes`."""
+        return np.isin(self.labels, list(episodes))
+
+
+def _summary_frame(members: pd.DataFrame) -> pd.DataFrame:
+    """Una fila por episodio: país principal, inicio, fin, días, eventos, muertes, centroide y radio."""
+    columns = ["episode", "country_display", "start", "end", "days", "events", "deaths",
+               "latitude", "longitude", "radius_km", "label"]
+    if members.empty:
+        return pd.DataFrame(columns=columns)
+    g = members.groupby("episode")
+    summary = g.agg(
+        start=("start", "min"), end=("start", "max"), events=("start", "size"), deaths=("deaths", "sum"),
+        latitude=("latitude", "mean"), longitude=("longitude", "mean"),
+    )
+    summary["country_display"] = g["country_display"].agg(lambda s: s.mode().iat[0])
+    summary["days"] = (summary["end"] - summary["start"]).dt.days + 1
+    centre = summary.loc[members["episode"], ["latitude", "longitude"]].to_numpy()
+    distance = haversine_km(centre[:, 0], centre[:, 1], members["latitude"].to_numpy(), members["longitude"].to_numpy())
+    summary["radius_km"] = pd.Series(distance, index=members["episode"].to_numpy()).groupby(level=0).max().round(1)
+    summary = summary.reset_index()
+    summary["label"] = ("#" + summary["episode"].astype(str) + " · " + summary["country_display"].astype(str)
+                        + " · " + summary["start"].dt.strftime("%Y-%m-%d")
+                        + " (" + summary["events"].astype(str) + " eventos)")
+    return summary[columns].sort_values("events", ascending=False, ignore_index=True)
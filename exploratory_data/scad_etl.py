@@ -0,0 +1,592 @@
+"""Pipeline de features de SCAD por región.
+
+Cada etapa del pipeline de features (lectura, imputación de valores ausentes,
+reparación de fechas, ingeniería de features) solo mira una fila cada vez, así
+que cada fichero regional puede pasar por él por separado. `build_dataset`
+procesa una región por proceso trabajador y concatena los resultados en el
+orden en que se dieron las regiones, de modo que la salida no depende de qué
+trabajador termina antes. Los pasos que necesitan el dataset entero (descartar
+las columnas con poca información) se ejecutan después, en `finalize`.
+
+Para entradas mayores que la memoria, `stream_dataset` lee cada fichero en
+lotes de `chunksize` filas, pasa cada lote por las mismas etapas fila a fila y
+lo añade a una salida particionada (`<parts_dir>/region=<nombre>/part-NNNNN.csv`)
+mientras acumula el perfil de columnas que necesita la poda. Una segunda pasada
+relee las particiones lote a lote, descarta las columnas con poca información y
+escribe el CSV final, así que el pico de memoria depende del tamaño del lote,
+no de la entrada.
+
+Los ficheros originales se leen con scad_ingest.py (tipos de columna
+explícitos, lector de pyarrow, copia latin-1 → UTF-8 en `artifacts/utf8/` hecha
+una sola vez).
+
+Los dos modos escriben en `artifacts/` el perfil de columnas de la salida
+(scad_column_profile.py), que los scripts de EDA leen en lugar de volver a
+recorrer las columnas, y su manifiesto de esquema (scad_schema.py: roles de
+columna, dtypes, features), que la app lee en lugar de detectar los nombres de
+columna en cada página, además de la matriz dispersa actor → objetivo por año y
+país (scad_network.py) que usa la página de red y las tablas de co-ocurrencia
+de issues / issue × tipo de evento (scad_issues.py). Los tres huecos de issue se
+empaquetan en `issue_bits` antes de descartar issue3 y podar issue2, así que las
+tablas cubren todos. Por último, el índice invertido BM25 sobre `issuenote` /
+`notes` (scad_search.py) da servicio a la búsqueda de texto de la app; en
+streaming, sus postings se vuelcan a disco por lote bajo `--parts-dir` y se unen
+al final.
+
+Los nombres de actor/objetivo casi duplicados se agrupan con MinHash + LSH
+(scad_actors.py) una vez se conoce el vocabulario completo de nombres (tras el
+dataset entero en modo batch, tras la primera pasada en streaming): la salida
+recibe columnas de id canónico (`actor1_cid`, `target1_cid`), el vocabulario se
+guarda junto a ella y la red de actores se construye sobre los nombres
+canónicos.
+
+Uso (desde la raíz del repositorio):
+    python exploratory_data/scad_etl.py [--workers N] [--out scal_global_features_clean.csv]
+    python exploratory_data/scad_etl.py --stream [--chunksize 50000] [--parts-dir etl_parts]
+"""
+import argparse
+import os
+import re
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import scad_actors
+import scad_column_profile
+import scad_ingest
+import scad_issues
+import scad_network
+import scad_search
+import scad_schema
+import scad_sentinels
+
+DATA_DIR = Path(__file__).resolve().parent
+
+# Etiqueta de región → fichero original de SCAD (el orden define el de las filas de la salida)
+REGION_FILES = {
+    "Africa": DATA_DIR / "SCAD2018Africa_Final.csv",
+    "LatinAmerica": DATA_DIR / "SCAD2018LatinAmerica_Final.csv",
+}
+
+# Columnas con un 90 %+ de valores ausentes
+DROP_COLS = ["actor3", "issue3", "geo_comments", "location_precision"]
+
+# Columnas categóricas clave imputadas con "Missing"
+CAT_IMPUTE = ["actor1", "target1", "escalation", "issuenote", "nsource"]
+
+RENAME_COLS = {"lgtbq_issue": "lgbtq_issue"}
+
+# Filas por lote en modo streaming
+STREAM_CHUNK_ROWS = 50_000
+
+DATE_FORMATS = ["%d-%b-%y", "%d-%b-%Y", "%Y-%m-%d", "%m/%d/%Y", "%d/%m/%Y"]
+
+
+# -----------------------------
+# Utilidades
+# -----------------------------
+
+def _replace_cat_missing(df: pd.DataFrame, cols: list[str], fill_value: str = "Missing") -> pd.DataFrame:
+    """Rellena NaN con `fill_value` y cambia el literal 'Unknown' → `fill_value` en las columnas `cols`."""
+    for c in cols:
+        if c in df.columns:
+            df[c] = df[c].fillna(fill_value)
+            df[c] = df[c].replace({"Unknown": fill_value})
+    return df
+
+
+def try_parse_series(s: pd.Series, fmts: list[str]) -> pd.Series:
+    """Prueba varios formatos de fecha tras limpiar valores raros; por elemento, gana el primero que funciona."""
+    s_clean = s.astype(str).str.strip()
+    s_clean = s_clean.replace({"[]": np.nan, "Unknown": np.nan})
+    s_clean = s_clean.mask(s_clean.isin(["", "nan", "NaN", "None"]))
+
+    out = pd.Series(pd.NaT, index=s_clean.index, dtype="datetime64[ns]")
+    for fmt in fmts:
+        need = out.isna()
+        if not need.any():
+            break
+        parsed = pd.to_datetime(s_clean.where(need), format=fmt, errors="coerce")
+        out = out.mask(need, parsed)
+
+    # Último recurso: parser general (dateutil)
+    fallback = pd.to_datetime(s_clean, errors="coerce", dayfirst=True)
+    out = out.fillna(fallback)
+
+    return pd.to_datetime(out, errors="coerce")
+
+
+def build_date_from_parts(row, y_col, m_col, d_col):
+    """Construye un Timestamp a partir de las partes (año, mes, día), tolerando valores basura."""
+    y = pd.to_numeric(row.get(y_col, np.nan), errors="coerce")
+    m = pd.to_numeric(row.get(m_col, np.nan), errors="coerce")
+    d = pd.to_numeric(row.get(d_col, np.nan), errors="coerce")
+
+    if pd.notna(y):
+        y = int(y)
+        m = int(m) if pd.notna(m) and 1 <= int(m) <= 12 else 1
+        d = int(d) if pd.notna(d) and 1 <= int(d) <= 31 else 1
+        try:
+            return pd.Timestamp(year=y, month=m, day=d)
+        except Exception:
+            return pd.NaT
+    return pd.NaT
+
+
+def normalize_text(x):
+    if pd.isna(x):
+        return ""
+    return re.sub(r"\s+", " ", str(x)).strip().lower()
+
+
+def bucket_actor_target(name: str) -> str:
+    n = normalize_text(name)
+    if n == "":
+        return "Unknown"
+    if any(k in n for k in ["police", "soldier", "military", "army", "security forces", "gendarmerie"]):
+        return "State Security"
+    if any(k in n for k in ["government", "ministry", "president", "governor", "mayor", "parliament"]):
+        return "Government/State"
+    if any(k in n for k in ["cartel", "gang", "drug", "sicario", "kidnap", "criminal"]):
+        return "Criminal/Organized Crime"
+    if any(k in n for k in ["gunmen", "assailants", "attackers", "armed men", "unknown gunmen", "mob"]):
+        return "Generic Violent Actor"
+    if any(k in n for k in ["party", "supporters", "campaign", "candidate"]):
+        return "Political/Party"
+    if any(k in n for k in ["ngo", "activist", "human rights", "union", "workers", "teachers", "students"]):
+        return "Civil Society/Labor/Education"
+    if any(k in n for k in ["citizen", "civilian", "villager", "protester", "demonstrator", "bystander"]):
+        return "Civilians/Public"
+    if any(k in n for k in ["muslim", "christian", "catholic", "hutu", "tutsi", "ethnic"]):
+        return "Ethnic/Religious"
+    if any(k in n for k in ["united nations", "world bank", "embassy", "ambassador", "foreign"]):
+        return "International/Foreign"
+    return "Other/Unclassified"
+
+
+def bucket_event_family(e):
+    if e in (1, 2, 5, 6):
+        return "Demonstration/Strike (mostly non-violent)"
+    if e in (3, 4):
+        return "Riots (violent)"
+    if e == 7:
+        return "State/Pro-Gov Violence"
+    if e == 8:
+        return "Anti-Gov Insurgent Violence"
+    if e == 9:
+        return "Non-State Communal/Extra-Gov Violence"
+    if e == 10:
+        return "Intra-Gov Violence"
+    if e == -9:
+        return "ACD Placeholder"
+    return "Other/Unknown"
+
+
+# -----------------------------
+# Mapas de etiquetas
+# -----------------------------
+
+# Tipo de evento (etype)
+ETYPE_MAP = {
+    1: "Protest",
+    2: "Riot",
+    3: "Strike",
+    4: "Demonstration (anti-gov)",
+    5: "Demonstration (pro-gov)",
+    6: "Repression",
+    7: "Sectarian violence",
+    8: "Communal violence",
+    9: "Unidentified violence",
+    10: "Other",
+    -9: "Unknown",
+}
+
+# Etiquetas de tipo de evento de SCAD 3.3
+ETYPE_LABEL_MAP = {
+    1: "Organized Demonstration",
+    2: "Spontaneous Demonstration",
+    3: "Organized Violent Riot",
+    4: "Spontaneous Violent Riot",
+    5: "General Strike",
+    6: "Limited Strike",
+    7: "Pro-Government Violence (Repression)",
+    8: "Anti-Government Violence",
+    9: "Extra-Government Violence",
+    10: "Intra-Government Violence",
+    -9: "Armed Conflict Placeholder (ACD)",
+}
+
+# Compartido con las tablas de co-ocurrencia de issues (scad_issues.py)
+ISSUE_LABEL_MAP = scad_issues.ISSUE_LABEL_MAP
+
+REPRESS_MAP = {0: "None", 1: "Non-lethal", 2: "Lethal"}
+
+
+# -----------------------------
+# Etapas del pipeline (una región cada vez)
+# -----------------------------
+
+def read_region(path) -> pd.DataFrame:
+    """Fichero regional original con tipos de columna explícitos (lector de pyarrow sobre su copia UTF-8)."""
+    return scad_ingest.read_scad_region(path)
+
+
+def impute_region(df: pd.DataFrame, region: str) -> pd.DataFrame:
+    """Quita columnas casi vacías, decodifica centinelas, imputa ndeath/categóricas, renombra y marca la región."""
+    # Todos los huecos de issue en una máscara de bits antes de descartar issue3 (issue2 se poda después)
+    df[scad_issues.BITS_COL] = scad_issues.issue_bits(df)
+    df = df.drop(columns=DROP_COLS, errors="ignore")
+
+    # Códigos centinela (-99/-88/-77) → NA + <col>_missing_reason, solo en las columnas del esquema
+    scad_sentinels.decode_sentinels(df)
+
+    # Imputa ndeath: NaN (vacío o centinela) -> 0 (regla numérica)
+    if "ndeath" in df.columns:
+        df["ndeath"] = pd.to_numeric(df["ndeath"], errors="coerce").fillna(0).astype(int)
+
+    # Imputa las columnas categóricas clave con "Missing" (también convierte el literal 'Unknown' → 'Missing')
+    _replace_cat_missing(df, CAT_IMPUTE, fill_value="Missing")
+
+    df = df.rename(columns=RENAME_COLS)
+    df["region"] = region
+    return df
+
+
+def repair_dates(df: pd.DataFrame) -> pd.DataFrame:
+    """Lectura robusta de las fechas de inicio y fin, con las partes (año, mes, día) como último recurso."""
+    df["startdate_fix"] = try_parse_series(df["startdate"], DATE_FORMATS)
+    df["enddate_fix"] = try_parse_series(df["enddate"], DATE_FORMATS)
+
+    need_start = df["startdate_fix"].isna()
+    df.loc[need_start, "startdate_fix"] = df.loc[need_start].apply(
+        lambda r: build_date_from_parts(r, "styr", "stmo", "stday"), axis=1
+    )
+
+    need_end = df["enddate_fix"].isna()
+    df.loc[need_end, "enddate_fix"] = df.loc[need_end].apply(
+        lambda r: build_date_from_parts(r, "eyr", "emo", "eday"), axis=1
+    )
+
+    # A partir de aquí se usan las fechas reparadas, FORZANDO el dtype datetime
+    df["startdate"] = pd.to_datetime(df["startdate_fix"], errors="coerce")
+    df["enddate"] = pd.to_datetime(df["enddate_fix"], errors="coerce")
+    df = df.drop(columns=["startdate_fix", "enddate_fix"], errors="ignore")
+
+    # Extrae el año de forma segura
+    df["event_year"] = df["startdate"].dt.year
+
+    # Limpia los valores negativos de ndeath
+    df["ndeath"] = pd.to_numeric(df["ndeath"], errors="coerce").fillna(0)
+    df["ndeath"] = df["ndeath"].apply(lambda x: max(x, 0))
+    return df
+
+
+def engineer_features(df: pd.DataFrame) -> pd.DataFrame:
+    """Features temporales, de muertes, participación, represión, tipo de evento, issues y actor/objetivo."""
+    # 1) Variables temporales (reutiliza las fechas ya leídas)
+    df["event_month"] = df["startdate"].dt.month
+    end_for_duration = df["enddate"].fillna(df["startdate"])
+    df["duration_days"] = (end_for_duration - df["startdate"]).dt.days + 1
+
+    # 2) Muertes (centinelas ya decodificados en impute_region; el motivo está en ndeath_missing_reason)
+    df["ndeath_clean"] = df["ndeath"].copy()
+    df["violent_event"] = (df["ndeath_clean"] > 0).astype(int)
+    df["mass_casualty"] = (df["ndeath_clean"] >= 100).astype(int)
+
+    # 3) Participación
+    if "npart" in df.columns:
+        # Imputa los NaN numéricos (vacíos o -99) a 0, según lo pedido
+        df["npart_clean"] = pd.to_numeric(df["npart"], errors="coerce").astype("float64").fillna(0)
+        df["mass_participation"] = (df["npart_clean"] >= 4).astype(int)
+
+    # 4) Represión
+    df["repression_level"] = df.get("repress").map(REPRESS_MAP) if "repress" in df.columns else np.nan
+    df["repression_event"] = (df.get("repress", pd.Series(0)).fillna(0) > 0).astype(int)
+
+    # 5) Tipo de evento (etype)
+    df["event_type_label"] = df.get("etype").map(ETYPE_MAP) if "etype" in df.columns else np.nan
+
+    # Limpieza
+    if "region" in df.columns:
+        df["region"] = df["region"].astype(str).str.strip()
+        df["region"] = df["region"].replace({
+            "África": "Africa",
+            "Africa ": "Africa",
+            "Latin America": "LatinAmerica",
+            "LatAm": "LatinAmerica",
+        })
+
+    # Evita el doble conteo si hay sublocal (se queda con el primero)
+    if "sublocal" in df.columns:
+        df = df[df["sublocal"].fillna(1).astype(int) == 1].copy()
+
+    df["etype_label"] = df.get("etype").map(ETYPE_LABEL_MAP) if "etype" in df.columns else np.nan
+
+    # Macrocategorías
+    df["etype_family"] = df.get("etype", pd.Series(np.nan)).apply(bucket_event_family)
+
+    # Salvaguarda de issues
+    for col in ["issue1", "issue2", "issue3"]:
+        if col not in df.columns:
+            df[col] = np.nan
+
+    for col in ["issue1", "issue2", "issue3"]:
+        df[f"{col}_label"] = df[col].map(ISSUE_LABEL_MAP)
+
+    # Primera etiqueta de issue no nula
+    df["issue_main"] = (
+        df[["issue1_label", "issue2_label", "issue3_label"]]
+        .bfill(axis=1)
+        .iloc[:, 0]
+    )
+
+    # Indicadores binarios
+    issues = df[["issue1", "issue2", "issue3"]]
+    df["issue_election"] = issues.apply(lambda r: any(x == 1 for x in r if pd.notna(x)), axis=1).astype(int)
+    df["issue_economy"] = issues.apply(lambda r: any(x == 2 for x in r if pd.notna(x)), axis=1).astype(int)
+    df["issue_identity"] = issues.apply(lambda r: any(x in (5, 6) for x in r if pd.notna(x)), axis=1).astype(int)
+    df["issue_rights"] = issues.apply(lambda r: any(x == 10 for x in r if pd.notna(x)), axis=1).astype(int)
+
+    # Comprobaciones de represión
+    if "repress" in df.columns:
+        df["flag_inconsistent_lethal_repress"] = (
+            (df["repress"] == 2) & (df["ndeath_clean"].fillna(0) <= 0)
+        ).astype(int)
+
+    # Categorías simples de actor/objetivo (heurísticas)
+    for col in ["actor1", "actor2", "actor3", "target1", "target2"]:
+        if col in df.columns:
+            df[f"{col}_bucket"] = df[col].apply(bucket_actor_target)
+
+    df["pattern_state_vs_civilians"] = (
+        (df.get("actor1_bucket", "Unknown") == "State Security")
+        & (df.get("target1_bucket", "Unknown") == "Civilians/Public")
+    ).astype(int)
+
+    df["pattern_nonstate_vs_gov"] = (
+        (~df.get("actor1_bucket", pd.Series("")).isin(["Government/State", "State Security"]))
+        & (df.get("target1_bucket", pd.Series("")) == "Government/State")
+    ).astype(int)
+    return df
+
+
+def process_chunk(df: pd.DataFrame, region: str, columns: list[str] = None) -> pd.DataFrame:
+    """Etapas fila a fila de un bloque de filas originales (un fichero entero o un lote en streaming).
+
+    `columns` (las columnas combinadas tras la imputación) alinea todas las
+    regiones antes de las etapas fila a fila, así que las columnas que faltan
+    en un fichero se comportan exactamente igual que tras un `pd.concat`.
+    """
+    df = impute_region(df, region)
+    if columns is not None:
+        df = df.reindex(columns=columns)
+    df = repair_dates(df)
+    return engineer_features(df)
+
+
+def process_region(region: str, path, columns: list[str] = None) -> pd.DataFrame:
+    """Pipeline completo de una región; se ejecuta dentro de un proceso trabajador."""
+    return process_chunk(read_region(path), region, columns)
+
+
+# -----------------------------
+# Pasos sobre el dataset entero
+# -----------------------------
+
+def union_columns(paths) -> list[str]:
+    """Columnas de las regiones concatenadas tras `impute_region`, en el orden de `pd.concat`."""
+    columns = []
+    for path in paths:
+        header = scad_ingest.read_header(scad_ingest.utf8_source(path))
+        kept = [c for c in header if c not in DROP_COLS]
+        reasons = scad_sentinels.reason_columns(kept)
+        for col in [RENAME_COLS.get(c, c) for c in kept + [scad_issues.BITS_COL] + reasons] + ["region"]:
+            if col not in columns:
+                columns.append(col)
+    return columns
+
+
+def build_dataset(region_files: dict = None, workers: int = None) -> pd.DataFrame:
+    """Pasa cada región por el pipeline (en paralelo) y las concatena en el orden de entrada."""
+    region_files = region_files or REGION_FILES
+    regions = list(region_files)
+    paths = [region_files[r] for r in regions]
+    # Todas las regiones comparten las mismas columnas, como si se hubieran concatenado antes del pipeline
+    columns = union_columns(paths)
+
+    if workers is None:
+        workers = min(len(regions), os.cpu_count() or 1)
+    if workers <= 1:
+        parts = [process_region(r, p, columns) for r, p in zip(regions, paths)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # map() devuelve los resultados en el orden de envío → salida determinista
+            parts = list(pool.map(process_region, regions, paths, [columns] * len(regions)))
+    return pd.concat(parts, ignore_index=True)
+
+
+# Columnas que reescribe impute_npart (se vuelven a perfilar tras la poda)
+NPART_COLS = ["npart_clean", "npart_missing_flag", "mass_participation"]
+
+
+def low_information_columns(profile: dict) -> list[str]:
+    """Columnas vacías, con un 80 %+ de ausentes o constantes (NaN cuenta como valor), según el perfil de columnas."""
+    missing_ratio = scad_column_profile.null_fractions(profile)
+    n_distinct = scad_column_profile.n_distinct(profile)
+    empty_cols = missing_ratio[missing_ratio >= 1.0].index.tolist()
+    high_missing_cols = missing_ratio[missing_ratio >= 0.80].index.tolist()
+    constant_cols = n_distinct[n_distinct <= 1].index.tolist()
+    return sorted(set(empty_cols) | set(high_missing_cols) | set(constant_cols))
+
+
+def finalize(df: pd.DataFrame, profile: dict = None):
+    """Descarta las columnas con poca información e imputa npart_clean (necesita el dataset entero).
+
+    Devuelve el DataFrame final y su perfil de columnas; si se da `profile` (de `df`), se reutiliza.
+    """
+    profile = profile or scad_column_profile.profile_frame(df)
+    cols_to_drop = low_information_columns(profile)
+    df = impute_npart(df.drop(columns=cols_to_drop, errors="ignore").copy())
+    out_profile = scad_column_profile.without_columns(profile, cols_to_drop)
+    out_profile["columns"].update(scad_column_profile.profile_frame(df[NPART_COLS])["columns"])
+    out_profile["pruned"] = cols_to_drop
+    return df, out_profile
+
+
+def canonicalize_actors(df: pd.DataFrame, profile: dict, canon: scad_actors.ActorCanon = None):
+    """Añade las columnas de id canónico de actor (scad_actors.py) y sus entradas en `profile`.
+
+    Devuelve el DataFrame y el vocabulario de actores (construido a partir de `df` si no se da).
+    """
+    canon = canon or scad_actors.ActorCanon.from_frame(df)
+    df = canon.assign_ids(df)
+    id_cols = [c for c in canon.id_columns if c in df.columns]
+    profile["columns"].update(scad_column_profile.profile_frame(df[id_cols])["columns"])
+    return df, canon
+
+
+def impute_npart(df: pd.DataFrame) -> pd.DataFrame:
+    """Imputa los npart_clean ausentes como 0 = "sin información" (fila a fila, tras la poda)."""
+    if "npart_clean" not in df.columns and "npart" in df.columns:
+        df["npart_clean"], _ = scad_sentinels.decode_column(df["npart"], "npart")
+    df["npart_missing_flag"] = df["npart_clean"].isna().astype(int)
+    df["npart_clean"] = pd.to_numeric(df["npart_clean"], errors="coerce").fillna(0).astype("Int64")
+    df["mass_participation"] = (df["npart_clean"].fillna(0) >= 4).astype(int)
+    return df
+
+
+# -----------------------------
+# Modo streaming (memoria acotada)
+# -----------------------------
+
+def stream_dataset(region_files: dict = None, out_path: Path = None, parts_dir: Path = None,
+                   chunksize: int = STREAM_CHUNK_ROWS, network: scad_network.NetworkBuilder = None,
+                   issues: scad_issues.IssueBuilder = None,
+                   search: scad_search.SearchIndexBuilder = None) -> tuple[dict, scad_actors.ActorCanon]:
+    """Construcción en streaming en dos pasadas: etapas fila a fila en particiones y luego poda en `out_path`.
+
+    Devuelve el perfil de columnas de la salida (con las columnas podadas en "pruned")
+    y el vocabulario de actores, construido con los conteos de nombres de la primera pasada.
+    Si se dan, `network`, `issues` y `search` reciben cada lote de salida; `network`
+    pasa a usar los nombres canónicos de los actores.
+    """
+    region_files = region_files or REGION_FILES
+    out_path = Path(out_path or DATA_DIR / "scal_global_features_clean.csv")
+    parts_dir = Path(parts_dir or DATA_DIR / "etl_parts")
+    columns = union_columns(region_files.values())
+
+    # Pasada 1: etapas fila a fila, un lote cada vez, añadido como partición
+    shutil.rmtree(parts_dir, ignore_errors=True)
+    profiler = scad_column_profile.ColumnProfiler()
+    actor_counts = pd.Series(dtype="int64")
+    parts, out_columns = [], None
+    for region, path in region_files.items():
+        region_dir = parts_dir / f"region={region}"
+        region_dir.mkdir(parents=True, exist_ok=True)
+        reader = scad_ingest.iter_csv(scad_ingest.utf8_source(path), chunksize, scad_ingest.RAW_COLUMNS)
+        for i, chunk in enumerate(reader):
+            df = process_chunk(chunk, region, columns)
+            out_columns = out_columns or df.columns.tolist()
+            df = df.reindex(columns=out_columns)
+            profiler.update(df)
+            actor_counts = actor_counts.add(scad_actors.name_counts(df), fill_value=0)
+            part = region_dir / f"part-{i:05d}.csv"
+            df.to_csv(part, index=False)
+            parts.append(part)
+
+    # Pasada 2: poda global a partir de los conteos acumulados y, fila a fila, imputación de npart
+    # e ids canónicos de actor (el vocabulario está completo tras la pasada 1)
+    profile = profiler.result()
+    cols_to_drop = low_information_columns(profile)
+    canon = scad_actors.ActorCanon.from_counts(actor_counts)
+    if network is not None:
+        network.canon = canon
+    npart_profiler = scad_column_profile.ColumnProfiler()
+    out_path.unlink(missing_ok=True)
+    header = True
+    for part in parts:
+        for chunk in scad_ingest.iter_csv(part, chunksize, scad_ingest.FEATURE_COLUMNS):
+            chunk = canon.assign_ids(impute_npart(chunk.drop(columns=cols_to_drop, errors="ignore")))
+            npart_profiler.update(chunk[NPART_COLS + [c for c in canon.id_columns if c in chunk.columns]])
+            if network is not None:
+                network.update(chunk)
+            if issues is not None:
+                issues.update(chunk)
+            if search is not None:
+                search.update(chunk)
+            chunk.to_csv(out_path, mode="a", header=header, index=False)
+            header = False
+
+    out_profile = scad_column_profile.without_columns(profile, cols_to_drop)
+    out_profile["columns"].update(npart_profiler.result()["columns"])
+    out_profile["pruned"] = cols_to_drop
+    out_profile["partitions"] = len(parts)
+    return out_profile, canon
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build scal_global_features_clean.csv from the raw SCAD region files.")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes (default: one per region, up to the CPU count; 1 = sequential)")
+    parser.add_argument("--out", type=Path, default=DATA_DIR / "scal_global_features_clean.csv", help="Output CSV")
+    parser.add_argument("--stream", action="store_true", help="Process the inputs in batches (bounded memory)")
+    parser.add_argument("--chunksize", type=int, default=STREAM_CHUNK_ROWS, help="Rows per batch in --stream mode")
+    parser.add_argument("--parts-dir", type=Path, default=DATA_DIR / "etl_parts",
+                        help="Partitioned intermediate output in --stream mode")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    if args.stream:
+        network_builder, issue_builder = scad_network.NetworkBuilder(), scad_issues.IssueBuilder()
+        search_builder = scad_search.SearchIndexBuilder(spill_dir=args.parts_dir / "search")
+        profile, canon = stream_dataset(out_path=args.out, parts_dir=args.parts_dir, chunksize=args.chunksize,
+                                        network=network_builder, issues=issue_builder, search=search_builder)
+        network, issues = network_builder.result(), issue_builder.result()
+        search = search_builder.result()
+        print(f"{profile['rows']:,} rows in {profile['partitions']} partitions, "
+              f"{len(profile['pruned'])} columns pruned → {args.out} ({time.perf_counter() - t0:.2f}s)")
+    else:
+        df, profile = finalize(build_dataset(workers=args.workers))
+        df, canon = canonicalize_actors(df, profile)
+        df.to_csv(args.out, index=False)
+        network = scad_network.ActorNetwork.from_frame(df, canon=canon)
+        issues = scad_issues.IssueCooccurrence.from_frame(df)
+        search = scad_search.SearchIndex.from_frame(df)
+        print(f"{len(df):,} rows × {df.shape[1]} columns → {args.out} ({time.perf_counter() - t0:.2f}s)")
+    print(f"Column profile → {scad_column_profile.save_profile(profile, args.out)}")
+    print(f"Schema manifest → {scad_schema.save_schema(scad_schema.schema_from_profile(profile), args.out)}")
+    print(f"Actor vocabulary ({len(canon.lookup):,} names → {len(canon.names):,} canonical) → "
+          f"{scad_actors.save_actor_canon(canon, args.out)}")
+    print(f"Actor network ({len(network.names):,} actors, {network.n_entries:,} entries) → "
+          f"{scad_network.save_network(network, args.out)}")
+    print(f"Issue co-occurrence ({issues.totals_of()['multi']:,} multi-issue events) → "
+          f"{scad_issues.save_cooccurrence(issues, args.out)}")
+    print(f"Text search index ({len(search.terms):,} terms) → {scad_search.save_search_index(search, args.out)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Índices precalculados sobre el dataset SCAD.
+
+`IntervalIndex` responde "¿qué eventos estaban activos durante [d1, d2]?" sin
+comparar todas las filas en cada consulta. Los eventos cortos (la gran mayoría
+dura un día) se guardan ordenados por fecha de inicio: cualquier evento corto
+que solape [d1, d2] empieza en [d1 - SHORT_SPAN_DAYS, d2], así que basta una
+búsqueda binaria y revisar esa ventana. Los eventos largos (multi-año) son
+pocos y se comprueban directamente.
+
+Las posiciones son posicionales respecto al DataFrame con el que se construyó
+el índice (el mismo orden de filas que devuelve `scad_loader.load_dataset`).
+"""
+import datetime as dt
+
+import numpy as np
+import pandas as pd
+
+# Duración máxima (días) de un evento "corto"; el resto va a la lista de largos
+SHORT_SPAN_DAYS = 31
+
+INTERVAL_FILE = "interval_index.npz"
+
+_NAT = np.iinfo(np.int64).min
+
+
+def _to_day(value) -> int:
+    """Fecha (date, Timestamp o str) → días desde 1970-01-01."""
+    return int(np.datetime64(pd.Timestamp(value).date(), "D").astype(np.int64))
+
+
+class IntervalIndex:
+    """Índice de intervalos [startdate, enddate] por evento."""
+
+    def __init__(self, n_rows, short_pos, short_starts, short_ends, long_pos, long_starts, long_ends):
+        self.n_rows = int(n_rows)
+        self.short_pos = short_pos
+        self.short_starts = short_starts
+        self.short_ends = short_ends
+        self.long_pos = long_pos
+        self.long_starts = long_starts
+        self.long_ends = long_ends
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, start_col: str = "startdate", end_col: str = "enddate"):
+        """Construye el índice; sin fecha de fin el evento dura un solo día."""
+        start = pd.to_datetime(df[start_col], errors="coerce")
+        end = pd.to_datetime(df[end_col], errors="coerce").fillna(start)
+        end = end.where(end >= start, start)  # fin anterior al inicio → evento puntual
+        starts = start.values.astype("datetime64[D]").astype(np.int64)
+        ends = end.values.astype("datetime64[D]").astype(np.int64)
+
+        valid = starts != _NAT
+        short = valid & ((ends - starts) <= SHORT_SPAN_DAYS)
+        long_ = valid & ~short
+
+        short_pos = np.flatnonzero(short)
+        order = np.argsort(starts[short_pos], kind="stable")
+        short_pos = short_pos[order]
+        long_pos = np.flatnonzero(long_)
+        return cls(
+            len(df),
+            short_pos, starts[short_pos], ends[short_pos],
+            long_pos, starts[long_pos], ends[long_pos],
+        )
+
+    def positions(self, d1, d2) -> np.ndarray:
+        """Posiciones (ordenadas) de los eventos activos en algún momento de [d1, d2]."""
+        lo, hi = _to_day(d1), _to_day(d2)
+        i = np.searchsorted(self.short_starts, lo - SHORT_SPAN_DAYS, side="left")
+        j = np.searchsorted(self.short_starts, hi, side="right")
+        short_hit = self.short_pos[i:j][self.short_ends[i:j] >= lo]
+        long_hit = self.long_pos[(self.long_starts <= hi) & (self.long_ends >= lo)]
+        return np.sort(np.concatenate([short_hit, long_hit]))
+
+    def mask(self, d1, d2) -> np.ndarray:
+        """Máscara booleana alineada con las filas del DataFrame de origen."""
+        out = np.zeros(self.n_rows, dtype=bool)
+        out[self.positions(d1, d2)] = True
+        return out
+
+    def count(self, d1, d2) -> int:
+        return len(self.positions(d1, d2))
+
+    def bounds(self):
+        """Primera fecha de inicio y última fecha de fin del índice (datetime.date)."""
+        starts = np.concatenate([self.short_starts, self.long_starts])
+        ends = np.concatenate([self.short_ends, self.long_ends])
+        if starts.size == 0:
+            today = dt.date.today()
+            return today, today
+        epoch = dt.date(1970, 1, 1)
+        return epoch + dt.timedelta(days=int(starts.min())), epoch + dt.timedelta(days=int(ends.max()))
+
+    def save(self, path):
+        np.savez(
+            path, n_rows=self.n_rows,
+            short_pos=self.short_pos, short_starts=self.short_starts, short_ends=self.short_ends,
+            long_pos=self.long_pos, long_starts=self.long_starts, long_ends=self.long_ends,
+        )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as z:
+            return cls(
+                z["n_rows"], z["short_pos"], z["short_starts"], z["short_ends"],
+                z["long_pos"], z["long_starts"], z["long_ends"],
+            )
@@ -0,0 +1,196 @@
+"""Lectura de los CSV de SCAD: tipos de columna explícitos y el lector de pyarrow.
+
+Las versiones originales de SCAD están en latin-1. `utf8_source` transcodifica
+cada una una sola vez a `artifacts/utf8/` (se rehace solo si cambia el
+original), así que todas las lecturas posteriores son UTF-8; la app solo lee el
+dataset final, que ya es UTF-8.
+
+`read_csv` lee con el lector CSV multihilo de pyarrow usando los tipos de
+columna declarados abajo (`RAW_COLUMNS` para los ficheros regionales,
+`FEATURE_COLUMNS` para la salida del ETL), así que ninguna columna queda a
+merced de la inferencia de tipos mixtos. El DataFrame resultante tiene los
+mismos dtypes de NumPy que con `pd.read_csv`: las columnas "int" son int64, o
+float64 si tienen huecos (pasan por float64, así que "2" y "2.0" se leen ambos
+como enteros); las "str" son object con NaN en los valores ausentes. Las
+columnas numéricas se leen como texto y se convierten después: un valor suelto
+como npart="unknown" queda en NaN, como con `pd.to_numeric(errors="coerce")`,
+en lugar de hacer fallar toda la lectura. `iter_csv` devuelve los mismos
+DataFrames en lotes de `chunksize` filas para el ETL en streaming.
+"""
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+
+import scad_loader
+
+UTF8_DIR = Path(__file__).resolve().parent / "artifacts" / "utf8"
+
+SOURCE_ENCODING = "latin-1"
+
+# Los mismos marcadores de valor ausente que pd.read_csv
+NULL_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+]
+
+# Tamaño de bloque del lector de pyarrow; cada bloque lo procesa su propio hilo
+BLOCK_SIZE = 1 << 20
+
+
+# Tipo de columna → tipo de lectura de pyarrow. Los numéricos se leen como texto y se convierten en
+# `_to_pandas` ("int" pasando por float64 y reducido después): una celda sucia no hace fallar la lectura
+ARROW_TYPES = {"int": pa.string(), "float": pa.string(), "str": pa.string()}
+NUMERIC_KINDS = {"int", "float"}
+
+# Ficheros regionales de SCAD 2018
+RAW_COLUMNS = {
+    "eventid": "int", "id": "int", "ccode": "int", "countryname": "str",
+    "startdate": "str", "enddate": "str", "duration": "int",
+    "stday": "int", "stmo": "int", "styr": "int", "eday": "int", "emo": "int", "eyr": "int",
+    "etype": "int", "escalation": "int",
+    "actor1": "str", "actor2": "str", "actor3": "str", "target1": "str", "target2": "str",
+    "cgovtarget": "int", "rgovtarget": "int", "npart": "int", "ndeath": "int", "repress": "int",
+    "elocal": "str", "ilocal": "str", "sublocal": "int", "locnum": "int", "gislocnum": "int",
+    "issue1": "int", "issue2": "int", "issue3": "int", "issuenote": "str", "nsource": "str", "notes": "str",
+    "female_event": "int", "lgtbq_issue": "int", "lgbtq_issue": "int", "coder": "str", "acd_questionable": "int",
+    "latitude": "float", "longitude": "float", "geo_comments": "str", "location_precision": "str",
+}
+
+# Salida del ETL (scal_global_features_clean.csv / scad_final_dataset.csv): columnas originales + features.
+# La reparación de fechas las reescribe como texto ISO y se quedan como texto, igual que con pd.read_csv.
+FEATURE_COLUMNS = {
+    **RAW_COLUMNS,
+    "issue_bits": "int",
+    "ndeath_missing_reason": "int", "npart_missing_reason": "int",
+    "locnum_missing_reason": "int", "gislocnum_missing_reason": "int",
+    "region": "str", "event_year": "int", "event_month": "int", "duration_days": "int",
+    "ndeath_clean": "int", "violent_event": "int", "mass_casualty": "int",
+    "npart_clean": "int", "npart_missing_flag": "int", "mass_participation": "int",
+    "repression_level": "str", "repression_event": "int",
+    "event_type_label": "str", "etype_label": "str", "etype_family": "str",
+    "issue1_label": "str", "issue2_label": "str", "issue3_label": "str", "issue_main": "str",
+    "issue_election": "int", "issue_economy": "int", "issue_identity": "int", "issue_rights": "int",
+    "flag_inconsistent_lethal_repress": "int",
+    "actor1_bucket": "str", "actor2_bucket": "str", "actor3_bucket": "str",
+    "target1_bucket": "str", "target2_bucket": "str",
+    "pattern_state_vs_civilians": "int", "pattern_nonstate_vs_gov": "int",
+    "actor1_cid": "int", "target1_cid": "int",
+    "population": "int",
+}
+
+
+# -----------------------------
+# Transcodificación a UTF-8 (una sola vez)
+# -----------------------------
+
+def utf8_source(path, encoding: str = SOURCE_ENCODING) -> Path:
+    """Copia UTF-8 de un CSV en `encoding` en `artifacts/utf8/`, transcodificada solo si falta o está desfasada."""
+    path = Path(path)
+    target = UTF8_DIR / path.name
+    meta_path = target.with_suffix(".json")
+    signature = dict(scad_loader.source_signature(path), encoding=encoding)
+    try:
+        if target.exists() and json.loads(meta_path.read_text(encoding="utf-8")) == signature:
+            return target
+    except (OSError, ValueError):
+        pass
+
+    UTF8_DIR.mkdir(parents=True, exist_ok=True)
+    # Se escribe con un nombre temporal y se mueve a su sitio: un lector concurrente nunca ve medio fichero
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    with open(path, encoding=encoding, newline="") as src, open(tmp, "w", encoding="utf-8", newline="") as dst:
+        while block := src.read(BLOCK_SIZE):
+            dst.write(block)
+    os.replace(tmp, target)
+    meta_path.write_text(json.dumps(signature), encoding="utf-8")
+    return target
+
+
+# -----------------------------
+# Lecturas tipadas
+# -----------------------------
+
+def _convert_options(columns: dict) -> pacsv.ConvertOptions:
+    return pacsv.ConvertOptions(
+        column_types={col: ARROW_TYPES[kind] for col, kind in (columns or {}).items()},
+        null_values=NULL_VALUES,
+        strings_can_be_null=True,
+    )
+
+
+def _numeric(column: pa.ChunkedArray):
+    """Columna de texto → float64; los valores que no son números quedan en NaN."""
+    try:
+        return pc.cast(column, pa.float64())
+    except pa.ArrowInvalid:
+        # Camino lento, solo para columnas con algún texto no numérico
+        return pa.array(pd.to_numeric(column.to_pandas(), errors="coerce").to_numpy(dtype="float64"))
+
+
+def _to_pandas(table: pa.Table, columns: dict = None) -> pd.DataFrame:
+    columns = columns or {}
+    for i, name in enumerate(table.column_names):
+        if columns.get(name) in NUMERIC_KINDS:
+            table = table.set_column(i, name, _numeric(table.column(i)))
+    df = table.to_pandas()
+    for col in df.columns:
+        kind = columns.get(col)
+        if kind == "int":
+            # int64 si está completa y es entera; si no, float64 con NaN (como pd.read_csv)
+            values = df[col].to_numpy()
+            if not np.isnan(values).any() and np.array_equal(values, np.floor(values)):
+                df[col] = values.astype(np.int64)
+        elif df[col].dtype == object:
+            # Texto ausente como NaN (pyarrow devuelve None) y columnas vacías como float64, como pd.read_csv
+            missing = df[col].isna()
+            if missing.all():
+                df[col] = np.nan
+            elif missing.any():
+                df[col] = df[col].where(~missing, np.nan)
+    return df
+
+
+def read_csv(path, columns: dict = None) -> pd.DataFrame:
+    """Lee un CSV UTF-8 con el lector multihilo de pyarrow y los tipos de columna declarados."""
+    table = pacsv.read_csv(
+        path,
+        read_options=pacsv.ReadOptions(use_threads=True, block_size=BLOCK_SIZE),
+        convert_options=_convert_options(columns),
+    )
+    return _to_pandas(table, columns)
+
+
+def iter_csv(path, chunksize: int, columns: dict = None):
+    """Genera DataFrames de `chunksize` filas (el último puede ser más corto)."""
+    reader = pacsv.open_csv(
+        path,
+        read_options=pacsv.ReadOptions(use_threads=True, block_size=BLOCK_SIZE),
+        convert_options=_convert_options(columns),
+    )
+    pending, rows = [], 0
+    for batch in reader:
+        pending.append(batch)
+        rows += batch.num_rows
+        while rows >= chunksize:
+            table = pa.Table.from_batches(pending, schema=reader.schema)
+            yield _to_pandas(table.slice(0, chunksize), columns)
+            rest = table.slice(chunksize)
+            pending, rows = rest.to_batches(), rest.num_rows
+    if rows:
+        yield _to_pandas(pa.Table.from_batches(pending, schema=reader.schema), columns)
+
+
+def read_header(path) -> list[str]:
+    """Nombres de columna de un CSV UTF-8."""
+    return pd.read_csv(path, nrows=0).columns.tolist()
+
+
+def read_scad_region(path) -> pd.DataFrame:
+    """Fichero regional de SCAD (latin-1), leído desde su copia UTF-8 con los tipos de las columnas originales."""
+    return read_csv(utf8_source(path), RAW_COLUMNS)
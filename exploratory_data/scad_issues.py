@@ -0,0 +1,239 @@
+"""Co-ocurrencia de issues (issue × issue) y tabla cruzada issue × tipo de evento, por año y país.
+
+SCAD codifica hasta tres issues por evento (issue1–issue3), pero solo issue1
+está relleno de forma fiable: el ETL descarta issue3 al principio y poda issue2
+como columna de poca información, así que el CSV final por sí solo no puede
+decir qué issues aparecen juntos. Por eso el ETL empaqueta todos los huecos de
+issue en una columna de máscara de bits, `issue_bits` (bit c - 1 activo ⇔ está
+el código de issue c), antes de que esas columnas desaparezcan.
+
+`IssueCooccurrence` precalcula a partir de ella, por (año, país):
+
+- pairs: eventos que llevan a la vez el issue a y el issue b (a ≤ b; a == b
+  cuenta los eventos que llevan el issue a);
+- cross: eventos que llevan el issue i, por tipo de evento;
+- totals: eventos y eventos con dos o más issues.
+
+Las filas se agrupan primero por su patrón de bits y solo los pocos patrones
+distintos se expanden en pares de issues, así que la construcción nunca
+multiplica filas y la app solo enmascara y suma las entradas precalculadas.
+`IssueBuilder` se puede alimentar lote a lote (ETL en streaming).
+
+Las tablas se guardan como `artifacts/<stem del csv>.issues.npz` con los
+helpers de artefactos compartidos de scad_loader.py.
+"""
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import scad_loader
+
+ISSUES_FILE = "issues.npz"
+ISSUES_VERSION = 1
+
+ISSUE_COLS = ["issue1", "issue2", "issue3"]
+BITS_COL = "issue_bits"
+
+ISSUE_LABEL_MAP = {
+    1: "Elections",
+    2: "Economy/Jobs",
+    3: "Food/Water/Subsistence",
+    4: "Environmental Degradation",
+    5: "Ethnic Issues/Discrimination",
+    6: "Religious Issues/Discrimination",
+    7: "Education",
+    8: "Foreign Relations",
+    9: "Domestic War/Violence/Terrorism",
+    10: "Human Rights/Democracy",
+    11: "Pro-Government",
+    12: "Economic Resources/Assets",
+    13: "Other",
+    14: "Unknown/Not specified",
+}
+
+ISSUE_CODES = np.array(sorted(ISSUE_LABEL_MAP), dtype=np.int8)
+
+
+def issue_bits(df: pd.DataFrame) -> pd.Series:
+    """Máscara de bits de los códigos de issue presentes en issue1–issue3 (0 = ningún issue codificado)."""
+    bits = np.zeros(len(df), dtype=np.int32)
+    for col in ISSUE_COLS:
+        if col not in df.columns:
+            continue
+        codes = pd.to_numeric(df[col], errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+        valid = np.isin(codes, ISSUE_CODES)
+        bits[valid] |= 1 << (codes[valid].astype(np.int32) - 1)
+    return pd.Series(bits, index=df.index, name=BITS_COL)
+
+
+def _codes_of(bits: int) -> list[int]:
+    return [int(c) for c in ISSUE_CODES if bits >> (int(c) - 1) & 1]
+
+
+class IssueBuilder:
+    """Acumula conteos por (año, país, tipo de evento, patrón de bits) sobre uno o varios lotes de DataFrame."""
+
+    def __init__(self):
+        self.parts = []
+
+    def update(self, df: pd.DataFrame):
+        import scad_schema
+
+        roles = scad_schema.resolve_roles(df.columns)
+        if roles["year"] is None:
+            return
+        bits = df[BITS_COL] if BITS_COL in df.columns else issue_bits(df)
+        frame = pd.DataFrame({
+            "year": pd.to_numeric(df[roles["year"]], errors="coerce"),
+            "country": df[roles["country"]].astype(object) if roles["country"] else "",
+            "etype": df[roles["event_type"]].astype(object) if roles["event_type"] else "",
+            "bits": pd.to_numeric(bits, errors="coerce").fillna(0).astype(np.int32),
+        }).dropna(subset=["year"])
+        frame[["country", "etype"]] = frame[["country", "etype"]].fillna("")
+        self.parts.append(frame.groupby(["year", "country", "etype", "bits"], sort=False).size()
+                          .rename("events").reset_index())
+
+    def result(self) -> "IssueCooccurrence":
+        if not self.parts:
+            return IssueCooccurrence.from_patterns(
+                pd.DataFrame({"year": [], "country": [], "etype": [], "bits": [], "events": []}))
+        patterns = pd.concat(self.parts, ignore_index=True)
+        return IssueCooccurrence.from_patterns(
+            patterns.groupby(["year", "country", "etype", "bits"], sort=False)["events"].sum().reset_index())
+
+
+class IssueCooccurrence:
+    """Entradas precalculadas de pares, tabla cruzada y totales por (año, país)."""
+
+    def __init__(self, countries, etypes, pairs: dict, cross: dict, totals: dict):
+        self.countries = countries  # vocabulario de países (ordenado); posición = id de país
+        self.etypes = etypes        # vocabulario de tipos de evento (ordenado); posición = id de tipo
+        self.pairs = pairs          # year, country, a, b (códigos de issue, a ≤ b), events
+        self.cross = cross          # year, country, issue, etype, events
+        self.totals = totals        # year, country, events, multi (eventos con 2+ issues)
+
+    @property
+    def labels(self) -> list[str]:
+        return [ISSUE_LABEL_MAP[int(c)] for c in ISSUE_CODES]
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame):
+        builder = IssueBuilder()
+        builder.update(df)
+        return builder.result()
+
+    @classmethod
+    def from_patterns(cls, patterns: pd.DataFrame):
+        """Construye a partir de conteos (year, country, etype, bits, events)."""
+        countries = np.array(sorted(patterns["country"].unique()), dtype=str)
+        etypes = np.array(sorted(patterns["etype"].unique()), dtype=str)
+        patterns = patterns.assign(
+            year=patterns["year"].astype(np.int16),
+            country=np.searchsorted(countries, patterns["country"].to_numpy(dtype=str)).astype(np.int16),
+            etype=np.searchsorted(etypes, patterns["etype"].to_numpy(dtype=str)).astype(np.int16),
+            bits=patterns["bits"].astype(np.int32),
+        )
+
+        # Tabla de expansión solo de los patrones distintos: patrón → sus issues / sus pares de issues
+        distinct = np.unique(patterns["bits"].to_numpy())
+        issue_of = pd.DataFrame([(b, c) for b in distinct for c in _codes_of(b)], columns=["bits", "issue"],
+                                dtype=np.int32)
+        pair_of = pd.DataFrame([(b, a, c) for b in distinct for a in _codes_of(b) for c in _codes_of(b) if a <= c],
+                               columns=["bits", "a", "b"], dtype=np.int32)
+
+        by_place = patterns.groupby(["year", "country", "bits"])["events"].sum().reset_index()
+        pairs = (by_place.merge(pair_of, on="bits")
+                 .groupby(["year", "country", "a", "b"])["events"].sum().reset_index())
+        cross = (patterns.merge(issue_of, on="bits")
+                 .groupby(["year", "country", "issue", "etype"])["events"].sum().reset_index())
+        n_issues = by_place["bits"].map({int(b): len(_codes_of(int(b))) for b in distinct})
+        totals = (by_place.assign(multi=by_place["events"].where(n_issues >= 2, 0))
+                  .groupby(["year", "country"])[["events", "multi"]].sum().reset_index())
+
+        def arrays(table, dtypes):
+            return {col: table[col].to_numpy().astype(dtype) for col, dtype in dtypes.items()}
+
+        return cls(
+            countries, etypes,
+            arrays(pairs, {"year": np.int16, "country": np.int16, "a": np.int8, "b": np.int8, "events": np.int32}),
+            arrays(cross, {"year": np.int16, "country": np.int16, "issue": np.int8, "etype": np.int16,
+                           "events": np.int32}),
+            arrays(totals, {"year": np.int16, "country": np.int16, "events": np.int32, "multi": np.int32}),
+        )
+
+    def _mask(self, table: dict, years=None, countries=None) -> np.ndarray:
+        keep = np.ones(len(table["year"]), dtype=bool)
+        if years is not None:
+            keep &= (table["year"] >= years[0]) & (table["year"] <= years[1])
+        if countries is not None:
+            wanted = np.flatnonzero(np.isin(self.countries, list(countries)))
+            keep &= np.isin(table["country"], wanted)
+        return keep
+
+    def year_range(self):
+        years = self.totals["year"]
+        return (int(years.min()), int(years.max())) if years.size else None
+
+    def matrix(self, years=None, countries=None) -> pd.DataFrame:
+        """Conteos simétricos issue × issue del corte (diagonal: eventos que llevan el issue)."""
+        keep = self._mask(self.pairs, years, countries)
+        n = len(ISSUE_CODES)
+        m = np.zeros((n, n), dtype=np.int64)
+        np.add.at(m, (self.pairs["a"][keep] - 1, self.pairs["b"][keep] - 1), self.pairs["events"][keep])
+        m = m + m.T - np.diag(np.diag(m))
+        return pd.DataFrame(m, index=self.labels, columns=self.labels)
+
+    def crosstab(self, years=None, countries=None) -> pd.DataFrame:
+        """Conteos issue × tipo de evento del corte (un evento cuenta una vez por cada issue que lleva)."""
+        keep = self._mask(self.cross, years, countries)
+        m = np.zeros((len(ISSUE_CODES), len(self.etypes)), dtype=np.int64)
+        np.add.at(m, (self.cross["issue"][keep] - 1, self.cross["etype"][keep]), self.cross["events"][keep])
+        return pd.DataFrame(m, index=self.labels, columns=list(self.etypes))
+
+    def totals_of(self, years=None, countries=None) -> dict:
+        """Eventos y eventos con dos o más issues en el corte."""
+        keep = self._mask(self.totals, years, countries)
+        return {"events": int(self.totals["events"][keep].sum()), "multi": int(self.totals["multi"][keep].sum())}
+
+    def to_arrays(self) -> dict:
+        return {
+            "countries": self.countries, "etypes": self.etypes,
+            **{f"pairs_{k}": v for k, v in self.pairs.items()},
+            **{f"cross_{k}": v for k, v in self.cross.items()},
+            **{f"totals_{k}": v for k, v in self.totals.items()},
+        }
+
+    @classmethod
+    def from_arrays(cls, z: dict):
+        tables = {name: {k[len(name) + 1:]: v for k, v in z.items() if k.startswith(f"{name}_")}
+                  for name in ["pairs", "cross", "totals"]}
+        return cls(z["countries"], z["etypes"], tables["pairs"], tables["cross"], tables["totals"])
+
+
+def top_pairs(matrix: pd.DataFrame, n: int = 15) -> pd.DataFrame:
+    """Pares más frecuentes de issues distintos (triángulo superior de `matrix`)."""
+    i, j = np.triu_indices(len(matrix), k=1)
+    values = matrix.to_numpy()[i, j]
+    diag = np.diag(matrix.to_numpy())
+    out = pd.DataFrame({
+        "issue_a": matrix.index[i], "issue_b": matrix.columns[j], "events": values,
+        # Fracción de los eventos del issue menos frecuente que también llevan el otro
+        "share_of_rarer": values / np.maximum(np.minimum(diag[i], diag[j]), 1),
+    })
+    return out[out["events"] > 0].sort_values("events", ascending=False, ignore_index=True).head(n)
+
+
+# -----------------------------
+# Persistencia
+# -----------------------------
+
+def save_cooccurrence(issues: IssueCooccurrence, csv_path) -> Path:
+    """Escribe las tablas de `csv_path` (llamar después de escribir el CSV)."""
+    return scad_loader.save_npz_artifact(issues.to_arrays(), csv_path, ISSUES_FILE, ISSUES_VERSION)
+
+
+def load_cooccurrence(csv_path):
+    """Tablas de `csv_path` si están al día; si no, None."""
+    arrays = scad_loader.load_npz_artifact(csv_path, ISSUES_FILE, ISSUES_VERSION)
+    return None if arrays is None else IssueCooccurrence.from_arrays(arrays)
@@ -0,0 +1,365 @@
+"""Carga del dataset SCAD en segundo plano para la app Streamlit.
+
+La lectura del CSV arranca en un hilo con la primera sesión del servidor, de
+modo que las páginas de solo texto (Inicio, Conclusiones) se pintan sin esperar
+al dataset y las páginas de datos recogen el DataFrame cuando está listo.
+pandas se importa dentro del hilo de carga, fuera del camino del primer render.
+
+El CSV (UTF-8, escrito por el ETL) se lee con el lector multihilo de pyarrow y
+los tipos de columna declarados en scad_ingest.py, sin inferencia de tipos, y
+las columnas se reducen con scad_dtypes.py (bool, int8/int16, float32, category).
+
+Cada carga lleva la huella del fichero (tamaño, mtime y, opcionalmente, un
+hash del contenido), que sirve de clave a las cachés en memoria de la app, y el
+SHA-256 del contenido (`content_id`), que identifica los datos en la caché
+persistente de resultados sin depender del mtime. `DatasetWatcher`
+vigila el CSV: si cambia, lo carga en segundo plano mientras se sigue sirviendo
+la versión anterior y solo entonces la sustituye (una asignación atómica).
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pickle
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Caché en disco generada por el warm-up (scad_warmup.py)
+ARTIFACTS_DIR = Path(__file__).resolve().parent / "artifacts"
+WARM_DATASET = ARTIFACTS_DIR / "dataset.pkl"
+WARM_VIEWS = ARTIFACTS_DIR / "default_views.pkl"
+WARM_META = ARTIFACTS_DIR / "warmup.json"
+# Se incrementa cuando cambia el contenido de las vistas cacheadas o del DataFrame
+WARM_FORMAT = 4
+
+# Recarga en caliente: segundos entre comprobaciones del CSV y si la huella incluye un hash del contenido
+# (así un `touch` o una copia idéntica no provocan recarga)
+WATCH_INTERVAL = float(os.environ.get("SCAD_WATCH_INTERVAL", "5"))
+HASH_CONTENT = os.environ.get("SCAD_HASH_DATASET") == "1"
+
+
+def file_stat(path: Path) -> tuple:
+    stat = os.stat(path)
+    return (stat.st_size, stat.st_mtime_ns)
+
+
+def content_digest(path: Path) -> str:
+    """SHA-256 (hex) del contenido del fichero."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        while block := fh.read(1 << 20):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def fingerprint(path: Path, content_hash: bool = HASH_CONTENT) -> tuple:
+    """Huella del fichero: (tamaño, mtime_ns) y, con `content_hash`, el SHA-256 del contenido."""
+    fp = file_stat(path)
+    if content_hash:
+        fp += (content_digest(path),)
+    return fp
+
+
+def source_signature(path: Path) -> dict:
+    """Identifica la versión del CSV de origen (ruta absoluta, tamaño y mtime)."""
+    stat = os.stat(path)
+    return {"source": str(Path(path).resolve()), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+# -----------------------------
+# Artefactos por CSV
+# -----------------------------
+# El ETL deja junto a cada CSV que escribe artefactos derivados (`artifacts/<stem>.<sufijo>`)
+# con la versión de su formato y el tamaño y mtime del CSV de origen; al leerlos, si el CSV
+# cambió desde entonces o la versión no coincide, se devuelve None y quien llama recalcula.
+
+def artifact_signature(csv_path) -> dict:
+    """Tamaño y mtime del CSV de origen de un artefacto."""
+    stat = os.stat(csv_path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def artifact_path(csv_path, suffix: str) -> Path:
+    return ARTIFACTS_DIR / f"{Path(csv_path).stem}.{suffix}"
+
+
+def save_json_artifact(payload: dict, csv_path, suffix: str, indent: int = None) -> Path:
+    """Escribe `payload` (que lleva su "version") con la firma de `csv_path`; llamar tras escribir el CSV."""
+    path = artifact_path(csv_path, suffix)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = dict(payload, source=artifact_signature(csv_path), built_at=time.strftime("%Y-%m-%dT%H:%M:%S"))
+    path.write_text(json.dumps(payload, ensure_ascii=False, indent=indent), encoding="utf-8")
+    return path
+
+
+def load_json_artifact(csv_path, suffix: str, version: int):
+    """Contenido del artefacto JSON si existe, es de `version` y el CSV no ha cambiado; si no, None."""
+    path = artifact_path(csv_path, suffix)
+    if not (path.exists() and Path(csv_path).exists()):
+        return None
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if payload.get("version") != version or payload.get("source") != artifact_signature(csv_path):
+        return None
+    return payload
+
+
+def save_npz_artifact(arrays: dict, csv_path, suffix: str, version: int) -> Path:
+    """Escribe los arrays en un .npz comprimido con la versión y la firma de `csv_path`."""
+    import numpy as np
+
+    path = artifact_path(csv_path, suffix)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    source = artifact_signature(csv_path)
+    np.savez_compressed(path, version=version, source_size=source["size"],
+                        source_mtime_ns=source["mtime_ns"], **arrays)
+    return path
+
+
+def load_npz_artifact(csv_path, suffix: str, version: int):
+    """Arrays (dict) del artefacto .npz si está al día, como en `load_json_artifact`; si no, None.
+
+    El archivo se abre una sola vez: se comprueban versión y firma y se leen los arrays.
+    """
+    import numpy as np
+
+    path = artifact_path(csv_path, suffix)
+    if not (path.exists() and Path(csv_path).exists()):
+        return None
+    try:
+        with np.load(path) as z:
+            source = {"size": int(z["source_size"]), "mtime_ns": int(z["source_mtime_ns"])}
+            if int(z["version"]) != version or source != artifact_signature(csv_path):
+                return None
+            return {k: z[k] for k in z.files if k not in ("version", "source_size", "source_mtime_ns")}
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def warm_cache_valid(path: Path) -> bool:
+    """True si el warm-up se generó a partir de la versión actual de `path`."""
+    if not (WARM_META.exists() and WARM_DATASET.exists() and Path(path).exists()):
+        return False
+    try:
+        meta = json.loads(WARM_META.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return False
+    return meta.get("format") == WARM_FORMAT and meta.get("signature") == source_signature(path)
+
+
+def read_warm_meta(path: Path):
+    """Manifiesto del warm-up si está al día para `path`; si no, None."""
+    if not warm_cache_valid(path):
+        return None
+    try:
+        return json.loads(WARM_META.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def write_warm_cache(path: Path, df: pd.DataFrame, views: dict):
+    """Persiste el DataFrame cargado y las vistas por defecto; el manifiesto se escribe al final."""
+    ARTIFACTS_DIR.mkdir(parents=True, exist_ok=True)
+    sha256 = content_digest(path)
+    df.to_pickle(WARM_DATASET)
+    with open(WARM_VIEWS, "wb") as fh:
+        pickle.dump(views, fh, protocol=pickle.HIGHEST_PROTOCOL)
+    meta = {
+        "format": WARM_FORMAT,
+        "signature": source_signature(path),
+        "sha256": sha256,
+        "built_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "rows": len(df),
+        "views": sorted("/".join(key) for key in views),
+    }
+    WARM_META.write_text(json.dumps(meta, indent=2), encoding="utf-8")
+
+
+def warm_artifact_path(path: Path, filename: str):
+    """Ruta de un artefacto del warm-up si está al día para `path`; si no, None."""
+    artifact = ARTIFACTS_DIR / filename
+    if artifact.exists() and warm_cache_valid(path):
+        return artifact
+    return None
+
+
+def read_default_views(path: Path) -> dict:
+    """Vistas por defecto del warm-up, o {} si no existen o están desfasadas."""
+    if not (warm_cache_valid(path) and WARM_VIEWS.exists()):
+        return {}
+    with open(WARM_VIEWS, "rb") as fh:
+        return pickle.load(fh)
+
+
+def load_dataset(path: Path, report=None, use_warm_cache: bool = True, optimize: bool = True) -> pd.DataFrame:
+    """Lee y normaliza el dataset final; `report(fraccion, etapa)` recibe el progreso.
+
+    Con `optimize` las columnas se reducen al tipo más pequeño (scad_dtypes.py).
+    """
+    import pandas as pd
+
+    report = report or (lambda fraction, stage: None)
+    path = Path(path)
+
+    # Arranque en caliente: el warm-up ya dejó el DataFrame normalizado en disco
+    if use_warm_cache and warm_cache_valid(path):
+        report(0.5, "Leyendo caché del warm-up")
+        df = pd.read_pickle(WARM_DATASET)
+        report(1.0, "Listo")
+        return df
+
+    # Lectura tipada con pyarrow (multihilo; los bloques se procesan en paralelo)
+    import scad_ingest
+
+    report(0.1, "Leyendo CSV")
+    df = scad_ingest.read_csv(path, scad_ingest.FEATURE_COLUMNS)
+
+    report(0.95, "Normalizando columnas")
+
+    # Normaliza columnas
+    df.columns = df.columns.str.strip()
+
+    # Roles de columna del manifiesto del ETL (o deducidos del propio CSV si falta o está desfasado).
+    # Se resuelven aquí una sola vez: el DataFrame cargado ya lleva los nombres canónicos
+    # (year, country_display, event_type_display) y las páginas no renombran nada.
+    import scad_schema
+
+    schema = scad_schema.load_schema(path) or scad_schema.schema_from_frame(df)
+    roles = schema["roles"]
+    if roles.get("year") is None:
+        raise ValueError("No se encontró ninguna columna que parezca contener el año.")
+    df = scad_schema.apply_schema(df, schema)
+
+    # Conversión a numérico
+    df["year"] = pd.to_numeric(df["year"], errors="coerce")
+
+    # ndeath puede no existir en algunos SCAD
+    if "ndeath" not in df.columns:
+        if roles.get("deaths"):
+            df["ndeath"] = pd.to_numeric(df[roles["deaths"]], errors="coerce")
+        else:
+            df["ndeath"] = pd.NA
+
+    df["ndeath"] = pd.to_numeric(df["ndeath"], errors="coerce")
+
+    if optimize:
+        import scad_dtypes
+
+        report(0.97, "Reduciendo tipos")
+        df = scad_dtypes.optimize_dtypes(df)
+
+    report(1.0, "Listo")
+    return df
+
+
+def dataset_roles(path: Path, df: pd.DataFrame) -> dict:
+    """Roles de columna del DataFrame cargado: los del manifiesto del ETL (con los nombres
+    canónicos que deja `apply_schema`) o, si falta o está desfasado, deducidos de sus columnas."""
+    import scad_schema
+
+    schema = scad_schema.load_schema(path)
+    if schema is None:
+        return scad_schema.resolve_roles(df.columns)
+    return {role: (col if col in df.columns else None) for role, col in scad_schema.loaded_roles(schema).items()}
+
+
+class BackgroundLoad:
+    """Lectura del dataset en un hilo propio, con progreso consultable desde la app."""
+
+    def __init__(self, path: Path, fp: tuple = None):
+        self.path = Path(path)
+        # La huella se toma antes de leer: si el fichero cambia durante la lectura, el watcher lo detecta
+        self.fingerprint = fp or fingerprint(self.path)
+        # SHA-256 del contenido, fijado en el hilo de carga antes de leer (None hasta entonces)
+        self.content_id = None
+        self.progress = 0.0
+        self.stage = "En cola"
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scad-load")
+        self.future: Future = executor.submit(self._load)
+        executor.shutdown(wait=False)
+
+    def _load(self) -> pd.DataFrame:
+        # El hash sale de la huella o del manifiesto del warm-up si ya lo tienen; si no, se calcula
+        if len(self.fingerprint) > 2:
+            self.content_id = self.fingerprint[2]
+        else:
+            meta = read_warm_meta(self.path) or {}
+            self.content_id = meta.get("sha256") or content_digest(self.path)
+        return load_dataset(self.path, self._report)
+
+    def _report(self, fraction: float, stage: str):
+        self.progress = fraction
+        self.stage = stage
+
+    def done(self) -> bool:
+        return self.future.done()
+
+    def result(self, timeout=None) -> pd.DataFrame:
+        return self.future.result(timeout)
+
+    def cache_key(self) -> tuple:
+        """Clave de las cachés de la app derivadas de esta carga (ruta + huella)."""
+        return (str(self.path), self.fingerprint)
+
+
+class DatasetWatcher:
+    """Versión servida del dataset, recargada en segundo plano cuando el CSV cambia en disco.
+
+    `current` es siempre una carga completa (o la inicial, aún en curso): la
+    nueva versión se lee mientras la anterior sigue sirviendo y se publica con
+    una sola asignación, así que cada rerun ve una versión coherente.
+    """
+
+    def __init__(self, path: Path, interval: float = WATCH_INTERVAL, content_hash: bool = HASH_CONTENT):
+        self.path = Path(path)
+        self.interval = interval
+        self.content_hash = content_hash
+        self.current = BackgroundLoad(self.path, fingerprint(self.path, content_hash))
+        self.reloads = 0
+        self.last_error = None
+        threading.Thread(target=self._watch, name="scad-watch", daemon=True).start()
+
+    def _watch(self):
+        seen = self.current.fingerprint[:2]
+        pending = None
+        while True:
+            time.sleep(self.interval)
+            try:
+                stat = file_stat(self.path)
+            except OSError:
+                continue  # el fichero se está sustituyendo
+            if stat == seen:
+                pending = None
+                continue
+            if stat != pending:
+                # Se espera a que deje de cambiar (dos comprobaciones iguales) antes de leerlo
+                pending = stat
+                continue
+            seen, pending = stat, None
+            self._reload()
+
+    def _reload(self):
+        try:
+            fp = fingerprint(self.path, self.content_hash)
+        except OSError:
+            return
+        if self.content_hash and fp[2:] == self.current.fingerprint[2:]:
+            return  # mismo contenido: no hace falta recargar
+        load = BackgroundLoad(self.path, fp)
+        try:
+            load.result()
+        except Exception as exc:  # se sigue sirviendo la versión anterior
+            self.last_error = exc
+            return
+        self.current = load
+        self.reloads += 1
+        self.last_error = None
@@ -0,0 +1,220 @@
+"""Matriz dispersa de co-ocurrencia actor → objetivo, desglosada por año y país.
+
+`exploring_data_real.py` lista los pares actor1 × target1 más frecuentes con un
+groupby sobre las filas; hacer eso con cada filtro de la app reagruparía el
+dataset entero cada vez y no escala al vocabulario completo de actores. En su
+lugar, el ETL construye la matriz una sola vez, en formato COO: una entrada por
+(actor, objetivo, año, país) con su número de eventos y de muertes, donde
+actores y objetivos comparten un vocabulario normalizado (espacios colapsados y
+minúsculas, como `scad_etl.normalize_text`; los nombres vacíos y "missing"
+quedan fuera). Con un vocabulario de actores (scad_actors.py), los nombres casi
+duplicados se funden antes en su nombre canónico. `NetworkBuilder` se puede
+alimentar lote a lote, así que el ETL en streaming la construye sin tener la
+salida en memoria.
+
+`ActorNetwork.edges` corta las entradas por rango de años y países y las suma
+por (actor, objetivo) con un único `np.bincount`; `degree_table` ordena los
+nodos de un corte y `spring_layout` coloca solo el subgrafo visible.
+
+La matriz se guarda como `artifacts/<stem del csv>.network.npz` con los helpers
+de artefactos compartidos de scad_loader.py.
+"""
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import scad_loader
+
+NETWORK_FILE = "network.npz"
+NETWORK_VERSION = 1
+
+ACTOR_COL = "actor1"
+TARGET_COL = "target1"
+
+MISSING_NAMES = {"", "missing", "nan"}
+
+
+def normalize_names(s: pd.Series) -> pd.Series:
+    """`scad_etl.normalize_text` vectorizado; los nombres ausentes quedan en NaN."""
+    names = s.astype("string").str.replace(r"\s+", " ", regex=True).str.strip().str.lower()
+    return names.where(~names.isin(MISSING_NAMES)).astype(object)
+
+
+class NetworkBuilder:
+    """Acumula conteos por (actor, objetivo, año, país) sobre uno o varios lotes de DataFrame."""
+
+    def __init__(self, actor_col: str = ACTOR_COL, target_col: str = TARGET_COL, canon=None):
+        self.actor_col = actor_col
+        self.target_col = target_col
+        self.canon = canon  # scad_actors.ActorCanon: nombres canónicos en lugar de los originales
+        self.parts = []
+
+    def update(self, df: pd.DataFrame):
+        import scad_schema
+
+        roles = scad_schema.resolve_roles(df.columns)
+        if self.actor_col not in df.columns or self.target_col not in df.columns or roles["year"] is None:
+            return
+        deaths = (pd.to_numeric(df[roles["deaths"]], errors="coerce").fillna(0) if roles["deaths"]
+                  else pd.Series(0.0, index=df.index))
+        frame = pd.DataFrame({
+            "actor": normalize_names(df[self.actor_col]),
+            "target": normalize_names(df[self.target_col]),
+            "year": pd.to_numeric(df[roles["year"]], errors="coerce"),
+            "country": df[roles["country"]].astype(object) if roles["country"] else "",
+            "deaths": deaths.astype("float64"),
+        }).dropna(subset=["actor", "target", "year"])
+        if self.canon is not None:
+            frame["actor"] = self.canon.canonical(frame["actor"])
+            frame["target"] = self.canon.canonical(frame["target"])
+        frame["country"] = frame["country"].fillna("")
+        part = (frame.groupby(["actor", "target", "year", "country"], sort=False)
+                .agg(events=("deaths", "size"), deaths=("deaths", "sum")).reset_index())
+        self.parts.append(part)
+
+    def result(self) -> "ActorNetwork":
+        if not self.parts:
+            return ActorNetwork.empty()
+        entries = pd.concat(self.parts, ignore_index=True)
+        if len(self.parts) > 1:
+            # La misma clave puede aparecer en varios lotes
+            entries = entries.groupby(["actor", "target", "year", "country"], sort=False).sum().reset_index()
+        names = np.array(sorted(set(entries["actor"]) | set(entries["target"])), dtype=str)
+        countries = np.array(sorted(entries["country"].unique()), dtype=str)
+        entries = entries.sort_values(["year", "country", "actor", "target"], ignore_index=True)
+        return ActorNetwork(
+            names,
+            countries,
+            src=np.searchsorted(names, entries["actor"].to_numpy(dtype=str)).astype(np.int32),
+            dst=np.searchsorted(names, entries["target"].to_numpy(dtype=str)).astype(np.int32),
+            year=entries["year"].to_numpy().astype(np.int16),
+            country=np.searchsorted(countries, entries["country"].to_numpy(dtype=str)).astype(np.int16),
+            events=entries["events"].to_numpy().astype(np.int32),
+            deaths=entries["deaths"].to_numpy().astype(np.float64),
+        )
+
+
+class ActorNetwork:
+    """Entradas COO (src, dst, year, country) → eventos, muertes sobre un vocabulario de actores compartido."""
+
+    def __init__(self, names, countries, src, dst, year, country, events, deaths):
+        self.names = names          # vocabulario de actores/objetivos (ordenado); posición = id de nodo
+        self.countries = countries  # vocabulario de países (ordenado); posición = id de país
+        self.src = src
+        self.dst = dst
+        self.year = year
+        self.country = country
+        self.events = events
+        self.deaths = deaths
+
+    @classmethod
+    def empty(cls):
+        i32 = np.array([], dtype=np.int32)
+        return cls(np.array([], dtype=str), np.array([], dtype=str), i32, i32,
+                   np.array([], dtype=np.int16), np.array([], dtype=np.int16), i32, np.array([], dtype=np.float64))
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, actor_col: str = ACTOR_COL, target_col: str = TARGET_COL, canon=None):
+        builder = NetworkBuilder(actor_col, target_col, canon)
+        builder.update(df)
+        return builder.result()
+
+    @property
+    def n_entries(self) -> int:
+        return len(self.src)
+
+    def mask(self, years=None, countries=None) -> np.ndarray:
+        """Entradas dentro del rango de años y (si se dan) de los países, por nombre."""
+        keep = np.ones(self.n_entries, dtype=bool)
+        if years is not None:
+            keep &= (self.year >= years[0]) & (self.year <= years[1])
+        if countries is not None:
+            wanted = np.flatnonzero(np.isin(self.countries, list(countries)))
+            keep &= np.isin(self.country, wanted)
+        return keep
+
+    def edges(self, years=None, countries=None) -> pd.DataFrame:
+        """Aristas del corte: (src, dst, actor, target, events, deaths), las de más peso primero."""
+        keep = self.mask(years, countries)
+        src, dst = self.src[keep].astype(np.int64), self.dst[keep].astype(np.int64)
+        if src.size == 0:
+            return pd.DataFrame({"src": [], "dst": [], "actor": [], "target": [], "events": [], "deaths": []})
+        uniq, inverse = np.unique(src * len(self.names) + dst, return_inverse=True)
+        out = pd.DataFrame({
+            "src": uniq // len(self.names),
+            "dst": uniq % len(self.names),
+            "events": np.bincount(inverse, weights=self.events[keep], minlength=len(uniq)).astype(int),
+            "deaths": np.bincount(inverse, weights=self.deaths[keep], minlength=len(uniq)),
+        })
+        out.insert(2, "actor", self.names[out["src"]])
+        out.insert(3, "target", self.names[out["dst"]])
+        return out.sort_values(["events", "deaths"], ascending=False, ignore_index=True)
+
+    def to_arrays(self) -> dict:
+        return {"names": self.names, "countries": self.countries, "src": self.src, "dst": self.dst,
+                "year": self.year, "country": self.country, "events": self.events, "deaths": self.deaths}
+
+    @classmethod
+    def from_arrays(cls, z: dict):
+        return cls(z["names"], z["countries"], z["src"], z["dst"], z["year"], z["country"],
+                   z["events"], z["deaths"])
+
+
+def degree_table(edges: pd.DataFrame, names) -> pd.DataFrame:
+    """Por nodo de un corte: objetivos/actores distintos (grado de salida/entrada) y eventos enviados/recibidos."""
+    if edges.empty:
+        return pd.DataFrame(columns=["name", "out_degree", "in_degree", "events_out", "events_in"])
+    out = edges.groupby("src").agg(out_degree=("dst", "size"), events_out=("events", "sum"))
+    inc = edges.groupby("dst").agg(in_degree=("src", "size"), events_in=("events", "sum"))
+    table = out.join(inc, how="outer").fillna(0).astype(int)
+    table.insert(0, "name", np.asarray(names)[table.index.to_numpy()])
+    return table.reset_index(drop=True)
+
+
+def spring_layout(n_nodes: int, src, dst, weights=None, iterations: int = 150, seed: int = 0) -> np.ndarray:
+    """Disposición por fuerzas de Fruchterman–Reingold → (n_nodes, 2) posiciones en [-1, 1].
+
+    O(n²) por iteración: pensada solo para el subgrafo visible (de decenas a
+    unos cientos de nodos), nunca para el vocabulario completo.
+    """
+    rng = np.random.default_rng(seed)
+    pos = rng.uniform(-1, 1, size=(n_nodes, 2))
+    if n_nodes <= 1:
+        return np.zeros((n_nodes, 2))
+    src, dst = np.asarray(src), np.asarray(dst)
+    w = np.ones(len(src)) if weights is None else np.asarray(weights, dtype=float)
+    w = w / w.max() if w.size and w.max() > 0 else w
+    k = np.sqrt(4.0 / n_nodes)  # distancia ideal para una caja [-1, 1]²
+    temperature = 0.2
+    for _ in range(iterations):
+        delta = pos[:, None, :] - pos[None, :, :]
+        dist = np.maximum(np.linalg.norm(delta, axis=-1), 1e-3)
+        # Repulsión entre cada par de nodos
+        disp = ((k * k / dist ** 2)[:, :, None] * delta).sum(axis=1)
+        # Atracción a lo largo de las aristas (las de más peso tiran más)
+        d = pos[src] - pos[dst]
+        length = np.maximum(np.linalg.norm(d, axis=1), 1e-3)
+        pull = (length / k * (0.5 + w))[:, None] * d
+        np.add.at(disp, src, -pull)
+        np.add.at(disp, dst, pull)
+        step = np.linalg.norm(disp, axis=1, keepdims=True)
+        pos += disp / np.maximum(step, 1e-9) * np.minimum(step, temperature)
+        temperature *= 0.97
+    pos -= pos.mean(axis=0)
+    return pos / max(np.abs(pos).max(), 1e-9)
+
+
+# -----------------------------
+# Persistencia
+# -----------------------------
+
+def save_network(network: ActorNetwork, csv_path) -> Path:
+    """Escribe la matriz de `csv_path` (llamar después de escribir el CSV)."""
+    return scad_loader.save_npz_artifact(network.to_arrays(), csv_path, NETWORK_FILE, NETWORK_VERSION)
+
+
+def load_network(csv_path):
+    """Matriz de `csv_path` si está al día; si no, None."""
+    arrays = scad_loader.load_npz_artifact(csv_path, NETWORK_FILE, NETWORK_VERSION)
+    return None if arrays is None else ActorNetwork.from_arrays(arrays)
@@ -0,0 +1,121 @@
+"""Tabla de referencia de población país-año para las métricas por 100k hab.
+
+`scad_population.csv` (incluida en el repositorio) tiene una fila por país SCAD
+(código COW `ccode`) y año, de modo que la normalización no depende de que el
+dataset traiga una columna de población y usa la población de cada año en vez
+de un valor fijo por país. El ETL (exploring_clean_data.py) la une a cada
+evento por (ccode, año).
+
+La tabla se genera a partir de la serie quinquenal de Gapminder que incluye
+plotly (`plotly.express.data.gapminder`, 1952–2007): los años intermedios se
+interpolan de forma log-lineal y los posteriores a 2007 se extrapolan con el
+crecimiento 2002–2007. La columna `source` indica qué filas son observadas,
+interpoladas o extrapoladas. Regeneración:
+    python exploratory_data/scad_population.py
+"""
+import argparse
+import functools
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+POPULATION_FILE = Path(__file__).resolve().parent / "scad_population.csv"
+
+# Años cubiertos por SCAD 2018
+FIRST_YEAR, LAST_YEAR = 1989, 2017
+
+# Código COW (columna `ccode` de SCAD) → nombre del país en Gapminder
+SCAD_COUNTRIES = {
+    # América Latina y Caribe
+    40: "Cuba", 41: "Haiti", 42: "Dominican Republic", 51: "Jamaica", 52: "Trinidad and Tobago",
+    70: "Mexico", 90: "Guatemala", 91: "Honduras", 92: "El Salvador", 93: "Nicaragua",
+    94: "Costa Rica", 95: "Panama",
+    # África
+    404: "Guinea-Bissau", 411: "Equatorial Guinea", 420: "Gambia", 432: "Mali", 433: "Senegal",
+    434: "Benin", 435: "Mauritania", 436: "Niger", 437: "Cote d'Ivoire", 438: "Guinea",
+    439: "Burkina Faso", 450: "Liberia", 451: "Sierra Leone", 452: "Ghana", 461: "Togo",
+    471: "Cameroon", 475: "Nigeria", 481: "Gabon", 482: "Central African Republic", 483: "Chad",
+    484: "Congo, Rep.", 490: "Congo, Dem. Rep.", 500: "Uganda", 501: "Kenya", 510: "Tanzania",
+    516: "Burundi", 517: "Rwanda", 520: "Somalia", 522: "Djibouti", 530: "Ethiopia",
+    531: "Eritrea", 540: "Angola", 541: "Mozambique", 551: "Zambia", 552: "Zimbabwe",
+    553: "Malawi", 560: "South Africa", 565: "Namibia", 570: "Lesotho", 571: "Botswana",
+    572: "Swaziland", 580: "Madagascar", 581: "Comoros", 590: "Mauritius", 600: "Morocco",
+    615: "Algeria", 616: "Tunisia", 620: "Libya", 625: "Sudan", 651: "Egypt",
+}
+
+# La serie de Sudán incluye a Sudán del Sur (independiente en 2011): no se extrapola más allá.
+# Sudán del Sur (626) no tiene serie propia en Gapminder y queda sin población.
+EXTRAPOLATION_LIMIT = {625: 2010}
+
+
+def build_table(first_year: int = FIRST_YEAR, last_year: int = LAST_YEAR) -> pd.DataFrame:
+    """Población anual (ccode, country, year, population, source) a partir de Gapminder."""
+    import plotly.express as px
+
+    gapminder = px.data.gapminder()
+    years = np.arange(first_year, last_year + 1)
+    frames = []
+    for ccode, name in SCAD_COUNTRIES.items():
+        anchors = gapminder[gapminder["country"] == name].sort_values("year")
+        if anchors.empty:
+            continue
+        ay = anchors["year"].to_numpy()
+        log_pop = np.log(anchors["pop"].to_numpy(dtype=float))
+        # Interpolación log-lineal (crecimiento constante entre observaciones)
+        values = np.interp(years, ay, log_pop)
+        # Extrapolación con el último tramo observado
+        slope = (log_pop[-1] - log_pop[-2]) / (ay[-1] - ay[-2])
+        after = years > ay[-1]
+        values[after] = log_pop[-1] + slope * (years[after] - ay[-1])
+
+        source = np.where(np.isin(years, ay), "gapminder", np.where(after, "extrapolated", "interpolated"))
+        keep = years <= EXTRAPOLATION_LIMIT.get(ccode, last_year)
+        frames.append(pd.DataFrame({
+            "ccode": ccode,
+            "country": name,
+            "year": years[keep],
+            "population": np.round(np.exp(values[keep])).astype(np.int64),
+            "source": source[keep],
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+@functools.lru_cache(maxsize=2)
+def _load_table(path: str, mtime_ns: int) -> pd.DataFrame:
+    return pd.read_csv(path, dtype={"ccode": "int64", "year": "int64", "population": "int64"})
+
+
+def load_table(path: Path = POPULATION_FILE) -> pd.DataFrame:
+    """Tabla país-año (cacheada por mtime); vacía si el fichero no existe."""
+    path = Path(path)
+    if not path.exists():
+        return pd.DataFrame(columns=["ccode", "country", "year", "population", "source"])
+    return _load_table(str(path), path.stat().st_mtime_ns)
+
+
+def attach_population(df: pd.DataFrame, ccode_col: str = "ccode", year_col: str = "event_year") -> pd.DataFrame:
+    """Añade la columna `population` (población del país en el año del evento)."""
+    table = load_table()[["ccode", "year", "population"]]
+    keys = pd.DataFrame({
+        "ccode": pd.to_numeric(df[ccode_col], errors="coerce").astype("Int64"),
+        "year": pd.to_numeric(df[year_col], errors="coerce").astype("Int64"),
+    })
+    table = table.astype({"ccode": "Int64", "year": "Int64"})
+    population = keys.merge(table, on=["ccode", "year"], how="left")["population"]
+    out = df.copy()
+    out["population"] = population.to_numpy()
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera la tabla de población país-año de SCAD.")
+    parser.add_argument("--out", type=Path, default=POPULATION_FILE, help="Ruta del CSV de salida")
+    args = parser.parse_args()
+    table = build_table()
+    table.to_csv(args.out, index=False)
+    print(f"Población: {table['ccode'].nunique()} países, {len(table):,} filas → {args.out}")
+
+
+if __name__ == "__main__":
+    main()
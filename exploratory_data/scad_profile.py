@@ -0,0 +1,61 @@
+"""Perfil de arranque de la app SCAD.
+
+Se activa con la variable de entorno SCAD_PROFILE=1 al lanzar Streamlit:
+    SCAD_PROFILE=1 streamlit run exploratory_data/scad_app.py
+
+Mide el coste de cada import pesado (solo la primera vez en el proceso; después
+el módulo ya está en memoria) y el tiempo acumulado hasta cada hito del render.
+El informe se imprime en el log del servidor y se muestra en el sidebar, también
+en las ejecuciones que terminan antes con st.stop() (sin datos o sin resultados).
+"""
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+ENV_VAR = "SCAD_PROFILE"
+
+
+class StartupProfiler:
+    """Registra pasos cronometrados e hitos acumulados de una ejecución del script."""
+
+    def __init__(self, enabled: bool = None):
+        if enabled is None:
+            enabled = os.environ.get(ENV_VAR, "").strip() not in ("", "0")
+        self.enabled = enabled
+        self.t0 = time.perf_counter()
+        self.steps = []  # (etiqueta, segundos, tipo)
+        self.finished = False
+
+    @contextmanager
+    def step(self, label: str, module: str = None):
+        """Cronometra un bloque; con `module`, indica si ya estaba importado."""
+        if not self.enabled:
+            yield
+            return
+        cached = module is not None and module in sys.modules
+        t = time.perf_counter()
+        try:
+            yield
+        finally:
+            kind = "import (en memoria)" if cached else ("import" if module else "paso")
+            self.steps.append((label, time.perf_counter() - t, kind))
+
+    def mark(self, label: str):
+        """Hito: tiempo transcurrido desde el inicio del script."""
+        if self.enabled:
+            self.steps.append((label, time.perf_counter() - self.t0, "acumulado"))
+
+    def finish(self, label: str):
+        """Último hito de la ejecución; devuelve el informe la primera vez y None después."""
+        if not self.enabled or self.finished:
+            return None
+        self.finished = True
+        self.mark(label)
+        return self.report()
+
+    def report(self) -> str:
+        lines = [f"{'Paso':<42} {'Tipo':<20} {'ms':>9}"]
+        for label, seconds, kind in self.steps:
+            lines.append(f"{label:<42} {kind:<20} {seconds * 1000:>9.1f}")
+        return "\n".join(lines)
@@ -0,0 +1,170 @@
+"""Caché persistente de resultados (agregados filtrados y JSON de figuras) en SQLite.
+
+`st.cache_resource` vive en la memoria de un proceso: cada reinicio del
+servidor o réplica nueva recalcula las mismas vistas filtradas. Esta caché las
+guarda en disco (`artifacts/result_cache.sqlite`, o la ruta de
+`SCAD_RESULT_CACHE`, p. ej. un volumen compartido entre réplicas) para que
+procesos y reinicios reutilicen el trabajo de los demás:
+
+- clave: SHA-256 de (formato, identidad del dataset, página, vista, filtros).
+  La identidad es el SHA-256 del contenido del CSV (`BackgroundLoad.content_id`),
+  sin mtime: un `touch`, una copia idéntica o la misma versión desplegada en
+  otra réplica reutilizan los resultados, y una versión nueva nunca lee los de
+  la anterior (sus entradas dejan de usarse y acaban desalojadas). Tamaño y
+  mtime solo sirven para detectar cambios (recarga en caliente). Los filtros se normalizan con
+  `canonical_spec` (conjuntos ordenados, tuplas como listas, fechas en ISO):
+  el mismo filtro elegido en otro orden da la misma clave.
+- valor: el resultado serializado con pickle (DataFrames) o el JSON de una
+  figura de plotly.
+- desalojo LRU por tamaño: cada lectura actualiza `last_used`; si al escribir
+  se superan `SCAD_RESULT_CACHE_MB` (256 MB por defecto), se borran las
+  entradas usadas hace más tiempo hasta bajar al 90 % del límite.
+
+SQLite en modo WAL admite varios procesos leyendo y escribiendo a la vez. Un
+error de la caché (disco lleno, fichero bloqueado o corrupto) no rompe la
+página: el resultado se calcula como si no estuviera guardado.
+"""
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from datetime import date
+from pathlib import Path
+
+RESULT_CACHE = Path(os.environ.get(
+    "SCAD_RESULT_CACHE", Path(__file__).resolve().parent / "artifacts" / "result_cache.sqlite"))
+MAX_BYTES = int(float(os.environ.get("SCAD_RESULT_CACHE_MB", "256")) * 2**20)
+# Se incrementa cuando cambia el contenido de las vistas o figuras guardadas
+CACHE_FORMAT = 1
+# Fracción del límite que queda ocupada tras un desalojo (evita desalojar en cada escritura)
+EVICT_TO = 0.9
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL
+)
+"""
+
+
+def canonical_spec(spec):
+    """Forma canónica (serializable en JSON) de una especificación de filtros."""
+    if isinstance(spec, dict):
+        return {str(k): canonical_spec(v) for k, v in sorted(spec.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(spec, (set, frozenset)):
+        return sorted((canonical_spec(v) for v in spec), key=str)
+    if isinstance(spec, (list, tuple)):
+        return [canonical_spec(v) for v in spec]
+    if isinstance(spec, date):
+        return spec.isoformat()
+    if hasattr(spec, "item"):  # escalares de numpy
+        return spec.item()
+    return spec
+
+
+def result_key(dataset_id: str, page: str, name: str, spec) -> str:
+    payload = [CACHE_FORMAT, dataset_id, page, name, canonical_spec(spec)]
+    return hashlib.sha256(json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """Tabla SQLite clave → resultado, compartida por los hilos del proceso y por otros procesos."""
+
+    def __init__(self, path: Path = RESULT_CACHE, max_bytes: int = MAX_BYTES):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Autocommit: cada sentencia es su propia transacción y no retiene el bloqueo de escritura
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(_SCHEMA)
+            conn.execute("CREATE INDEX IF NOT EXISTS results_lru ON results (last_used)")
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str, kind: str):
+        """Valor guardado (bytes) o None; un acierto lo marca como usado ahora."""
+        try:
+            with self._lock:
+                conn = self._connect()
+                row = conn.execute("SELECT value FROM results WHERE key = ? AND kind = ?", (key, kind)).fetchone()
+                if row is not None:
+                    conn.execute("UPDATE results SET last_used = ? WHERE key = ?", (time.time(), key))
+        except (OSError, sqlite3.Error):
+            return None
+        return None if row is None else row[0]
+
+    def put(self, key: str, kind: str, value: bytes):
+        if len(value) > self.max_bytes * (1 - EVICT_TO):
+            return  # un resultado mayor que el margen de desalojo vaciaría casi toda la caché
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                             (key, kind, value, len(value), now, now))
+                self._evict(conn)
+        except (OSError, sqlite3.Error):
+            pass
+
+    def _evict(self, conn: sqlite3.Connection):
+        """Desalojo LRU: borra las entradas menos usadas hasta bajar al `EVICT_TO` del límite."""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        excess = total - int(self.max_bytes * EVICT_TO)
+        conn.execute("""
+            DELETE FROM results WHERE key IN (
+                SELECT key FROM (
+                    SELECT key, size, SUM(size) OVER (ORDER BY last_used, key) AS freed FROM results
+                ) WHERE freed - size < ?
+            )""", (excess,))
+
+    def stats(self) -> dict:
+        """Entradas y bytes ocupados."""
+        try:
+            with self._lock:
+                entries, size = self._connect().execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+        except (OSError, sqlite3.Error):
+            return {"entries": 0, "bytes": 0}
+        return {"entries": entries, "bytes": size}
+
+    def cached(self, key: str, compute):
+        """Resultado de `compute()` guardado con pickle bajo `key`."""
+        blob = self.get(key, "pickle")
+        if blob is not None:
+            try:
+                return pickle.loads(blob)
+            except Exception:  # p. ej. escrito por otra versión de pandas: se recalcula
+                pass
+        value = compute()
+        self.put(key, "pickle", pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        return value
+
+    def cached_figure(self, key: str, build):
+        """Figura de plotly de `build()` guardada como JSON bajo `key`."""
+        import plotly.io as pio
+
+        blob = self.get(key, "figure")
+        if blob is not None:
+            try:
+                return pio.from_json(blob.decode("utf-8"))
+            except ValueError:
+                pass
+        fig = build()
+        self.put(key, "figure", fig.to_json().encode("utf-8"))
+        return fig
@@ -0,0 +1,156 @@
+"""Rollups temporales precalculados (día, semana, mes, año).
+
+Los eventos y las muertes se agregan una vez por día y por grupo
+(región × país × tipo de evento); los niveles semanal, mensual y anual se
+derivan de los diarios. Cada nivel se guarda como arrays compactos
+(grupo, periodo, año, eventos, muertes), de modo que las tendencias de la app
+solo filtran grupos y suman con `np.bincount`, sin reagrupar las filas.
+
+El año es el año natural de los días agregados, no el del inicio del periodo:
+una semana que cruza el cambio de año (lunes 2008-12-29) se guarda en dos filas
+con el mismo periodo, una para 2008 y otra para 2009. Así el slider de años
+recorta la semana por fechas y los eventos del 1–4 de enero de 2009 cuentan
+cuando el rango empieza en 2009.
+"""
+import numpy as np
+import pandas as pd
+
+ROLLUPS_FILE = "time_rollups.pkl"
+
+# Etiqueta en la app → nivel del rollup
+RESOLUTIONS = {"Año": "year", "Mes": "month", "Semana": "week", "Día": "day"}
+
+GROUP_COLS = ["region", "country_display", "event_type_display"]
+
+
+def _period_start(days: np.ndarray, level: str) -> np.ndarray:
+    """Días desde 1970-01-01 → primer día del periodo (semanas ISO, empiezan en lunes)."""
+    if level == "day":
+        return days
+    if level == "week":
+        return days - (days + 3) % 7  # 1970-01-01 fue jueves
+    unit = {"month": "M", "year": "Y"}[level]
+    return days.astype("datetime64[D]").astype(f"datetime64[{unit}]").astype("datetime64[D]").astype(np.int64)
+
+
+def _year(days: np.ndarray) -> np.ndarray:
+    return days.astype("datetime64[D]").astype("datetime64[Y]").astype(np.int64) + 1970
+
+
+def _aggregate(group, period, year, events, deaths) -> dict:
+    """Suma eventos y muertes por (grupo, periodo, año natural)."""
+    keys = np.stack([group, period, year])
+    uniq, inverse = np.unique(keys, axis=1, return_inverse=True)
+    inverse = inverse.ravel()
+    return {
+        "group": uniq[0].astype(np.int32),
+        "period": uniq[1].astype(np.int64),
+        "year": uniq[2],
+        "events": np.bincount(inverse, weights=events, minlength=uniq.shape[1]).astype(np.int32),
+        "deaths": np.bincount(inverse, weights=deaths, minlength=uniq.shape[1]),
+    }
+
+
+class TimeRollups:
+    """Conteos de eventos y suma de muertes por grupo y periodo, en cuatro resoluciones."""
+
+    def __init__(self, groups: pd.DataFrame, levels: dict):
+        self.groups = groups  # una fila por grupo; la posición es el id de grupo
+        self.levels = levels  # nivel → dict de arrays group/period/year/events/deaths
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, death_col: str = "ndeath"):
+        """Construye los rollups a partir de un DataFrame con columnas `*_display`."""
+        cols = [c for c in GROUP_COLS if c in df.columns]
+        start = pd.to_datetime(df["startdate"], errors="coerce")
+        valid = start.notna().to_numpy()
+        days = start.values.astype("datetime64[D]").astype(np.int64)[valid]
+        deaths = (
+            pd.to_numeric(df[death_col], errors="coerce").fillna(0).to_numpy(dtype=float)[valid]
+            if death_col in df.columns else np.zeros(valid.sum())
+        )
+
+        if cols:
+            keys = df.loc[valid, cols]
+            group = keys.groupby(cols, dropna=False, sort=True, observed=True).ngroup().to_numpy()
+            # Tabla de grupos ordenada por id (posición = id de grupo)
+            groups = (
+                keys.assign(_g=group).drop_duplicates("_g").sort_values("_g")
+                .drop(columns="_g").reset_index(drop=True)
+            )
+        else:
+            group = np.zeros(len(days), dtype=np.int64)
+            groups = pd.DataFrame(index=[0])
+
+        levels = {"day": _aggregate(group, days, _year(days), np.ones(len(days)), deaths)}
+        daily = levels["day"]
+        for level in ["week", "month", "year"]:
+            # El año natural de cada día sigue en la clave: una semana entre dos años queda partida
+            levels[level] = _aggregate(
+                daily["group"], _period_start(daily["period"], level), daily["year"], daily["events"], daily["deaths"]
+            )
+        return cls(groups, levels)
+
+    def group_mask(self, regions=None, countries=None, event_types=None) -> np.ndarray:
+        """Grupos que pasan los filtros de dimensión (listas vacías o None = sin filtro)."""
+        mask = np.ones(len(self.groups), dtype=bool)
+        for col, values in [("region", regions), ("country_display", countries), ("event_type_display", event_types)]:
+            if values and col in self.groups.columns:
+                mask &= self.groups[col].isin(values).to_numpy()
+        return mask
+
+    @staticmethod
+    def _keep(arrays: dict, group_mask: np.ndarray = None, years=None) -> np.ndarray:
+        keep = np.ones(len(arrays["period"]), dtype=bool)
+        if group_mask is not None:
+            keep &= group_mask[arrays["group"]]
+        if years is not None:
+            keep &= (arrays["year"] >= years[0]) & (arrays["year"] <= years[1])
+        return keep
+
+    def series(self, level: str, group_mask: np.ndarray = None, years=None) -> pd.DataFrame:
+        """Serie (period, Eventos, Muertes) del nivel pedido para los grupos seleccionados."""
+        arrays = self.levels[level]
+        keep = self._keep(arrays, group_mask, years)
+        period = arrays["period"][keep]
+        if period.size == 0:
+            return pd.DataFrame({"period": pd.Series(dtype="datetime64[ns]"), "Eventos": [], "Muertes": []})
+        uniq, inverse = np.unique(period, return_inverse=True)
+        return pd.DataFrame({
+            "period": uniq.astype("datetime64[D]").astype("datetime64[ns]"),
+            "Eventos": np.bincount(inverse, weights=arrays["events"][keep], minlength=len(uniq)).astype(int),
+            "Muertes": np.bincount(inverse, weights=arrays["deaths"][keep], minlength=len(uniq)),
+        })
+
+    def batch(self, level: str, selections, by: str = "period") -> pd.DataFrame:
+        """Eventos y muertes de varias selecciones en una sola agregación.
+
+        `selections` es una lista de (group_mask, years). Las filas del nivel que
+        entran en cada selección se apilan con su número de selección y se suman
+        juntas con un único `np.bincount` sobre la clave (selección, `by`), donde
+        `by` es "period" o una columna de la tabla de grupos (p. ej. país).
+        Devuelve (selection, <by>, Eventos, Muertes); una fila puede contar en
+        varias selecciones si se solapan.
+        """
+        arrays = self.levels[level]
+        rows = [np.flatnonzero(self._keep(arrays, mask, years)) for mask, years in selections]
+        pos = np.concatenate(rows) if rows else np.array([], dtype=np.int64)
+        sel = np.repeat(np.arange(len(rows)), [r.size for r in rows])
+        if by == "period":
+            key = arrays["period"][pos]
+        else:
+            codes, labels = pd.factorize(self.groups[by], use_na_sentinel=False)
+            key = codes[arrays["group"][pos]]
+        if pos.size == 0:
+            out = pd.DataFrame({"selection": pd.Series(dtype=int), by: [], "Eventos": pd.Series(dtype=int), "Muertes": []})
+            return out.astype({"period": "datetime64[ns]"}) if by == "period" else out
+        uniq, inverse = np.unique(np.stack([sel, key]), axis=1, return_inverse=True)
+        inverse = inverse.ravel()
+        values = (uniq[1].astype("datetime64[D]").astype("datetime64[ns]") if by == "period"
+                  else np.asarray(labels, dtype=object)[uniq[1]])
+        return pd.DataFrame({
+            "selection": uniq[0],
+            by: values,
+            "Eventos": np.bincount(inverse, weights=arrays["events"][pos], minlength=uniq.shape[1]).astype(int),
+            "Muertes": np.bincount(inverse, weights=arrays["deaths"][pos], minlength=uniq.shape[1]),
+        })
@@ -0,0 +1,119 @@
+"""Manifiesto de esquema versionado de un dataset SCAD: roles de columna, dtypes y features.
+
+La app volvía a detectar sus columnas en cada página (país, tipo de evento,
+subtipo, admin1, fuente, actor, población) y adivinaba la columna del año por
+subcadena al cargar. Ahora el ETL escribe, junto a cada CSV que produce, un
+manifiesto (`artifacts/<stem del csv>.schema.json`) con:
+
+- `roles`: la columna que cumple cada rol canónico (None si no hay);
+- `display`: renombrados que se aplican al cargar (`country_display`, `event_type_display`);
+- `columns`: dtype de cada columna;
+- `features`: columnas derivadas disponibles (no están en los ficheros originales de SCAD).
+
+La app resuelve los roles una sola vez, al cargar el dataset, y el DataFrame
+cargado ya lleva los nombres canónicos (`year`, `country_display`,
+`event_type_display`). El manifiesto se guarda con los helpers de artefactos
+compartidos de scad_loader.py; si falta o está desfasado, `schema_from_frame`
+deduce la misma información del propio DataFrame.
+"""
+from pathlib import Path
+
+import pandas as pd
+
+import scad_loader
+
+SCHEMA_FILE = "schema.json"
+SCHEMA_VERSION = 1
+
+# Columnas candidatas por rol, en orden de prioridad; primero los nombres canónicos (ya cargados)
+ROLE_CANDIDATES = {
+    "country": ["country_display", "countryname", "country", "country_name"],
+    "event_type": ["event_type_display", "event_type_label", "event_type", "type"],
+    "subtype": ["sub_event_type", "sub_event_type_label", "subtype"],
+    "admin1": ["admin1", "adm1", "admin_1"],
+    "source": ["source", "sources"],
+    "actor": ["actors", "actor1", "actor", "parties"],
+    "population": ["population"],
+    "region": ["region"],
+    "deaths": ["ndeath", "fatalities"],
+    "ccode": ["ccode"],
+    "start_date": ["startdate"],
+    "end_date": ["enddate"],
+}
+
+# Rol → nombre de la columna en el DataFrame cargado
+CANONICAL_NAMES = {
+    "country": "country_display",
+    "event_type": "event_type_display",
+    "year": "year",
+    "deaths": "ndeath",
+}
+DISPLAY_ROLES = ["country", "event_type"]
+
+
+def _year_column(columns):
+    """`year` si existe; si no, la primera columna cuyo nombre menciona el año."""
+    if "year" in columns:
+        return "year"
+    return next((c for c in columns if "year" in c.lower() or "año" in c.lower()), None)
+
+
+def resolve_roles(columns) -> dict:
+    columns = list(columns)
+    roles = {role: next((c for c in candidates if c in columns), None) for role, candidates in ROLE_CANDIDATES.items()}
+    roles["year"] = _year_column(columns)
+    return roles
+
+
+def build_schema(dtypes: dict) -> dict:
+    """Manifiesto de un dataset con columnas `dtypes` (columna → nombre del dtype, en el orden de las columnas)."""
+    import scad_ingest
+
+    columns = list(dtypes)
+    roles = resolve_roles(columns)
+    display = {roles[r]: CANONICAL_NAMES[r] for r in DISPLAY_ROLES if roles[r] and roles[r] != CANONICAL_NAMES[r]}
+    return {
+        "version": SCHEMA_VERSION,
+        "roles": roles,
+        "display": display,
+        "columns": {c: str(t) for c, t in dtypes.items()},
+        "features": [c for c in columns if c not in scad_ingest.RAW_COLUMNS],
+    }
+
+
+def schema_from_frame(df: pd.DataFrame) -> dict:
+    return build_schema(df.dtypes.astype(str).to_dict())
+
+
+def schema_from_profile(profile: dict) -> dict:
+    """Manifiesto a partir de un perfil de columnas (scad_column_profile.py), p. ej. en el ETL en streaming."""
+    return build_schema({c: p["dtype"] for c, p in profile["columns"].items()})
+
+
+def loaded_roles(schema: dict) -> dict:
+    """Roles tras `apply_schema`: los roles renombrados apuntan a sus nombres canónicos."""
+    return {role: (CANONICAL_NAMES.get(role, col) if col else None) for role, col in schema["roles"].items()}
+
+
+def apply_schema(df: pd.DataFrame, schema: dict) -> pd.DataFrame:
+    """Renombra el año y las columnas de visualización a sus nombres canónicos (un solo rename, al cargar)."""
+    rename = dict(schema["display"])
+    year_col = schema["roles"].get("year")
+    if year_col and year_col != "year":
+        rename[year_col] = "year"
+    rename = {src: dst for src, dst in rename.items() if src in df.columns and dst not in df.columns}
+    return df.rename(columns=rename) if rename else df
+
+
+# -----------------------------
+# Persistencia
+# -----------------------------
+
+def save_schema(schema: dict, csv_path) -> Path:
+    """Escribe el manifiesto de `csv_path` (llamar después de escribir el CSV)."""
+    return scad_loader.save_json_artifact(schema, csv_path, SCHEMA_FILE, indent=1)
+
+
+def load_schema(csv_path):
+    """Manifiesto de `csv_path` si está al día; si no, None."""
+    return scad_loader.load_json_artifact(csv_path, SCHEMA_FILE, SCHEMA_VERSION)
@@ -0,0 +1,211 @@
+"""Búsqueda de texto completo en los campos libres de SCAD (`issuenote`, `notes`) con ranking BM25.
+
+La información más rica de SCAD está en `issuenote` ("Citizens demonstrated
+against U.S. plans...") y `notes`, pero recorrer todas las notas con
+`str.contains` en cada consulta es lento y no permite ordenar por relevancia.
+En su lugar, el ETL construye una sola vez un índice invertido junto a cada
+CSV que escribe:
+
+- un documento por fila (su posición en el CSV, es decir, en el DataFrame
+  cargado), con el texto de `TEXT_FIELDS` unido;
+- tokens: sin acentos, en minúsculas, con las abreviaturas con puntos unidas
+  ("U.S." → "us"), secuencias alfanuméricas de dos o más caracteres, menos una
+  lista corta de palabras vacías (y el marcador "Missing" con el que el ETL
+  rellena las notas vacías);
+- postings en formato CSR: para el término t, `docs[ptr[t]:ptr[t + 1]]` y sus
+  frecuencias, más la longitud de cada documento.
+
+`SearchIndex.search` busca los términos de la consulta con una búsqueda binaria
+sobre el vocabulario ordenado y puntúa solo sus postings (Okapi BM25,
+k1 = 1.2, b = 0.75), así que una consulta cuesta milisegundos sea cual sea el
+número de notas. `SearchIndexBuilder` se puede alimentar lote a lote (ETL en
+streaming).
+
+El índice se guarda como `artifacts/<stem del csv>.search.npz` con los helpers
+de artefactos compartidos de scad_loader.py.
+"""
+from functools import reduce
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import scad_loader
+
+SEARCH_FILE = "search.npz"
+SEARCH_VERSION = 1
+
+TEXT_FIELDS = ["issuenote", "notes"]
+
+TOKEN_RE = r"[a-z0-9]+"
+STOPWORDS = {
+    "a", "about", "after", "against", "al", "an", "and", "are", "as", "at", "be", "been", "but", "by",
+    "de", "del", "did", "for", "from", "had", "has", "have", "he", "her", "his", "in", "into", "is", "it",
+    "its", "la", "las", "los", "missing", "nan", "no", "not", "of", "on", "or", "over", "she", "that",
+    "the", "their", "them", "there", "they", "this", "to", "was", "were", "which", "who", "with", "y",
+}
+
+K1 = 1.2
+B = 0.75
+
+
+def tokenize(text: pd.Series) -> pd.Series:
+    """Tokens de cada documento, en formato largo: índice = documento, valor = token."""
+    norm = (text.fillna("").astype(str).str.normalize("NFKD")
+            .str.encode("ascii", "ignore").str.decode("ascii").str.lower()
+            # Las abreviaturas con puntos son un solo token: "U.S." → "us", "U.N." → "un"
+            .str.replace(r"\b([a-z])\.([a-z])\.", r"\1\2", regex=True))
+    tokens = norm.str.findall(TOKEN_RE).explode().dropna()
+    return tokens[(tokens.str.len() > 1) & ~tokens.isin(STOPWORDS)]
+
+
+def document_text(df: pd.DataFrame, fields=TEXT_FIELDS) -> pd.Series:
+    """Texto de cada fila: los `fields` disponibles unidos por un espacio."""
+    cols = [df[c].astype("string").fillna("") for c in fields if c in df.columns]
+    if not cols:
+        return pd.Series("", index=df.index)
+    return reduce(lambda a, b: a + " " + b, cols)
+
+
+class SearchIndexBuilder:
+    """Acumula postings (documento, término, frecuencia) sobre uno o varios lotes de DataFrame.
+
+    Cada lote se guarda compacto (su propio vocabulario más arrays de enteros).
+    Con `spill_dir` se escribe en disco, así que mientras corre el ETL en
+    streaming solo se tiene en memoria el lote actual, por mucho texto de notas
+    que haya visto; `result` une los lotes al final, cuando solo el índice
+    final está en memoria.
+    """
+
+    def __init__(self, fields=TEXT_FIELDS, spill_dir=None):
+        self.fields = fields
+        self.spill_dir = None if spill_dir is None else Path(spill_dir)
+        self.parts = []  # dicts de arrays, o rutas .npz con `spill_dir`
+        self.n_docs = 0
+
+    def update(self, df: pd.DataFrame):
+        tokens = tokenize(document_text(df, self.fields).reset_index(drop=True))
+        terms, term = np.unique(tokens.to_numpy(dtype=str), return_inverse=True)
+        width = max(len(terms), 1)
+        pairs, tf = np.unique(tokens.index.to_numpy(dtype=np.int64) * width + term.ravel(), return_counts=True)
+        part = {
+            "terms": terms,
+            "term": (pairs % width).astype(np.int32),
+            "doc": (pairs // width + self.n_docs).astype(np.int32),
+            "tf": tf.astype(np.int32),
+            "doc_len": np.bincount(tokens.index.to_numpy(dtype=np.int64), minlength=len(df)).astype(np.int32),
+        }
+        if self.spill_dir is not None:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+            path = self.spill_dir / f"search-{len(self.parts):05d}.npz"
+            np.savez(path, **part)
+            part = path
+        self.parts.append(part)
+        self.n_docs += len(df)
+
+    def _load_parts(self):
+        for part in self.parts:
+            if isinstance(part, Path):
+                with np.load(part) as z:
+                    part = {k: z[k] for k in z.files}
+            yield part
+
+    def result(self) -> "SearchIndex":
+        vocabularies = [p["terms"] for p in self._load_parts()]
+        terms = np.unique(np.concatenate(vocabularies)) if vocabularies else np.array([], dtype=str)
+        term_id, docs, tf, lengths = [], [], [], []
+        for p in self._load_parts():
+            term_id.append(np.searchsorted(terms, p["terms"])[p["term"]])
+            docs.append(p["doc"])
+            tf.append(p["tf"])
+            lengths.append(p["doc_len"])
+        for part in self.parts:
+            if isinstance(part, Path):
+                part.unlink(missing_ok=True)
+        empty = np.array([], dtype=np.int32)
+        term_id = np.concatenate(term_id) if term_id else empty
+        docs = np.concatenate(docs) if docs else empty
+        order = np.lexsort((docs, term_id))
+        ptr = np.zeros(len(terms) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(term_id, minlength=len(terms)), out=ptr[1:])
+        return SearchIndex(
+            terms.astype(str), ptr,
+            docs=docs[order],
+            tf=(np.concatenate(tf) if tf else empty)[order],
+            doc_len=np.concatenate(lengths) if lengths else empty,
+        )
+
+
+class SearchIndex:
+    """Índice invertido en formato CSR: término t → documentos `docs[ptr[t]:ptr[t + 1]]` con frecuencias `tf`."""
+
+    def __init__(self, terms, ptr, docs, tf, doc_len):
+        self.terms = terms      # vocabulario ordenado; posición = id de término
+        self.ptr = ptr
+        self.docs = docs
+        self.tf = tf
+        self.doc_len = doc_len  # tokens por documento (fila)
+
+    @property
+    def n_docs(self) -> int:
+        return len(self.doc_len)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, fields=TEXT_FIELDS):
+        builder = SearchIndexBuilder(fields)
+        builder.update(df)
+        return builder.result()
+
+    def _term_ids(self, query: str) -> np.ndarray:
+        tokens = pd.unique(tokenize(pd.Series([query])).to_numpy(dtype=str))
+        ids = np.searchsorted(self.terms, tokens)
+        found = ids < len(self.terms)
+        found[found] = self.terms[ids[found]] == tokens[found]
+        return ids[found]
+
+    def scores(self, query: str) -> np.ndarray:
+        """Puntuación BM25 de cada documento para `query` (0 si no aparece ningún término de la consulta)."""
+        out = np.zeros(self.n_docs)
+        ids = self._term_ids(query)
+        if not len(ids) or not self.n_docs:
+            return out
+        avg_len = max(self.doc_len.mean(), 1e-9)
+        for t in ids:
+            docs, tf = self.docs[self.ptr[t]:self.ptr[t + 1]], self.tf[self.ptr[t]:self.ptr[t + 1]]
+            idf = np.log(1 + (self.n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+            norm = K1 * (1 - B + B * self.doc_len[docs] / avg_len)
+            out[docs] += idf * tf * (K1 + 1) / (tf + norm)
+        return out
+
+    def search(self, query: str, mask: np.ndarray = None, k: int = None) -> pd.DataFrame:
+        """Documentos que coinciden (position, score), los mejores primero; `mask` restringe a algunas filas."""
+        scores = self.scores(query)
+        if mask is not None:
+            scores = np.where(mask, scores, 0)
+        hits = np.flatnonzero(scores > 0)
+        hits = hits[np.argsort(-scores[hits], kind="stable")]
+        if k is not None:
+            hits = hits[:k]
+        return pd.DataFrame({"position": hits, "score": scores[hits]})
+
+    def to_arrays(self) -> dict:
+        return {"terms": self.terms, "ptr": self.ptr, "docs": self.docs, "tf": self.tf, "doc_len": self.doc_len}
+
+    @classmethod
+    def from_arrays(cls, z: dict):
+        return cls(z["terms"], z["ptr"], z["docs"], z["tf"], z["doc_len"])
+
+
+# -----------------------------
+# Persistencia
+# -----------------------------
+
+def save_search_index(index: SearchIndex, csv_path) -> Path:
+    """Escribe el índice de `csv_path` (llamar después de escribir el CSV)."""
+    return scad_loader.save_npz_artifact(index.to_arrays(), csv_path, SEARCH_FILE, SEARCH_VERSION)
+
+
+def load_search_index(csv_path):
+    """Índice de `csv_path` si está al día; si no, None."""
+    arrays = scad_loader.load_npz_artifact(csv_path, SEARCH_FILE, SEARCH_VERSION)
+    return None if arrays is None else SearchIndex.from_arrays(arrays)
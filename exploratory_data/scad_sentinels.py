@@ -0,0 +1,101 @@
+"""Decodificación de los códigos centinela de SCAD a partir de un esquema.
+
+SCAD codifica los números desconocidos o imprecisos con centinelas negativos en
+lugar de dejar la celda vacía. Su significado depende de la columna (codebook
+de SCAD):
+
+    ndeath  -99 = desconocido, -88 = desconocido pero probablemente pequeño
+            (menos de 10), -77 = desconocido pero probablemente grande (10 o más)
+    npart   -99 = desconocido
+    locnum  -99 = ubicación desconocida (igual en gislocnum)
+
+`SENTINEL_SCHEMA` declara esos códigos por columna, así que solo se decodifican
+las columnas listadas (un `replace(-99, NA)` sobre todo el DataFrame tocaría
+también valores reales, p. ej. una longitud de -99.0). Cada columna se
+decodifica en una sola pasada vectorizada a un dtype nullable, y el motivo por
+el que falta se guarda como un código int8 compacto en `<col>_missing_reason`
+(ver `MISSING_REASONS`), de modo que "-88" y "-77" siguen distinguiéndose de
+"-99" tras la decodificación.
+
+Las columnas de texto usan `TEXT_SENTINELS` ("missing" tras pasar a
+minúsculas); se decodifican sobre las categorías de la columna
+(exploring_clean_data.py).
+"""
+import numpy as np
+import pandas as pd
+
+# Códigos compactos del motivo de ausencia (int8)
+OBSERVED = 0
+UNKNOWN = 1
+UNKNOWN_SMALL = 2
+UNKNOWN_LARGE = 3
+NOT_RECORDED = 4
+
+MISSING_REASONS = {
+    OBSERVED: "observed",
+    UNKNOWN: "unknown",
+    UNKNOWN_SMALL: "unknown, probably small (<10)",
+    UNKNOWN_LARGE: "unknown, probably large (10+)",
+    NOT_RECORDED: "blank in the source",
+}
+
+# Columna → (dtype nullable, {centinela: código de motivo})
+SENTINEL_SCHEMA = {
+    "ndeath": ("Int64", {-99: UNKNOWN, -88: UNKNOWN_SMALL, -77: UNKNOWN_LARGE}),
+    "npart": ("Int64", {-99: UNKNOWN}),
+    "locnum": ("Int64", {-99: UNKNOWN}),
+    "gislocnum": ("Int64", {-99: UNKNOWN}),
+}
+
+TEXT_SENTINELS = ("missing",)
+
+REASON_SUFFIX = "_missing_reason"
+
+
+def reason_column(col: str) -> str:
+    return f"{col}{REASON_SUFFIX}"
+
+
+def decode_column(s: pd.Series, col: str = None, schema: dict = None):
+    """Decodifica una columna → (valores con NA en cada centinela, códigos de motivo int8)."""
+    dtype, codes = (schema or SENTINEL_SCHEMA)[col or s.name]
+    values = pd.to_numeric(s, errors="coerce")
+    raw = values.to_numpy(dtype="float64", na_value=np.nan)
+    reason = np.select(
+        [raw == code for code in codes] + [np.isnan(raw)],
+        list(codes.values()) + [NOT_RECORDED],
+        default=OBSERVED,
+    ).astype(np.int8)
+    decoded = values.mask(reason != OBSERVED).astype(dtype)
+    return decoded, pd.Series(reason, index=s.index, name=reason_column(s.name))
+
+
+def decode_sentinels(df: pd.DataFrame, schema: dict = None, reasons: bool = True) -> pd.DataFrame:
+    """Decodifica en el sitio las columnas del esquema de `df` y añade sus códigos `<col>_missing_reason`.
+
+    Volver a decodificar un DataFrame ya decodificado (y quizá imputado)
+    conserva los códigos existentes: una pasada posterior solo los sustituye
+    donde encuentra un centinela, así que el significado del codebook sobrevive
+    a la imputación y a las ejecuciones repetidas.
+    """
+    schema = schema or SENTINEL_SCHEMA
+    for col in schema:
+        if col not in df.columns:
+            continue
+        decoded, reason = decode_column(df[col], col, schema)
+        df[col] = decoded
+        if not reasons:
+            continue
+        rcol = reason_column(col)
+        if rcol in df.columns:
+            previous = pd.to_numeric(df[rcol], errors="coerce").fillna(OBSERVED).astype(np.int8)
+            found = reason.isin([UNKNOWN, UNKNOWN_SMALL, UNKNOWN_LARGE])
+            reason = reason.where(found | (previous == OBSERVED), previous)
+        df[rcol] = reason
+    return df
+
+
+def reason_columns(columns, schema: dict = None) -> list[str]:
+    """Columnas de motivo que `decode_sentinels` añade para `columns`, en el orden en que las añade."""
+    schema = schema or SENTINEL_SCHEMA
+    return [reason_column(c) for c in schema if c in columns]
@@ -0,0 +1,115 @@
+"""Detección de picos anómalos en las series mensuales de cada país.
+
+La página de Conclusiones describe a mano picos como Costa de Marfil 2010 o
+Togo 2012. El warm-up (la etapa batch que se repite con cada actualización del
+dataset) los detecta aquí para todos los países a la vez: a partir del nivel
+mensual de los rollups (scad_rollups.py) monta una matriz países × meses de
+eventos y otra de muertes, y puntúa cada mes con un z-score robusto frente a
+una línea base móvil, la mediana y la MAD de los `BASELINE_MONTHS` meses
+anteriores (sin incluir el propio mes):
+
+    z = (valor - mediana) / max(1.4826 · MAD, √mediana, MIN_SCALE)
+
+(√mediana es el suelo de Poisson: en series de conteos con poca variación la
+MAD sola subestima la dispersión esperable.)
+
+La ventana móvil se calcula con `sliding_window_view` sobre la matriz entera,
+sin bucles por país. Un mes es pico si z ≥ `Z_THRESHOLD` y supera un mínimo
+absoluto (`MIN_VALUE`), para que 3 eventos en un país casi sin actividad no
+cuenten como pico. Los primeros `BASELINE_MONTHS` meses no se puntúan (no hay
+línea base). El resultado es una tabla pequeña (`spikes.pkl`) que Estadísticas
+superpone a las tendencias y lista.
+"""
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+SPIKES_FILE = "spikes.pkl"
+
+BASELINE_MONTHS = 12
+Z_THRESHOLD = 3.5
+# Escala mínima del z-score: en series casi planas la MAD es 0
+MIN_SCALE = 1.0
+# Valor mínimo del mes para marcarlo como pico
+MIN_VALUE = {"Eventos": 5, "Muertes": 25}
+
+METRICS = {"Eventos": "events", "Muertes": "deaths"}
+
+
+def monthly_matrix(rollups, metric: str = "Eventos"):
+    """Series mensuales por país → (países, primer mes, matriz países × meses)."""
+    arrays = rollups.levels["month"]
+    codes, countries = pd.factorize(rollups.groups["country_display"])
+    month = arrays["period"].astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+    valid = codes[arrays["group"]] >= 0
+    if not valid.any():
+        return countries, None, np.zeros((len(countries), 0))
+    first, last = month[valid].min(), month[valid].max()
+    matrix = np.zeros((len(countries), last - first + 1))
+    np.add.at(matrix, (codes[arrays["group"]][valid], month[valid] - first), arrays[METRICS[metric]][valid])
+    return countries, first, matrix
+
+
+def robust_z(matrix: np.ndarray, window: int = BASELINE_MONTHS):
+    """z-score robusto de cada mes frente a los `window` meses anteriores → (z, mediana).
+
+    Los primeros `window` meses quedan en NaN.
+    """
+    n_rows, n_months = matrix.shape
+    z = np.full((n_rows, n_months), np.nan)
+    baseline = np.full((n_rows, n_months), np.nan)
+    if n_months <= window:
+        return z, baseline
+    # windows[:, t] = meses [t, t + window) → línea base del mes t + window
+    windows = sliding_window_view(matrix, window, axis=1)[:, :n_months - window]
+    median = np.median(windows, axis=2)
+    mad = np.median(np.abs(windows - median[:, :, None]), axis=2)
+    scale = np.maximum(np.maximum(1.4826 * mad, np.sqrt(median)), MIN_SCALE)
+    z[:, window:] = (matrix[:, window:] - median) / scale
+    baseline[:, window:] = median
+    return z, baseline
+
+
+def detect_spikes(rollups, z_threshold: float = Z_THRESHOLD) -> pd.DataFrame:
+    """Picos de eventos y de muertes de todos los países.
+
+    Columnas: country_display, period (primer día del mes), year, metric,
+    value, baseline (mediana de la ventana) y z; ordenada por z descendente.
+    """
+    tables = []
+    for metric in METRICS:
+        countries, first, matrix = monthly_matrix(rollups, metric)
+        if first is None:
+            continue
+        z, baseline = robust_z(matrix)
+        rows, cols = np.nonzero((z >= z_threshold) & (matrix >= MIN_VALUE[metric]))
+        period = (first + cols).astype("datetime64[M]").astype("datetime64[ns]")
+        tables.append(pd.DataFrame({
+            "country_display": np.asarray(countries)[rows],
+            "period": period,
+            "year": pd.DatetimeIndex(period).year,
+            "metric": metric,
+            "value": matrix[rows, cols],
+            "baseline": baseline[rows, cols],
+            "z": z[rows, cols].round(2),
+        }))
+    if not tables:
+        return pd.DataFrame(columns=["country_display", "period", "year", "metric", "value", "baseline", "z"])
+    return pd.concat(tables, ignore_index=True).sort_values("z", ascending=False, ignore_index=True)
+
+
+def spikes_on_trend(spikes: pd.DataFrame, trend: pd.DataFrame, x_col: str, y_col: str) -> pd.DataFrame:
+    """Sitúa cada pico sobre una serie de tendencia (`x_col` = "year" o "period").
+
+    Cada pico toma la x del periodo de la serie que contiene su mes y la y de la
+    serie en ese periodo; los picos fuera de la serie se descartan.
+    """
+    if spikes.empty or trend.empty:
+        return spikes.assign(x=pd.Series(dtype=object), y=pd.Series(dtype=float)).iloc[0:0]
+    series = trend[[x_col, y_col]].rename(columns={x_col: "x", y_col: "y"})
+    if x_col == "year":
+        placed = spikes.merge(series, left_on="year", right_on="x", how="inner")
+    else:
+        placed = pd.merge_asof(spikes.sort_values("period"), series.sort_values("x"),
+                               left_on="period", right_on="x", direction="backward").dropna(subset=["x"])
+    return placed
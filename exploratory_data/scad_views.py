@@ -0,0 +1,172 @@
+"""Vistas agregadas de las páginas de la app con los filtros por defecto.
+
+El warm-up (scad_warmup.py) las precalcula para todas las regiones y el rango
+completo de años, y la app las reutiliza mientras el usuario no cambie esos
+filtros. Las páginas usan estas mismas funciones para calcular cualquier otra
+combinación, de modo que ambas rutas producen exactamente las mismas tablas.
+"""
+import pandas as pd
+
+import scad_schema
+
+AMERICAS_REGIONS = ["latinamerica", "latin america", "americas"]
+
+RELIGION_KEYWORDS = [
+    "religio", "ethnic", "étnico", "identidad", "discriminación", "discrimination",
+    "muslim", "cristian", "christian", "islam", "hindu", "jew", "judío"
+]
+
+
+def display_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Frame con `country_display` / `event_type_display`.
+
+    El dataset cargado por la app ya trae esos nombres (scad_schema.apply_schema)
+    y se devuelve tal cual, sin copia; solo se renombran frames leídos por otra vía.
+    """
+    display = scad_schema.schema_from_frame(df)["display"] if "country_display" not in df.columns else {}
+    return df.rename(columns=display) if display else df
+
+
+def default_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Aplica los filtros por defecto de las páginas: todas las regiones y todos los años."""
+    min_year, max_year = int(df["year"].min()), int(df["year"].max())
+    if "region" in df.columns:
+        df = df[df["region"].notna()]
+    return df[(df["year"] >= min_year) & (df["year"] <= max_year)]
+
+
+def split_regions(fdf: pd.DataFrame, region_col: str = "region"):
+    """Separa las filas de África y de América (el resto de regiones se ignora)."""
+    region = fdf[region_col].str.lower()
+    return fdf[region == "africa"], fdf[region.isin(AMERICAS_REGIONS)]
+
+
+def country_totals(fdf: pd.DataFrame, value_col: str = None) -> pd.DataFrame:
+    """Eventos por país (o suma de `value_col`) con columnas `country_display`, `value`."""
+    if value_col is None:
+        return fdf.groupby("country_display", observed=True).size().reset_index(name="value")
+    return fdf.groupby("country_display", observed=True)[value_col].sum().reset_index(name="value")
+
+
+def religion_mask(df: pd.DataFrame) -> pd.Series:
+    """Eventos con temas religiosos/étnicos según palabras clave en issue1_label / issue_main."""
+    regex = "|".join(RELIGION_KEYWORDS)
+    mask = pd.Series(False, index=df.index)
+    for col in ["issue1_label", "issue_main"]:
+        if col in df.columns:
+            mask = mask | df[col].astype(str).str.contains(regex, case=False, na=False)
+    return mask
+
+
+def top_countries(fdf: pd.DataFrame, n: int = 10) -> pd.DataFrame:
+    """Top-N países por número de eventos (columnas `country_display`, `Eventos`)."""
+    return (
+        fdf.groupby("country_display", observed=True).size()
+          .reset_index(name="Eventos")
+          .sort_values("Eventos", ascending=False)
+          .head(n)
+    )
+
+
+def topic_counts(fdf: pd.DataFrame) -> pd.DataFrame:
+    """Eventos por tema (`Tema`, `Eventos`), de mayor a menor; sin los temas sin eventos
+    (en una columna category, `value_counts` también cuenta las categorías filtradas)."""
+    counts = fdf["issue1_label"].value_counts()
+    topics = counts[counts > 0].reset_index()
+    topics.columns = ["Tema", "Eventos"]
+    return topics
+
+
+def population_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Población país-año (`country_display`, `year`, `population`) para todos los años del dataset.
+
+    Se toma de la tabla de referencia por código COW, de modo que incluye los años
+    sin eventos; si el dataset no trae `ccode`, se usa su columna `population`.
+    """
+    import scad_population
+
+    base = display_frame(df)
+    empty = pd.DataFrame(columns=["country_display", "year", "population"])
+    if "country_display" not in base.columns or "year" not in base.columns:
+        return empty
+    min_year, max_year = int(base["year"].min()), int(base["year"].max())
+
+    table = scad_population.load_table()
+    if "ccode" in base.columns and not table.empty:
+        names = base[["ccode", "country_display"]].dropna().drop_duplicates("ccode")
+        names = names.assign(ccode=pd.to_numeric(names["ccode"], errors="coerce"))
+        pop = names.merge(table[["ccode", "year", "population"]], on="ccode")
+    elif "population" in base.columns:
+        pop = base[["country_display", "year", "population"]].dropna().drop_duplicates(["country_display", "year"])
+    else:
+        return empty
+    pop = pop[(pop["year"] >= min_year) & (pop["year"] <= max_year)]
+    return pop[["country_display", "year", "population"]].reset_index(drop=True)
+
+
+def yearly_rates(ts: pd.DataFrame, pop: pd.DataFrame, countries, period_col: str = "year") -> pd.DataFrame:
+    """Añade `Eventos_100k` / `Muertes_100k` a una serie: cada periodo usa la población de su año."""
+    by_year = pop[pop["country_display"].isin(countries)].groupby("year")["population"].sum()
+    years = ts[period_col] if period_col == "year" else pd.to_datetime(ts[period_col]).dt.year
+    denom = years.map(by_year).where(lambda p: p > 0)
+    for col in ["Eventos", "Muertes"]:
+        if col in ts.columns:
+            ts[f"{col}_100k"] = ts[col] / denom * 100000
+    return ts
+
+
+def country_rates(table: pd.DataFrame, pop: pd.DataFrame, years) -> pd.DataFrame:
+    """Añade `Eventos_100k` / `Muertes_100k` por país con la población media de los años elegidos."""
+    in_range = pop[(pop["year"] >= years[0]) & (pop["year"] <= years[1])]
+    mean_pop = in_range.groupby("country_display", observed=True)["population"].mean()
+    # reindex y no .map: sobre una columna category, .map devolvería otra category
+    denom = mean_pop.reindex(table["country_display"]).to_numpy()
+    for col in ["Eventos", "Muertes"]:
+        if col in table.columns:
+            table[f"{col}_100k"] = table[col] / denom * 100000
+    return table
+
+
+def default_views(df: pd.DataFrame) -> dict:
+    """Calcula las vistas por defecto de cada página, indexadas por (página, nombre)."""
+    base = display_frame(df)
+    d = default_frame(base)
+    has_region = "region" in d.columns
+    views = {}
+
+    # Explorador de Eventos / Explorador de Muertes
+    for page, value_col in [("events", None), ("deaths", "ndeath")]:
+        views[(page, "total")] = country_totals(d, value_col)
+        if has_region:
+            africa_df, americas_df = split_regions(d)
+            views[(page, "africa")] = country_totals(africa_df, value_col)
+            views[(page, "americas")] = country_totals(americas_df, value_col)
+
+    # Estadísticas Generales (con tasas por 100k hab. precalculadas)
+    pop = population_frame(base)
+    countries = d["country_display"].unique()
+    years = (int(d["year"].min()), int(d["year"].max()))
+    views[("stats", "population")] = pop
+    views[("stats", "trend_events")] = yearly_rates(
+        d.groupby("year").size().reset_index(name="Eventos"), pop, countries)
+    views[("stats", "trend_deaths")] = yearly_rates(
+        d.groupby("year")["ndeath"].sum().reset_index(name="Muertes"), pop, countries)
+    views[("stats", "rank_events")] = country_rates(
+        d.groupby("country_display", observed=True).size().reset_index(name="Eventos"), pop, years)
+    views[("stats", "rank_deaths")] = country_rates(
+        d.groupby("country_display", observed=True)["ndeath"].sum().reset_index(name="Muertes"), pop, years)
+    if "event_type_display" in d.columns:
+        views[("stats", "dist_types")] = d.groupby("event_type_display", observed=True).size().reset_index(name="Eventos")
+    if has_region:
+        views[("stats", "heat")] = d.groupby(["year", "region"], observed=True).size().reset_index(name="Eventos")
+
+    # Análisis por Religión (filtros por defecto sobre el subconjunto religioso)
+    religion_df = base[religion_mask(base)]
+    if not religion_df.empty:
+        r = default_frame(religion_df)
+        views[("religion", "by_year")] = r.groupby("year").size().reset_index(name="Eventos")
+        if "issue1_label" in r.columns:
+            views[("religion", "topics")] = topic_counts(r)
+        views[("religion", "top_countries")] = top_countries(r)
+
+    return views
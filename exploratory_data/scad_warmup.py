@@ -0,0 +1,133 @@
+"""Warm-up previo al despliegue de la app.
+
+Carga el dataset final, precalcula la vista por defecto de cada página (todas
+las regiones, rango completo de años) y los índices de búsqueda, y lo persiste
+en `artifacts/`, de modo que el servidor arranca en caliente y los primeros
+usuarios no pagan la carga del CSV ni las agregaciones iniciales.
+
+Uso (desde la raíz del repositorio, antes de `streamlit run`):
+    python exploratory_data/scad_warmup.py [--data exploratory_data/scad_final_dataset.csv]
+"""
+import argparse
+import time
+from pathlib import Path
+
+import pandas as pd
+
+import scad_actors
+import scad_codebooks
+import scad_column_profile
+import scad_dtypes
+import scad_episodes
+import scad_indexes
+import scad_issues
+import scad_loader
+import scad_network
+import scad_rollups
+import scad_schema
+import scad_search
+import scad_spikes
+import scad_views
+
+DEFAULT_DATA_PATH = Path(__file__).resolve().parent / "scad_final_dataset.csv"
+
+
+def warm_up(data_path: Path):
+    t0 = time.perf_counter()
+    # Invalida la caché anterior mientras se reconstruye
+    scad_loader.WARM_META.unlink(missing_ok=True)
+    raw = scad_loader.load_dataset(data_path, use_warm_cache=False, optimize=False)
+    df = scad_dtypes.optimize_dtypes(raw)
+    print(f"Dataset cargado: {len(df):,} filas en {time.perf_counter() - t0:.2f}s")
+    print(scad_dtypes.format_report(scad_dtypes.memory_report(raw, df), top=15))
+    del raw
+
+    t1 = time.perf_counter()
+    views = scad_views.default_views(df)
+    print(f"Vistas por defecto: {len(views)} en {time.perf_counter() - t1:.2f}s")
+
+    # Índices sobre las filas (posicionales respecto al DataFrame cacheado)
+    scad_loader.ARTIFACTS_DIR.mkdir(parents=True, exist_ok=True)
+    t2 = time.perf_counter()
+    interval_index = scad_indexes.IntervalIndex.from_frame(df)
+    interval_index.save(scad_loader.ARTIFACTS_DIR / scad_indexes.INTERVAL_FILE)
+    print(f"Índice de intervalos de fechas en {time.perf_counter() - t2:.2f}s")
+
+    # Episodios espacio-temporales (DBSCAN sobre rejilla; también posicionales)
+    t2 = time.perf_counter()
+    episodes = scad_episodes.Episodes.from_frame(df)
+    pd.to_pickle(episodes, scad_loader.ARTIFACTS_DIR / scad_episodes.EPISODES_FILE)
+    print(f"Episodios: {episodes.n_episodes:,} ({(episodes.labels >= 0).sum():,} eventos) "
+          f"en {time.perf_counter() - t2:.2f}s")
+
+    # Rollups temporales día/semana/mes/año para las tendencias
+    t3 = time.perf_counter()
+    rollups = scad_rollups.TimeRollups.from_frame(scad_views.display_frame(df))
+    pd.to_pickle(rollups, scad_loader.ARTIFACTS_DIR / scad_rollups.ROLLUPS_FILE)
+    print(f"Rollups temporales en {time.perf_counter() - t3:.2f}s")
+
+    # Picos anómalos por país, sobre las series mensuales de los rollups
+    t4 = time.perf_counter()
+    spikes = scad_spikes.detect_spikes(rollups)
+    spikes.to_pickle(scad_loader.ARTIFACTS_DIR / scad_spikes.SPIKES_FILE)
+    print(f"Picos anómalos: {len(spikes):,} en {time.perf_counter() - t4:.2f}s")
+
+    # Perfil de columnas para la pestaña Datos (si el ETL no lo ha dejado al día)
+    if scad_column_profile.load_profile(data_path) is None:
+        scad_column_profile.save_profile(scad_column_profile.profile_frame(df), data_path)
+        print("Perfil de columnas regenerado")
+
+    # Manifiesto de esquema: se deduce de las columnas del CSV (el DataFrame cargado ya está renombrado)
+    if scad_schema.load_schema(data_path) is None:
+        import scad_ingest
+
+        csv = scad_ingest.read_csv(data_path, scad_ingest.FEATURE_COLUMNS)
+        scad_schema.save_schema(scad_schema.schema_from_frame(csv), data_path)
+        print("Manifiesto de esquema regenerado")
+
+    # Vocabulario canónico de actores (MinHash + LSH) y red actor → objetivo (si el ETL no los ha dejado al día)
+    canon = scad_actors.load_actor_canon(data_path)
+    if canon is None:
+        canon = scad_actors.ActorCanon.from_frame(df)
+        scad_actors.save_actor_canon(canon, data_path)
+        print(f"Vocabulario de actores regenerado: {len(canon.lookup):,} nombres → {len(canon.names):,} canónicos")
+    if scad_network.load_network(data_path) is None:
+        network = scad_network.ActorNetwork.from_frame(df, canon=canon)
+        scad_network.save_network(network, data_path)
+        print(f"Red de actores regenerada: {len(network.names):,} actores, {network.n_entries:,} entradas")
+
+    # Co-ocurrencia de temas y cruce tema × tipo de evento (si el ETL no los ha dejado al día)
+    if scad_issues.load_cooccurrence(data_path) is None:
+        scad_issues.save_cooccurrence(scad_issues.IssueCooccurrence.from_frame(df), data_path)
+        print("Co-ocurrencia de temas regenerada")
+
+    # Índice invertido (BM25) de issuenote / notes para la búsqueda de texto (si el ETL no lo ha dejado al día)
+    if scad_search.load_search_index(data_path) is None:
+        search = scad_search.SearchIndex.from_frame(df)
+        scad_search.save_search_index(search, data_path)
+        print(f"Índice de búsqueda regenerado: {len(search.terms):,} términos")
+
+    # El manifiesto se escribe al final: valida todo lo anterior
+    scad_loader.write_warm_cache(data_path, df, views)
+
+    # Índice de búsqueda de los codebooks (solo si los PDF han cambiado)
+    if scad_codebooks.index_is_current():
+        print("Índice de codebooks al día")
+    else:
+        try:
+            index = scad_codebooks.build_index()
+            print(f"Índice de codebooks: {len(index['sections'])} secciones")
+        except ImportError:
+            print("⚠️ pypdf no está instalado: se omite el índice de codebooks")
+    print(f"Caché escrita en {scad_loader.ARTIFACTS_DIR} ({time.perf_counter() - t0:.2f}s en total)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precalienta la caché en disco de la app SCAD.")
+    parser.add_argument("--data", type=Path, default=DEFAULT_DATA_PATH, help="Ruta a scad_final_dataset.csv")
+    args = parser.parse_args()
+    warm_up(args.data)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Los módulos de la app y del ETL se importan como scripts sueltos desde exploratory_data/
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "exploratory_data"))
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+
+import scad_actors
+
+
+def _canon(counts):
+    return scad_actors.ActorCanon.from_counts(pd.Series(counts))
+
+
+def test_near_duplicates_share_the_most_frequent_name():
+    canon = _canon({"aristide supporter": 3, "aristide supporters": 10, "police": 5})
+    assert canon.lookup["aristide supporter"] == canon.lookup["aristide supporters"]
+    assert canon.lookup["police"] != canon.lookup["aristide supporters"]
+    assert canon.canonical(pd.Series(["aristide supporter", "unknown"])).tolist() == ["aristide supporters", "unknown"]
+
+
+def test_guard_words_keep_similar_names_apart(monkeypatch):
+    pairs = [("supporters of the pri party", "supporters of the prd party"),
+             ("anti-government protesters", "government protesters")]
+    counts = {name: 1 for pair in pairs for name in pair}
+
+    canon = _canon(dict(counts, **{"pri supporters": 1, "prd supporters": 1}))
+    for a, b in pairs + [("pri supporters", "prd supporters")]:
+        assert canon.lookup[a] != canon.lookup[b]
+
+    # Los mismos pares sin la guarda: bastante parecidos para fusionarse, así que es la guarda la que los separa
+    monkeypatch.setattr(scad_actors, "guard_words", lambda name: frozenset())
+    canon = _canon(counts)
+    for a, b in pairs:
+        assert canon.lookup[a] == canon.lookup[b]
+
+
+def test_guard_words_ignore_filler_and_long_words():
+    assert scad_actors.guard_words("pro-government supporters of the pri") == {"pri"}
+    assert scad_actors.guard_words("government protesters") == frozenset()
+
+
+def test_assign_ids_shares_one_id_space_and_marks_missing():
+    df = pd.DataFrame({
+        "actor1": ["Aristide  Supporters", "police", None, "Missing"],
+        "target1": ["police", "aristide supporter", "students", "police"],
+    })
+    canon = scad_actors.ActorCanon.from_frame(df)
+    out = canon.assign_ids(df)
+
+    assert out["actor1_cid"].tolist()[2:] == [-1, -1]
+    assert out.loc[0, "actor1_cid"] == out.loc[1, "target1_cid"]
+    assert out.loc[1, "actor1_cid"] == out.loc[0, "target1_cid"] == out.loc[3, "target1_cid"]
+    assert out["actor1_cid"].dtype == np.int32
+
+
+def test_vocabulary_round_trip():
+    canon = _canon({"aristide supporter": 3, "aristide supporters": 10, "police": 5})
+    again = scad_actors.ActorCanon.from_dict(canon.to_dict())
+    assert again.names.tolist() == canon.names.tolist() and again.lookup == canon.lookup
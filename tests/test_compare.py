@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import scad_compare
+import scad_rollups
+
+
+def _events(n=400, seed=3):
+    rng = np.random.default_rng(seed)
+    places = [("africa", "kenya"), ("africa", "nigeria"), ("africa", "togo"), ("latin america", "haiti"),
+              ("latin america", "mexico")]
+    region, country = zip(*(places[i] for i in rng.integers(0, len(places), n)))
+    start = pd.Timestamp("1995-01-01") + pd.to_timedelta(rng.integers(0, 20 * 365, n), unit="D")
+    start = pd.Series(start).mask(rng.random(n) < 0.05)  # algunas fechas sin valor: no cuentan
+    return pd.DataFrame({
+        "startdate": start,
+        "region": region,
+        "country_display": country,
+        "event_type_display": rng.choice(["riot", "strike", "demonstration"], n),
+        "ndeath": np.where(rng.random(n) < 0.2, np.nan, rng.integers(0, 30, n)),
+    })
+
+
+def _direct(df, spec):
+    """KPIs de una especificación filtrando las filas directamente."""
+    rows = df[df["startdate"].notna() & df["startdate"].dt.year.between(*spec["years"])]
+    for col, key in [("region", "regions"), ("country_display", "countries"), ("event_type_display", "event_types")]:
+        if spec.get(key):
+            rows = rows[rows[col].isin(spec[key])]
+    return len(rows), rows["ndeath"].fillna(0).sum(), rows["country_display"].nunique(), rows
+
+
+SPECS = [
+    ({"regions": ["africa"], "years": (2000, 2010)}, {"regions": ["latin america"], "years": (2000, 2010)}),
+    ({"countries": ["kenya"], "years": (1995, 2004)}, {"countries": ["kenya"], "years": (2005, 2014)}),
+    ({"event_types": ["riot", "strike"], "years": (1990, 2020)}, {"regions": ["africa"], "years": (2003, 2003)}),
+    # B no selecciona nada
+    ({"years": (1995, 2014)}, {"countries": ["haiti"], "event_types": ["riot"], "years": (1980, 1985)}),
+]
+
+
+@pytest.mark.parametrize("specs", SPECS)
+def test_kpis_match_direct_filtered_sums(specs):
+    df = _events()
+    result = scad_compare.compare(scad_rollups.TimeRollups.from_frame(df), list(specs))
+    kpis = result["kpis"]
+
+    assert list(kpis.index) == scad_compare.SIDES
+    for side, spec in zip(scad_compare.SIDES, specs):
+        events, deaths, countries, rows = _direct(df, spec)
+        assert kpis.loc[side, "Eventos"] == events
+        assert kpis.loc[side, "Muertes"] == pytest.approx(deaths)
+        assert kpis.loc[side, "Países"] == countries
+        # La tendencia anual y el ranking suman lo mismo que los KPIs
+        trend = result["trend"][result["trend"]["Conjunto"] == side]
+        assert trend["Eventos"].sum() == events
+        assert result["rank"][f"Eventos {side}"].sum() == events
+        by_country = rows.groupby("country_display").size()
+        ranked = result["rank"].set_index("country_display")[f"Eventos {side}"]
+        assert ranked[ranked > 0].sort_index().to_dict() == by_country.sort_index().to_dict()
+
+
+def test_rank_deltas_are_b_minus_a():
+    df = _events()
+    rank = scad_compare.compare(scad_rollups.TimeRollups.from_frame(df), list(SPECS[0]))["rank"]
+    assert (rank["Δ Eventos"] == rank["Eventos B"] - rank["Eventos A"]).all()
+    assert (rank["Δ Muertes"] == rank["Muertes B"] - rank["Muertes A"]).all()
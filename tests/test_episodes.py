@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+
+import scad_episodes
+
+
+def _frame(rows):
+    return pd.DataFrame(rows, columns=["latitude", "longitude", "startdate", "country_display", "ndeath"])
+
+
+def test_dbscan_splits_groups_beyond_the_time_window():
+    # Mismo lugar: tres eventos en 3 días y otros tres tres semanas después
+    rows = [(18.5, -72.3, f"2004-02-0{d}", "haiti", 1) for d in (1, 2, 3)]
+    rows += [(18.5, -72.3, f"2004-02-2{d}", "haiti", 0) for d in (1, 2, 3)]
+    episodes = scad_episodes.Episodes.from_frame(_frame(rows))
+
+    assert episodes.labels.tolist() == [0, 0, 0, 1, 1, 1]
+    assert episodes.n_episodes == 2
+    assert sorted(episodes.summary["deaths"]) == [0, 3]
+    assert episodes.summary["days"].tolist() == [3, 3]
+
+
+def test_events_just_outside_radius_or_window_are_not_neighbours():
+    lat = np.array([0.0, 0.0, 0.0])
+    lon = np.array([10.0, 10.0, 10.0 + 51 / scad_episodes.KM_PER_DEGREE])
+    day = np.array([0, scad_episodes.WINDOW_DAYS + 1, 0])
+    i, j = scad_episodes.neighbour_pairs(lat, lon, day)
+    assert len(i) == 0
+
+
+def test_noise_and_invalid_coordinates_get_no_episode():
+    rows = [(18.5, -72.3, "2004-02-01", "haiti", 0)] * 3
+    rows += [(-1.3, 36.8, "2004-02-01", "kenya", 0),   # aislado
+             (0.0, 0.0, "2004-02-01", "haiti", 0),     # coordenadas vacías (0, 0)
+             (18.5, -72.3, None, "haiti", 0)]          # sin fecha
+    labels = scad_episodes.Episodes.from_frame(_frame(rows)).labels
+    assert labels.tolist() == [0, 0, 0, -1, -1, -1]
+
+
+def test_chain_of_sparse_events_is_not_an_episode():
+    # Eventos sueltos cada 5 días: cada uno solo tiene dos vecinos, ninguno es núcleo
+    days = np.array([0, 5, 10, 15, 40, 40, 40, 40])
+    labels = scad_episodes.cluster(np.full(8, 18.5), np.full(8, -72.3), days, min_events=4)
+    assert labels.tolist() == [-1, -1, -1, -1, 0, 0, 0, 0]
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import scad_indexes
+
+
+def _events(n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp("2000-01-01") + pd.to_timedelta(rng.integers(0, 3 * 365, n), unit="D")
+    # Duraciones: sobre todo cortas, justo en el umbral y por encima, y largas (multi-año)
+    span = rng.choice([0, 1, 5, scad_indexes.SHORT_SPAN_DAYS, scad_indexes.SHORT_SPAN_DAYS + 1, 400, 900], n)
+    start = pd.Series(start)
+    end = start + pd.to_timedelta(span, unit="D")
+    before = rng.random(n) < 0.05
+    end[before] = start[before] - pd.Timedelta(days=3)  # fin anterior al inicio: evento de un día
+    end[rng.random(n) < 0.1] = pd.NaT                   # sin fin: evento de un día
+    start[rng.random(n) < 0.03] = pd.NaT                # sin inicio: nunca activo
+    return pd.DataFrame({"startdate": start, "enddate": end})
+
+
+def _brute_force(df, d1, d2):
+    start = df["startdate"]
+    end = df["enddate"].fillna(start)
+    end = end.where(end >= start, start)
+    return ((start <= pd.Timestamp(d2)) & (end >= pd.Timestamp(d1))).to_numpy()
+
+
+@pytest.mark.parametrize("d1, d2", [
+    ("2000-01-01", "2000-01-01"),
+    ("2000-06-15", "2000-07-20"),
+    ("2001-02-01", "2001-02-28"),
+    ("2002-12-25", "2003-01-10"),
+    ("1999-01-01", "1999-12-31"),
+    ("1995-01-01", "2010-01-01"),
+])
+def test_active_between_matches_brute_force(d1, d2):
+    df = _events()
+    index = scad_indexes.IntervalIndex.from_frame(df)
+    assert len(index.long_pos) > 0 and len(index.short_pos) > 0  # se recorren los dos caminos
+    np.testing.assert_array_equal(index.mask(d1, d2), _brute_force(df, d1, d2))
+    assert index.count(d1, d2) == _brute_force(df, d1, d2).sum()
+
+
+def test_threshold_separates_short_and_long_events():
+    df = pd.DataFrame({
+        "startdate": pd.to_datetime(["2000-01-01", "2000-01-01", "2000-01-01"]),
+        "enddate": pd.to_datetime(["2000-01-01", "2000-02-01", "2000-02-02"]),  # 0, 31 y 32 días
+    })
+    index = scad_indexes.IntervalIndex.from_frame(df)
+    assert sorted(index.short_pos) == [0, 1] and index.long_pos.tolist() == [2]
+    assert index.positions("2000-02-02", "2000-03-01").tolist() == [2]
+
+
+def test_saved_index_round_trip(tmp_path):
+    df = _events(100, seed=1)
+    index = scad_indexes.IntervalIndex.from_frame(df)
+    path = tmp_path / scad_indexes.INTERVAL_FILE
+    index.save(path)
+    loaded = scad_indexes.IntervalIndex.load(path)
+    np.testing.assert_array_equal(loaded.mask("2000-03-01", "2001-03-01"), index.mask("2000-03-01", "2001-03-01"))
+    assert loaded.bounds() == index.bounds()
@@ -0,0 +1,72 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+import scad_result_cache
+from scad_result_cache import ResultCache, canonical_spec, result_key
+
+
+def _keys(cache):
+    return {k for (k,) in cache._connect().execute("SELECT key FROM results")}
+
+
+def _put_at(cache, monkeypatch, key, size, when):
+    monkeypatch.setattr(scad_result_cache.time, "time", lambda: when)
+    cache.put(key, "pickle", b"x" * size)
+
+
+def test_evict_drops_least_recently_used_down_to_the_margin(tmp_path, monkeypatch):
+    cache = ResultCache(tmp_path / "cache.sqlite", max_bytes=1000)
+    keys = [f"k{i}" for i in range(11)]
+    for t, key in enumerate(keys):
+        _put_at(cache, monkeypatch, key, 90, when=float(t))
+    # Leer "k0" la marca como usada ahora: pasa a ser la más reciente
+    monkeypatch.setattr(scad_result_cache.time, "time", lambda: 20.0)
+    assert cache.get("k0", "pickle") == b"x" * 90
+
+    # 12 · 90 = 1080 > 1000: hay que liberar 1080 − 900 = 180 → "k1" y "k2", las menos usadas
+    _put_at(cache, monkeypatch, "new", 90, when=21.0)
+    assert _keys(cache) == set(keys + ["new"]) - {"k1", "k2"}
+    assert cache.stats() == {"entries": 10, "bytes": 900}
+
+
+def test_no_eviction_below_the_limit(tmp_path, monkeypatch):
+    cache = ResultCache(tmp_path / "cache.sqlite", max_bytes=1000)
+    for t, key in enumerate(["a", "b", "c"]):
+        _put_at(cache, monkeypatch, key, 90, when=float(t))
+    assert _keys(cache) == {"a", "b", "c"}
+
+
+def test_oversize_values_are_not_stored(tmp_path):
+    cache = ResultCache(tmp_path / "cache.sqlite", max_bytes=1000)
+    cache.put("small", "pickle", b"x" * 90)
+    cache.put("big", "pickle", b"x" * 110)  # más que el margen de desalojo (10 % del límite)
+    assert _keys(cache) == {"small"}
+
+
+def test_canonical_spec_ignores_set_order_and_formats_dates():
+    a = {"countries": {"kenya", "haiti", "togo"}, "years": (1990, 2000), "since": date(2001, 2, 3),
+         "n": np.int64(5)}
+    b = {"n": 5, "since": date(2001, 2, 3), "years": [1990, 2000], "countries": frozenset(["togo", "kenya", "haiti"])}
+
+    assert canonical_spec(a) == canonical_spec(b) == {
+        "countries": ["haiti", "kenya", "togo"], "n": 5, "since": "2001-02-03", "years": [1990, 2000]}
+    assert canonical_spec({"since": pd.Timestamp("2001-02-03")})["since"] == "2001-02-03T00:00:00"
+    assert result_key("d1", "stats", "trend", a) == result_key("d1", "stats", "trend", b)
+    assert result_key("d1", "stats", "trend", a) != result_key("d2", "stats", "trend", a)
+
+
+def test_cached_round_trip_computes_once(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return pd.DataFrame({"x": [1, 2]})
+
+    first = ResultCache(path).cached("k", compute)
+    # Otra instancia (otro proceso) sobre el mismo fichero reutiliza el resultado
+    second = ResultCache(path).cached("k", compute)
+    pd.testing.assert_frame_equal(first, second)
+    assert len(calls) == 1
@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import scad_rollups
+
+
+def _events():
+    # Incluye la semana ISO del lunes 2008-12-29, que cruza el cambio de año
+    dates = ["2008-12-01", "2008-12-29", "2008-12-31", "2008-12-31", "2009-01-01", "2009-01-04",
+             "2009-01-05", "2009-02-14", "2009-12-31", "2010-01-01", None]
+    n = len(dates)
+    return pd.DataFrame({
+        "startdate": pd.to_datetime(dates),
+        "region": ["africa", "africa", "latin america", "africa", "africa", "latin america",
+                   "africa", "africa", "latin america", "africa", "africa"],
+        "country_display": ["kenya", "kenya", "haiti", "nigeria", "kenya", "haiti",
+                            "nigeria", "kenya", "haiti", "kenya", "kenya"],
+        "event_type_display": ["riot", "strike", "riot", "riot", "riot", "strike",
+                               "riot", "strike", "riot", "riot", "riot"],
+        "ndeath": [0, 2, np.nan, 1, 5, 0, 3, 0, 1, 2, 9][:n],
+    })
+
+
+def _expected(df, level, years=None, countries=None):
+    """Serie esperada con un groupby directo sobre las filas."""
+    df = df[df["startdate"].notna()]
+    if years is not None:
+        df = df[df["startdate"].dt.year.between(*years)]
+    if countries:
+        df = df[df["country_display"].isin(countries)]
+    start = df["startdate"]
+    period = {
+        "day": start,
+        "week": start - pd.to_timedelta(start.dt.weekday, unit="D"),
+        "month": start.dt.to_period("M").dt.start_time,
+        "year": start.dt.to_period("Y").dt.start_time,
+    }[level]
+    out = df.groupby(period.rename("period")).agg(Eventos=("startdate", "size"), Muertes=("ndeath", "sum"))
+    return out.reset_index()
+
+
+def _series(rollups, level, years=None, countries=None):
+    mask = rollups.group_mask(countries=countries) if countries else None
+    return rollups.series(level, mask, years)
+
+
+@pytest.mark.parametrize("level", ["day", "week", "month", "year"])
+@pytest.mark.parametrize("years, countries", [(None, None), ((2009, 2009), None), ((2008, 2009), ["kenya", "haiti"])])
+def test_series_match_plain_groupby(level, years, countries):
+    df = _events()
+    got = _series(scad_rollups.TimeRollups.from_frame(df), level, years, countries)
+    expected = _expected(df, level, years, countries)
+    pd.testing.assert_frame_equal(got, expected, check_dtype=False)
+
+
+def test_week_across_new_year_is_clipped_by_the_year_filter():
+    rollups = scad_rollups.TimeRollups.from_frame(_events())
+    week = pd.Timestamp("2008-12-29")
+    by_year = {
+        years: _series(rollups, "week", years).set_index("period").loc[week, "Eventos"]
+        for years in [(2008, 2008), (2009, 2009), (2008, 2009)]
+    }
+    # 29 y 31 (x2) de diciembre en 2008; 1 y 4 de enero en 2009
+    assert by_year == {(2008, 2008): 3, (2009, 2009): 2, (2008, 2009): 5}
+
+
+def test_empty_selection():
+    rollups = scad_rollups.TimeRollups.from_frame(_events())
+    out = _series(rollups, "month", (1990, 1991))
+    assert out.empty and list(out.columns) == ["period", "Eventos", "Muertes"]
+
+
+def test_batch_matches_one_series_per_selection():
+    df = _events()
+    rollups = scad_rollups.TimeRollups.from_frame(df)
+    selections = [(rollups.group_mask(countries=["kenya"]), (2008, 2009)), (None, (2009, 2010))]
+    out = rollups.batch("month", selections)
+    for i, (mask, years) in enumerate(selections):
+        got = out[out["selection"] == i].drop(columns="selection").reset_index(drop=True)
+        pd.testing.assert_frame_equal(got, rollups.series("month", mask, years), check_dtype=False)
+
+    by_country = rollups.batch("year", selections, by="country_display")
+    for i, (mask, years) in enumerate(selections):
+        rows = df[df["startdate"].dt.year.between(*years)]
+        if mask is not None:
+            rows = rows[rows["country_display"].isin(["kenya"])]
+        expected = rows.groupby("country_display").agg(Eventos=("startdate", "size"), Muertes=("ndeath", "sum"))
+        got = by_country[by_country["selection"] == i].set_index("country_display")[["Eventos", "Muertes"]]
+        pd.testing.assert_frame_equal(got.sort_index(), expected, check_dtype=False, check_names=False)
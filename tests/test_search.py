@@ -0,0 +1,78 @@
+import math
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import scad_loader
+import scad_search
+
+
+def _index(notes):
+    return scad_search.SearchIndex.from_frame(pd.DataFrame({"issuenote": notes}))
+
+
+def test_tokenize_joins_dotted_abbreviations_and_strips_accents():
+    tokens = scad_search.tokenize(pd.Series(["Citizens protested against U.S. plans in Bogotá", "Missing"]))
+    assert tokens.loc[0].tolist() == ["citizens", "protested", "us", "plans", "bogota"]
+    assert 1 not in tokens.index  # el marcador de notas vacías no se indexa
+
+
+def test_abbreviation_query_matches_both_spellings():
+    index = _index(["Protest against the U.S. embassy", "Protest against the mayor", "US troops"])
+    for query in ["U.S.", "us", "u.s. embassy"]:
+        assert 0 in index.search(query)["position"].tolist()
+    assert 1 not in index.search("U.S.")["position"].tolist()
+
+
+def test_bm25_scores_match_the_formula():
+    index = _index(["teachers strike", "teachers strike strike wages", "farmers march"])
+    scores = index.scores("strike")
+
+    avg_len = (2 + 4 + 2) / 3
+    idf = math.log(1 + (3 - 2 + 0.5) / (2 + 0.5))
+
+    def bm25(tf, length):
+        k1, b = scad_search.K1, scad_search.B
+        return idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * length / avg_len))
+
+    assert scores == pytest.approx([bm25(1, 2), bm25(2, 4), 0.0])
+
+
+def test_rarer_terms_weigh_more():
+    # Misma longitud y frecuencia: "wages" (1 documento) gana a "teachers" (2 documentos)
+    index = _index(["teachers march", "wages march", "teachers strike"])
+    assert index.search("teachers wages")["position"].tolist() == [1, 0, 2]
+
+
+def test_search_mask_and_no_match():
+    index = _index(["teachers strike", "teachers strike strike wages", "farmers march"])
+    assert index.search("strike", mask=np.array([True, False, True]))["position"].tolist() == [0]
+    assert index.search("elections").empty
+    assert index.search("the of").empty  # solo palabras vacías
+
+
+def test_batched_build_matches_single_build():
+    notes = ["teachers strike", None, "U.S. embassy protest", "farmers march on the capital", "strike"]
+    whole = _index(notes)
+    builder = scad_search.SearchIndexBuilder()
+    for batch in (notes[:2], notes[2:]):
+        builder.update(pd.DataFrame({"issuenote": batch}))
+    parts = builder.result()
+    for name, array in whole.to_arrays().items():
+        np.testing.assert_array_equal(parts.to_arrays()[name], array)
+
+
+def test_saved_index_is_dropped_when_the_csv_changes(tmp_path, monkeypatch):
+    monkeypatch.setattr(scad_loader, "ARTIFACTS_DIR", tmp_path / "artifacts")
+    csv = tmp_path / "events.csv"
+    csv.write_text("issuenote\nteachers strike\n", encoding="utf-8")
+    scad_search.save_search_index(_index(["teachers strike"]), csv)
+
+    loaded = scad_search.load_search_index(csv)
+    assert loaded.search("strike")["position"].tolist() == [0]
+
+    stat = os.stat(csv)
+    os.utime(csv, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    assert scad_search.load_search_index(csv) is None
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import scad_sentinels
+from scad_sentinels import (NOT_RECORDED, OBSERVED, SENTINEL_SCHEMA, UNKNOWN, UNKNOWN_LARGE,
+                            UNKNOWN_SMALL, decode_sentinels)
+
+
+@pytest.mark.parametrize("col", list(SENTINEL_SCHEMA))
+def test_every_schema_code_decodes_to_na_with_its_reason(col):
+    dtype, codes = SENTINEL_SCHEMA[col]
+    raw = [12, 0, *codes, None, -5]
+    df = decode_sentinels(pd.DataFrame({col: raw, "longitude": -99.0}))
+
+    n_codes = len(codes)
+    assert str(df[col].dtype) == dtype
+    assert df[col].isna().tolist() == [False, False] + [True] * n_codes + [True, False]
+    assert df[col].iloc[[0, 1, -1]].tolist() == [12, 0, -5]  # los negativos fuera del esquema se conservan
+    reason = df[scad_sentinels.reason_column(col)]
+    assert reason.dtype == np.int8
+    assert reason.tolist() == [OBSERVED, OBSERVED, *codes.values(), NOT_RECORDED, OBSERVED]
+    # Solo se decodifican las columnas del esquema: una longitud de -99 es un valor real
+    assert (df["longitude"] == -99.0).all()
+
+
+def test_ndeath_codes_follow_the_codebook():
+    df = decode_sentinels(pd.DataFrame({"ndeath": ["-99", "-88", "-77", "3", ""]}))
+    assert df["ndeath_missing_reason"].tolist() == [UNKNOWN, UNKNOWN_SMALL, UNKNOWN_LARGE, OBSERVED, NOT_RECORDED]
+    assert df["ndeath"].iloc[3] == 3
+
+
+def test_redecoding_keeps_reasons_after_imputation():
+    df = decode_sentinels(pd.DataFrame({"ndeath": [-88, 4, None, -77]}))
+    df["ndeath"] = df["ndeath"].fillna(0)
+    again = decode_sentinels(df)
+
+    assert again["ndeath"].tolist() == [0, 4, 0, 0]
+    assert again["ndeath_missing_reason"].tolist() == [UNKNOWN_SMALL, OBSERVED, NOT_RECORDED, UNKNOWN_LARGE]
+
+
+def test_reason_columns_follow_the_schema_order():
+    columns = ["gislocnum", "ndeath", "other"]
+    assert scad_sentinels.reason_columns(columns) == ["ndeath_missing_reason", "gislocnum_missing_reason"]
+    df = decode_sentinels(pd.DataFrame({c: [1] for c in columns}))
+    assert [c for c in df.columns if c.endswith(scad_sentinels.REASON_SUFFIX)] == scad_sentinels.reason_columns(columns)
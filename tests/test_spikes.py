@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+
+import scad_rollups
+import scad_spikes
+
+
+def _events():
+    """Serie sintética países × meses (2000-01 a 2002-12) con picos inyectados."""
+    months = pd.date_range("2000-01-01", "2002-12-01", freq="MS")
+    rows = []
+    for month in months:
+        # Kenia: 3 eventos al mes; 40 en 2000-03 (sin línea base) y 30, con una muerte cada uno, en 2001-06
+        n = {"2000-03": 40, "2001-06": 30}.get(month.strftime("%Y-%m"), 3)
+        deaths = 1 if month.strftime("%Y-%m") == "2001-06" else 0
+        rows += [("kenya", month + pd.Timedelta(days=d % 28), deaths) for d in range(n)]
+    # Togo: casi sin actividad; 4 eventos en 2001-09 dan z alto pero no llegan a MIN_VALUE
+    rows += [("togo", pd.Timestamp("2000-01-15"), 0)]
+    rows += [("togo", pd.Timestamp("2001-09-10"), 0)] * 4
+    df = pd.DataFrame(rows, columns=["country_display", "startdate", "ndeath"])
+    return df.assign(region="africa", event_type_display="riot")
+
+
+def test_robust_z_leaves_the_baseline_months_unscored():
+    matrix = np.tile(np.arange(20, dtype=float) % 4, (2, 1))
+    matrix[1, 15] = 50
+    z, baseline = scad_spikes.robust_z(matrix, window=12)
+
+    assert np.isnan(z[:, :12]).all() and np.isnan(baseline[:, :12]).all()
+    assert not np.isnan(z[:, 12:]).any()
+    window = matrix[1, 3:15]
+    median = np.median(window)
+    scale = max(1.4826 * np.median(np.abs(window - median)), np.sqrt(median), scad_spikes.MIN_SCALE)
+    assert baseline[1, 15] == median
+    assert np.isclose(z[1, 15], (50 - median) / scale)
+
+
+def test_robust_z_with_fewer_months_than_the_window():
+    z, baseline = scad_spikes.robust_z(np.ones((3, scad_spikes.BASELINE_MONTHS)))
+    assert np.isnan(z).all() and np.isnan(baseline).all()
+
+
+def test_detect_spikes_finds_the_injected_spike_only():
+    spikes = scad_spikes.detect_spikes(scad_rollups.TimeRollups.from_frame(_events()))
+    found = {(row.country_display, row.period.strftime("%Y-%m"), row.metric) for row in spikes.itertuples()}
+
+    assert found == {("kenya", "2001-06", "Eventos"), ("kenya", "2001-06", "Muertes")}
+    events = spikes[spikes["metric"] == "Eventos"].iloc[0]
+    assert events["value"] == 30 and events["baseline"] == 3 and events["year"] == 2001
+    assert spikes["z"].is_monotonic_decreasing
+
+
+def test_min_value_floor_drops_high_z_in_quiet_countries(monkeypatch):
+    rollups = scad_rollups.TimeRollups.from_frame(_events())
+    countries, first, matrix = scad_spikes.monthly_matrix(rollups, "Eventos")
+    z, _ = scad_spikes.robust_z(matrix)
+    togo = list(countries).index("togo")
+    month = np.datetime64("2001-09", "M").astype(np.int64) - first
+
+    assert matrix[togo, month] == 4 < scad_spikes.MIN_VALUE["Eventos"]
+    assert z[togo, month] >= scad_spikes.Z_THRESHOLD
+    assert "togo" not in set(scad_spikes.detect_spikes(rollups)["country_display"])
+    # Sin el suelo, el mismo mes sí sería pico
+    monkeypatch.setitem(scad_spikes.MIN_VALUE, "Eventos", 1)
+    assert "togo" in set(scad_spikes.detect_spikes(rollups)["country_display"])